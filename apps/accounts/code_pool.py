@@ -0,0 +1,96 @@
+"""
+Pool of pre-generated player codes.
+
+Registration claims a code that was already checked against the player
+table instead of generating one and hoping the unique constraint holds, so
+its cost doesn't grow with the number of players and bursts don't fail on
+collisions. The pool is filled in bulk by ``manage.py refill_code_pool``
+(run it before an event) and topped up in the background when it runs dry;
+Player.save falls back to a freshly generated code in the meantime.
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from .models import PooledCode
+from .utils import PlayerCodeGenerator
+
+logger = logging.getLogger(__name__)
+
+REFILL_BATCH_SIZE = 1000
+CLAIM_ATTEMPTS = 5
+
+_refill_lock = threading.Lock()
+
+
+def _pool_size():
+    return getattr(settings, 'PLAYER_CODE_POOL_SIZE', 0)
+
+
+def claim_code():
+    """
+    Remove one code from the pool and return it, or None when the pool is
+    disabled or empty. On PostgreSQL this is a single DELETE ... RETURNING
+    that skips rows locked by concurrent claims.
+    """
+    if not _pool_size():
+        return None
+    if connection.vendor == 'postgresql':
+        table = connection.ops.quote_name(PooledCode._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {table} WHERE code = '
+                f'(SELECT code FROM {table} LIMIT 1 FOR UPDATE SKIP LOCKED) RETURNING code'
+            )
+            row = cursor.fetchone()
+        code = row[0] if row else None
+    else:
+        code = None
+        for _ in range(CLAIM_ATTEMPTS):
+            candidate = PooledCode.objects.order_by().values_list('code', flat=True).first()
+            if candidate is None:
+                break
+            # Whoever deletes the row owns the code.
+            deleted, _ = PooledCode.objects.filter(code=candidate).delete()
+            if deleted:
+                code = candidate
+                break
+    if code is None:
+        schedule_refill()
+    return code
+
+
+def refill_pool(size=None):
+    """Top the pool up to ``size`` codes (PLAYER_CODE_POOL_SIZE by default); returns how many were added."""
+    size = _pool_size() if size is None else size
+    start = PooledCode.objects.count()
+    current = start
+    while current < size:
+        codes = PlayerCodeGenerator.allocate(min(size - current, REFILL_BATCH_SIZE))
+        # A code already in the pool is simply skipped.
+        PooledCode.objects.bulk_create([PooledCode(code=code) for code in codes], ignore_conflicts=True)
+        current = PooledCode.objects.count()
+    return current - start
+
+
+def _refill_in_background():
+    close_old_connections()
+    try:
+        added = refill_pool()
+        logger.info('Refilled player code pool with %s codes', added)
+    except Exception:
+        logger.exception('Background code pool refill failed')
+    finally:
+        connection.close()
+        _refill_lock.release()
+
+
+def schedule_refill():
+    """Refill the pool off the request thread once the current transaction commits."""
+    def start():
+        if _refill_lock.acquire(blocking=False):
+            threading.Thread(target=_refill_in_background, name='code-pool-refill', daemon=True).start()
+
+    transaction.on_commit(start)
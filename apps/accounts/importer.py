@@ -0,0 +1,151 @@
+"""
+Bulk attendee import.
+
+Attendee lists (CSV with a header row, or a JSON array of objects) are
+validated in memory and inserted in chunks with ``bulk_create``: per chunk
+there is one query for emails that already exist, one ``IN`` query per round
+of unique-code allocation and one insert. Imported players can only log in
+with their unique code, so they get an unusable password and no hash is
+computed.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError
+from django.utils import timezone
+
+from .utils import PlayerCodeGenerator
+
+Player = get_user_model()
+
+FIELDS = ('name', 'email', 'organization', 'location')
+MAX_LENGTHS = {name: Player._meta.get_field(name).max_length for name in FIELDS}
+DEFAULT_CHUNK_SIZE = 500
+MAX_ATTEMPTS = 3
+
+
+@dataclass
+class ImportResult:
+    valid: int = 0
+    created: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+
+    def as_dict(self):
+        return {
+            'valid': self.valid,
+            'created': len(self.created),
+            'skipped': self.skipped,
+            'errors': self.errors,
+            'players': [
+                {'name': player.name, 'email': player.email, 'unique_code': player.unique_code}
+                for player in self.created
+            ],
+        }
+
+
+def read_attendees(stream, fmt: str) -> list[dict]:
+    """Parse a CSV or JSON attendee list from a text or binary stream."""
+    data = stream.read()
+    if isinstance(data, bytes):
+        data = data.decode('utf-8-sig')
+    if fmt == 'json':
+        rows = json.loads(data)
+        if not isinstance(rows, list):
+            raise ValueError('JSON attendee lists must be an array of objects.')
+        return rows
+    if fmt == 'csv':
+        reader = csv.DictReader(io.StringIO(data))
+        return [{(key or '').strip().lower(): value for key, value in row.items()} for row in reader]
+    raise ValueError(f'Unsupported format: {fmt}')
+
+
+def clean_row(row) -> dict:
+    """Normalise one attendee; raises ValidationError on bad input."""
+    if not isinstance(row, dict):
+        raise ValidationError('Expected an object with name and email.')
+    cleaned = {name: str(row.get(name) or '').strip() for name in FIELDS}
+    if not cleaned['name']:
+        raise ValidationError('name is required.')
+    if not cleaned['email']:
+        raise ValidationError('email is required.')
+    validate_email(cleaned['email'])
+    cleaned['email'] = Player.objects.normalize_email(cleaned['email'])
+    for name, limit in MAX_LENGTHS.items():
+        if len(cleaned[name]) > limit:
+            raise ValidationError(f'{name} must be at most {limit} characters.')
+    return cleaned
+
+
+def _insert_chunk(chunk, result):
+    """Insert one chunk of (row number, cleaned) pairs, skipping existing emails."""
+    emails = [row['email'] for _, row in chunk]
+    existing = set(Player.objects.filter(email__in=emails).order_by().values_list('email', flat=True))
+    pending = []
+    for number, row in chunk:
+        if row['email'] in existing:
+            result.skipped.append({'row': number, 'email': row['email'], 'reason': 'already registered'})
+        else:
+            pending.append(row)
+    if not pending:
+        return []
+
+    now = timezone.now()
+    unusable = make_password(None)
+    codes = PlayerCodeGenerator.allocate(len(pending))
+    players = [
+        Player(**row, unique_code=code, password=unusable, last_login=now)
+        for row, code in zip(pending, codes)
+    ]
+    return Player.objects.bulk_create(players)
+
+
+def import_attendees(rows, chunk_size: int = DEFAULT_CHUNK_SIZE, dry_run: bool = False) -> ImportResult:
+    """
+    Validate and create players for ``rows``.
+
+    Rows that fail validation or repeat an email (in the file or the
+    database) are reported rather than aborting the import. Each chunk is
+    a single insert; a chunk that loses a race with a concurrent
+    registration (duplicate email or code) is re-checked and retried.
+    """
+    result = ImportResult()
+    valid = []
+    seen = set()
+    # Rows are numbered from 1, not counting a CSV header.
+    for number, row in enumerate(rows, start=1):
+        try:
+            cleaned = clean_row(row)
+        except ValidationError as exc:
+            result.errors.append({'row': number, 'errors': exc.messages})
+            continue
+        if cleaned['email'] in seen:
+            result.skipped.append({'row': number, 'email': cleaned['email'], 'reason': 'duplicate in file'})
+            continue
+        seen.add(cleaned['email'])
+        valid.append((number, cleaned))
+
+    result.valid = len(valid)
+    if dry_run:
+        return result
+
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        for attempt in range(MAX_ATTEMPTS):
+            skipped_before = len(result.skipped)
+            try:
+                result.created.extend(_insert_chunk(chunk, result))
+                break
+            except IntegrityError:
+                del result.skipped[skipped_before:]
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+    return result
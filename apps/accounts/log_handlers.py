@@ -0,0 +1,189 @@
+"""
+Logging helpers for the login audit trail.
+
+Log calls pass an event name as the message and the details as ``extra``
+fields, for example::
+
+    logger.info('LOGIN_SUCCESS', extra={'player_id': 7, 'ip': '10.0.0.1'})
+
+JsonFormatter writes those records as one JSON object per line for the log
+file and login_log_report; KeyValueFormatter renders them as
+``event key=value ...`` for the console.
+
+QueuedRotatingFileHandler only puts records on an in-memory queue; a
+background listener thread does the formatting, disk writes and rotation,
+so disk latency never lands on the request thread.
+
+Rotation renames the file, which is only safe with a single writer: with
+several gunicorn workers on one file, one worker's rollover leaves the
+others appending to the renamed backup, and concurrent rollovers overwrite
+each other's backups. With ``per_process=True`` (as configured in settings)
+each process writes and rotates its own ``login.<pid>.log``, and
+login_log_report reads them together. Pids change on every restart and
+worker recycle, so a handler starting in a new process deletes the files
+of processes that are no longer running, keeping disk use bounded. That was preferred over
+WatchedFileHandler because the deployments have no external logrotate.
+"""
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import re
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from pathlib import Path
+
+# Attributes every LogRecord has; anything else was passed through ``extra``.
+_RESERVED = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+def record_fields(record: logging.LogRecord) -> dict:
+    """The ``extra`` fields attached to a record."""
+    return {key: value for key, value in record.__dict__.items() if key not in _RESERVED and not key.startswith('_')}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, event and fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'logger': record.name,
+            'event': record.getMessage(),
+            'process': record.process,
+        }
+        payload.update(record_fields(record))
+        if record.exc_info:
+            payload['traceback'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class KeyValueFormatter(logging.Formatter):
+    """Appends ``key=value`` pairs for plain-valued ``extra`` fields to the message."""
+
+    PLAIN_TYPES = (str, int, float, bool, dict, list, type(None), Exception)
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        message = super().formatMessage(record)
+        # Skip objects such as the request Django attaches to its own records.
+        fields = {key: value for key, value in record_fields(record).items() if isinstance(value, self.PLAIN_TYPES)}
+        if fields:
+            message += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return message
+
+
+def process_filename(filename, pid=None) -> Path:
+    """``logs/login.log`` becomes ``logs/login.<pid>.log`` for ``pid`` (default: this process)."""
+    path = Path(filename)
+    return path.with_name(f'{path.stem}.{pid or os.getpid()}{path.suffix}')
+
+
+def process_log_files(filename) -> list[Path]:
+    """The current file of every process that logged to ``filename``, and ``filename`` itself if it exists."""
+    path = Path(filename)
+    per_process = sorted(path.parent.glob(f'{path.stem}.*{path.suffix}'))
+    return ([path] if path.exists() else []) + per_process
+
+
+def _pid_running(pid) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Someone else's process, but it exists.
+    return True
+
+
+def prune_dead_process_logs(filename) -> list[Path]:
+    """Delete the per-process files and backups of processes that have exited; returns what was removed."""
+    path = Path(filename)
+    pattern = re.compile(rf'{re.escape(path.stem)}\.(\d+){re.escape(path.suffix)}(\..+)?')
+    removed = []
+    for candidate in path.parent.glob(f'{path.stem}.*'):
+        match = pattern.fullmatch(candidate.name)
+        if not match or int(match.group(1)) == os.getpid() or _pid_running(int(match.group(1))):
+            continue
+        candidate.unlink(missing_ok=True)
+        removed.append(candidate)
+    return removed
+
+
+class QueuedRotatingFileHandler(QueueHandler):
+    """
+    Queue front-end for a rotating file handler.
+
+    Rotates by size (``max_bytes``/``backup_count``) or, when ``when`` is
+    given, by time (e.g. ``'midnight'``). The file handler and listener
+    thread are (re)created lazily per process, so it also works in forked
+    gunicorn workers; ``per_process`` gives each process its own file.
+    """
+
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=5, when=None, encoding='utf-8',
+                 per_process=False):
+        super().__init__(queue.SimpleQueue())
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        self.filename = filename
+        self.per_process = per_process
+        self.rotation = {'max_bytes': max_bytes, 'backup_count': backup_count, 'when': when, 'encoding': encoding}
+        self.target = None
+        self.listener = None
+        self._pid = None
+        atexit.register(self.close)
+
+    def _open_target(self):
+        if self.per_process:
+            prune_dead_process_logs(self.filename)
+        filename = process_filename(self.filename) if self.per_process else self.filename
+        rotation = self.rotation
+        if rotation['when']:
+            target = TimedRotatingFileHandler(filename, when=rotation['when'], backupCount=rotation['backup_count'],
+                                              encoding=rotation['encoding'], delay=True)
+        else:
+            target = RotatingFileHandler(filename, maxBytes=rotation['max_bytes'],
+                                         backupCount=rotation['backup_count'], encoding=rotation['encoding'],
+                                         delay=True)
+        target.setFormatter(JsonFormatter())
+        return target
+
+    def _ensure_listener(self):
+        if self._pid != os.getpid():
+            if self.target is not None:
+                # Inherited from the parent process: drop our copy of its file.
+                self.target.close()
+            self.target = self._open_target()
+            self.listener = QueueListener(self.queue, self.target)
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same process, so there's no need to pickle: resolve the message now
+        # (arguments may be mutated later) and leave JSON encoding and
+        # traceback formatting to the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._ensure_listener()
+        super().emit(record)
+
+    def flush(self) -> None:
+        """Block until queued records have been written."""
+        if self.listener and self._pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+            self._pid = None
+        if self.target is not None:
+            self.target.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self.target is not None:
+            self.target.close()
+        super().close()
@@ -0,0 +1,54 @@
+import csv
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.importer import DEFAULT_CHUNK_SIZE, import_attendees, read_attendees
+
+
+class Command(BaseCommand):
+    help = 'Creates players in bulk from a CSV (name,email,organization,location) or JSON attendee list'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Attendee file, or - for stdin')
+        parser.add_argument('--format', choices=['csv', 'json'], help='Defaults to the file extension')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Players inserted per query')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the file without creating players')
+        parser.add_argument('--codes-out', help='Write name,email,unique_code for the created players to this CSV')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('json' if path.endswith('.json') else 'csv')
+        try:
+            if path == '-':
+                rows = read_attendees(sys.stdin, fmt)
+            else:
+                with Path(path).open(encoding='utf-8-sig') as handle:
+                    rows = read_attendees(handle, fmt)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Could not read {path}: {exc}')
+
+        result = import_attendees(rows, chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+
+        for error in result.errors:
+            self.stdout.write(self.style.ERROR(f"Row {error['row']}: {' '.join(error['errors'])}"))
+        for skipped in result.skipped:
+            self.stdout.write(self.style.WARNING(f"Row {skipped['row']}: {skipped['email']} {skipped['reason']}"))
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'{result.valid} of {len(rows)} rows are valid (dry run).'))
+            return
+
+        if options['codes_out']:
+            with open(options['codes_out'], 'w', newline='', encoding='utf-8') as handle:
+                writer = csv.writer(handle)
+                writer.writerow(['name', 'email', 'unique_code'])
+                writer.writerows((player.name, player.email, player.unique_code) for player in result.created)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Created {len(result.created)} players '
+                f'({len(result.skipped)} skipped, {len(result.errors)} invalid).'
+            )
+        )
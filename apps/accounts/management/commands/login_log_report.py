@@ -0,0 +1,142 @@
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.log_handlers import process_log_files
+
+FAILURE_EVENTS = {'LOGIN_VALIDATION_FAILED', 'LOGIN_VALIDATION_ERROR', 'LOGIN_ERROR'}
+
+
+class LoginLogStats:
+    """Running login totals, per-IP counts and per-minute rates."""
+
+    def __init__(self):
+        self.attempts = 0
+        self.successes = 0
+        self.failures = 0
+        self.per_ip = defaultdict(Counter)
+        self.per_minute = Counter()
+        self.skipped = 0
+
+    def add_line(self, line):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            self.skipped += 1  # Pipe-delimited lines from before the JSON format
+            return
+        event = entry.get('event')
+        ip = entry.get('ip', 'unknown')
+        if event == 'LOGIN_ATTEMPT':
+            self.attempts += 1
+            self.per_ip[ip]['attempts'] += 1
+            if entry.get('ts'):
+                self.per_minute[entry['ts'][:16]] += 1
+        elif event == 'LOGIN_SUCCESS':
+            self.successes += 1
+            self.per_ip[ip]['successes'] += 1
+        elif event in FAILURE_EVENTS:
+            self.failures += 1
+            self.per_ip[ip]['failures'] += 1
+
+    def rate_per_minute(self, last_minutes):
+        """Average attempts per minute over the window ending at the latest entry."""
+        if not self.per_minute:
+            return 0.0
+        latest = datetime.strptime(max(self.per_minute), '%Y-%m-%dT%H:%M')
+        window_start = (latest - timedelta(minutes=last_minutes - 1)).strftime('%Y-%m-%dT%H:%M')
+        return sum(count for minute, count in self.per_minute.items() if minute >= window_start) / last_minutes
+
+
+class Command(BaseCommand):
+    help = 'Summarises the login logs: login rates and failure counts per IP (use --follow to stream)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help='Log file to read (defaults to every process\'s configured login log)')
+        parser.add_argument('--include-rotated', action='store_true', help='Also read login.<pid>.log.1, .2, ...')
+        parser.add_argument('--follow', action='store_true', help='Keep reading new lines and reprint the summary')
+        parser.add_argument('--interval', type=float, default=10.0, help='Seconds between summaries with --follow')
+        parser.add_argument('--top', type=int, default=10, help='Number of IPs to show')
+
+    def log_files(self, options):
+        if options['file']:
+            path = Path(options['file'])
+            return [path] if path.exists() else []
+        return process_log_files(settings.LOGGING['handlers']['file']['filename'])
+
+    def handle(self, *args, **options):
+        paths = self.log_files(options)
+        if not paths:
+            raise CommandError(f"No login log found at {options['file'] or settings.LOGGING['handlers']['file']['filename']}")
+
+        stats = LoginLogStats()
+        if options['include_rotated']:
+            for path in paths:
+                for backup in path.parent.glob(f'{path.name}.*'):
+                    with backup.open(encoding='utf-8') as handle:
+                        for line in handle:
+                            stats.add_line(line)
+
+        handles = {}
+        try:
+            for path in paths:
+                handles[path] = self.read_new(path, None, stats)
+            self.print_summary(stats, options['top'])
+            if options['follow']:
+                self.follow(handles, stats, options)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+    def read_new(self, path, handle, stats):
+        """Add the lines appended to ``path`` since the last call; reopens it if it was rotated."""
+        try:
+            if handle is not None and os.stat(path).st_ino != os.fstat(handle.fileno()).st_ino:
+                # Rotated underneath us: finish the old file, then start on the new one.
+                for line in handle:
+                    stats.add_line(line)
+                handle.close()
+                handle = None
+        except FileNotFoundError:
+            return handle
+        if handle is None:
+            handle = path.open(encoding='utf-8')
+        for line in handle:
+            stats.add_line(line)
+        return handle
+
+    def follow(self, handles, stats, options):
+        next_summary = time.monotonic() + options['interval']
+        while True:
+            time.sleep(0.5)
+            # Workers started since the last pass log to new files.
+            for path in self.log_files(options):
+                handles[path] = self.read_new(path, handles.get(path), stats)
+            if time.monotonic() >= next_summary:
+                self.print_summary(stats, options['top'])
+                next_summary = time.monotonic() + options['interval']
+
+    def print_summary(self, stats, top):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Login summary at {datetime.now():%H:%M:%S}'))
+        self.stdout.write(
+            f'Attempts: {stats.attempts}  Successes: {stats.successes}  Failures: {stats.failures}'
+        )
+        self.stdout.write(
+            f'Logins/min: last 1m {stats.rate_per_minute(1):.1f}, '
+            f'last 5m {stats.rate_per_minute(5):.1f}, last 15m {stats.rate_per_minute(15):.1f}'
+        )
+        ranked = sorted(stats.per_ip.items(), key=lambda item: (-item[1]['failures'], -item[1]['attempts']))
+        if ranked:
+            self.stdout.write(f"{'IP':<40} {'attempts':>9} {'success':>8} {'failed':>7}")
+            for ip, counts in ranked[:top]:
+                line = f"{ip:<40} {counts['attempts']:>9} {counts['successes']:>8} {counts['failures']:>7}"
+                self.stdout.write(self.style.WARNING(line) if counts['failures'] else line)
+        if stats.skipped:
+            self.stdout.write(f'({stats.skipped} non-JSON lines skipped)')
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.accounts.code_pool import refill_pool
+from apps.accounts.models import PooledCode
+
+
+class Command(BaseCommand):
+    help = 'Fills the pool of pre-generated player codes (run before registration opens)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=None,
+                            help='Target pool size (defaults to PLAYER_CODE_POOL_SIZE)')
+
+    def handle(self, *args, **options):
+        size = options['size'] if options['size'] is not None else settings.PLAYER_CODE_POOL_SIZE
+        if not size:
+            self.stdout.write(self.style.WARNING('PLAYER_CODE_POOL_SIZE is 0; the pool is disabled.'))
+            return
+        added = refill_pool(size)
+        self.stdout.write(
+            self.style.SUCCESS(f'Added {added} codes; the pool now holds {PooledCode.objects.count()}.')
+        )
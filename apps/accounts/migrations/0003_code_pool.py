@@ -0,0 +1,20 @@
+# Generated by Django 5.0.3 on 2026-10-19 06:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_player_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PooledCode',
+            fields=[
+                ('code', models.CharField(max_length=12, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.models import PermissionsMixin
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 
 from .utils import PlayerCodeGenerator
@@ -14,7 +14,13 @@ class PlayerManager(BaseUserManager):
             raise ValueError('Players must provide an email address')
         email = self.normalize_email(email)
         player = self.model(email=email, name=name, **extra_fields)
-        player.set_password(password or self.make_random_password())
+        if password:
+            player.set_password(password)
+        elif player.is_staff:
+            player.set_password(self.make_random_password())
+        else:
+            # Code-only player: logs in with unique_code, so skip the hash.
+            player.set_unusable_password()
         player.save(using=self._db)
         return player
 
@@ -48,12 +54,45 @@ class Player(AbstractBaseUser, PermissionsMixin):
     class Meta:
         ordering = ['-created_at']
 
+    CODE_ATTEMPTS = 5
+
     def save(self, *args, **kwargs):
-        if not self.unique_code:
-            self.unique_code = PlayerCodeGenerator.generate()
         if not self.last_login:
             self.last_login = timezone.now()
-        super().save(*args, **kwargs)
+        if self.unique_code:
+            super().save(*args, **kwargs)
+            return
+
+        from .code_pool import claim_code
+
+        for attempt in range(self.CODE_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    # Claimed in the insert's transaction, so a failed save puts the code back in the pool.
+                    self.unique_code = (claim_code() if attempt == 0 else None) or PlayerCodeGenerator.generate()
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                code, self.unique_code = self.unique_code, ''
+                # Only a unique_code collision is worth retrying; anything
+                # else (e.g. a duplicate email) is the caller's problem.
+                collided = Player.objects.filter(unique_code=code).exists()
+                if not collided or attempt == self.CODE_ATTEMPTS - 1:
+                    raise
+                # Already taken, so it mustn't be handed out again.
+                PooledCode.objects.filter(code=code).delete()
+            except Exception:
+                self.unique_code = ''
+                raise
 
     def __str__(self) -> str:
         return f"{self.name} ({self.unique_code})"
+
+
+class PooledCode(models.Model):
+    """A pre-generated unique code that no player has claimed yet (see code_pool.py)."""
+    code = models.CharField(max_length=12, primary_key=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return self.code
@@ -21,13 +21,15 @@ class CodeLoginSerializer(serializers.Serializer):
     unique_code = serializers.CharField(max_length=12)
 
     def validate_unique_code(self, value: str) -> str:
-        if not Player.objects.filter(unique_code=value.upper(), is_active=True).exists():
+        # Resolve the player here so save() doesn't need a second round trip.
+        try:
+            self.player = Player.objects.get(unique_code=value.upper(), is_active=True)
+        except Player.DoesNotExist:
             raise serializers.ValidationError('Invalid or inactive code supplied.')
         return value.upper()
 
     def save(self, **kwargs):
-        unique_code = self.validated_data['unique_code']
-        return Player.objects.get(unique_code=unique_code)
+        return self.player
 
 
 class PlayerProfileSerializer(serializers.ModelSerializer):
@@ -9,3 +9,228 @@ class RegistrationFlowTests(APITestCase):
         response = self.client.post(reverse('register'), payload)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertIn('player', response.data)
+
+    def test_code_only_players_skip_password_hashing(self):
+        from apps.accounts.models import Player
+
+        player = Player.objects.create_user(email='code@example.com', name='Code Only')
+        self.assertFalse(player.has_usable_password())
+        admin = Player.objects.create_superuser(email='admin@example.com', name='Admin', password='s3cret')
+        self.assertTrue(admin.check_password('s3cret'))
+        staff = Player.objects.create_user(email='staff@example.com', name='Staff', is_staff=True)
+        self.assertTrue(staff.has_usable_password())
+
+
+class CodeLoginTests(APITestCase):
+    def setUp(self):
+        from apps.accounts.models import Player
+        self.player = Player.objects.create_user(email='login@example.com', name='Login User')
+
+    def test_login_resolves_player_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('code-login'), {'unique_code': self.player.unique_code.lower()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['player']['id'], self.player.id)
+        self.assertIn('access', response.data)
+
+    def test_inactive_player_is_rejected(self):
+        self.player.is_active = False
+        self.player.save()
+        response = self.client.post(reverse('code-login'), {'unique_code': self.player.unique_code})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LoginLogTests(APITestCase):
+    def test_queued_handler_writes_json_lines(self):
+        import json
+        import logging
+        import tempfile
+        from pathlib import Path
+
+        from django.core.management import call_command
+        from io import StringIO
+
+        from apps.accounts.log_handlers import QueuedRotatingFileHandler
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'login.log'
+            handler = QueuedRotatingFileHandler(path, max_bytes=1024 * 1024)
+            logger = logging.getLogger('accounts.login.test')
+            logger.addHandler(handler)
+            logger.propagate = False
+            try:
+                logger.warning('LOGIN_ATTEMPT', extra={'ip': '10.0.0.9', 'code': 'ABC***'})
+                logger.warning('LOGIN_VALIDATION_FAILED', extra={'ip': '10.0.0.9', 'errors': {'code': ['bad']}})
+            finally:
+                logger.removeHandler(handler)
+                handler.close()
+
+            entries = [json.loads(line) for line in path.read_text().splitlines()]
+            self.assertEqual(entries[0]['event'], 'LOGIN_ATTEMPT')
+            self.assertEqual(entries[0]['ip'], '10.0.0.9')
+            self.assertEqual(entries[1]['errors'], {'code': ['bad']})
+
+            out = StringIO()
+            call_command('login_log_report', file=str(path), stdout=out)
+            self.assertIn('Attempts: 1  Successes: 0  Failures: 1', out.getvalue())
+            self.assertIn('10.0.0.9', out.getvalue())
+
+
+    def test_per_process_files_are_reported_together(self):
+        import json
+        import logging
+        import os
+        import tempfile
+        from pathlib import Path
+
+        from django.core.management import call_command
+        from django.test import override_settings
+        from io import StringIO
+
+        from apps.accounts.log_handlers import QueuedRotatingFileHandler, process_filename
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'login.log'
+            # Another running worker's file, already rotated once.
+            other = process_filename(path, pid=os.getppid())
+            other.write_text(json.dumps({'event': 'LOGIN_ATTEMPT', 'ip': '10.0.0.7'}) + '\n')
+            other.with_name(other.name + '.1').write_text(json.dumps({'event': 'LOGIN_ATTEMPT', 'ip': '10.0.0.7'}) + '\n')
+
+            handler = QueuedRotatingFileHandler(path, per_process=True)
+            logger = logging.getLogger('accounts.login.test')
+            logger.addHandler(handler)
+            logger.propagate = False
+            try:
+                logger.warning('LOGIN_ATTEMPT', extra={'ip': '10.0.0.9'})
+            finally:
+                logger.removeHandler(handler)
+                handler.close()
+
+            self.assertFalse(path.exists())
+            self.assertIn('10.0.0.9', process_filename(path).read_text())
+
+            out = StringIO()
+            logging_settings = {'handlers': {'file': {'filename': path}}}
+            with override_settings(LOGGING=logging_settings):
+                call_command('login_log_report', include_rotated=True, stdout=out)
+            self.assertIn('Attempts: 3', out.getvalue())
+
+
+    def test_files_of_exited_processes_are_pruned_on_start(self):
+        import logging
+        import os
+        import subprocess
+        import sys
+        import tempfile
+        from pathlib import Path
+
+        from apps.accounts.log_handlers import QueuedRotatingFileHandler, process_filename
+
+        exited = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                                capture_output=True, text=True, check=True)
+        dead_pid = int(exited.stdout)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'login.log'
+            dead = process_filename(path, pid=dead_pid)
+            live = process_filename(path, pid=os.getppid())
+            for file in (dead, dead.with_name(dead.name + '.1'), live, Path(tmp) / 'other.log'):
+                file.write_text('{}\n')
+
+            handler = QueuedRotatingFileHandler(path, per_process=True)
+            try:
+                handler.handle(logging.makeLogRecord({'msg': 'LOGIN_ATTEMPT'}))
+            finally:
+                handler.close()
+
+            self.assertEqual(
+                sorted(file.name for file in Path(tmp).iterdir()),
+                sorted([live.name, process_filename(path).name, 'other.log']),
+            )
+
+
+class AttendeeImportTests(APITestCase):
+    def setUp(self):
+        from apps.accounts.models import Player
+        self.existing = Player.objects.create_user(email='taken@example.com', name='Existing')
+        self.staff = Player.objects.create_superuser(email='staff@example.com', name='Staff', password='pw')
+
+    def test_import_skips_duplicates_and_reports_invalid_rows(self):
+        from apps.accounts.importer import import_attendees
+        from apps.accounts.models import Player
+
+        rows = [{'name': f'Rep {i}', 'email': f'rep{i}@example.com', 'organization': 'Sales'} for i in range(30)]
+        rows += [
+            {'name': 'Dup', 'email': 'rep0@example.com'},
+            {'name': 'Existing', 'email': 'taken@example.com'},
+            {'name': '', 'email': 'nameless@example.com'},
+            {'name': 'Bad', 'email': 'not-an-email'},
+        ]
+        # Per chunk: existing emails, code collision check, insert.
+        with self.assertNumQueries(3 * 3):
+            result = import_attendees(rows, chunk_size=12)
+
+        self.assertEqual(len(result.created), 30)
+        self.assertEqual([s['reason'] for s in result.skipped], ['duplicate in file', 'already registered'])
+        self.assertEqual([e['row'] for e in result.errors], [33, 34])
+        imported = Player.objects.filter(organization='Sales')
+        self.assertEqual(imported.count(), 30)
+        self.assertEqual(len(set(imported.values_list('unique_code', flat=True))), 30)
+        self.assertFalse(imported.first().has_usable_password())
+
+    def test_import_endpoint_accepts_csv_upload_from_staff_only(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        upload = SimpleUploadedFile('attendees.csv', b'Name,Email,Location\nAda,ada@example.com,Lagos\n')
+        response = self.client.post(reverse('import-attendees'), {'file': upload}, format='multipart')
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+        self.client.force_authenticate(self.staff)
+        upload.seek(0)
+        response = self.client.post(reverse('import-attendees'), {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+        code = response.data['players'][0]['unique_code']
+        login = self.client.post(reverse('code-login'), {'unique_code': code})
+        self.assertEqual(login.status_code, status.HTTP_200_OK)
+
+
+class CodePoolTests(APITestCase):
+    def test_registration_claims_pooled_codes(self):
+        from apps.accounts.code_pool import refill_pool
+        from apps.accounts.models import Player, PooledCode
+
+        existing = Player.objects.create_user(email='first@example.com', name='First')
+        self.assertEqual(refill_pool(5), 5)
+        pooled = set(PooledCode.objects.values_list('code', flat=True))
+        self.assertNotIn(existing.unique_code, pooled)
+
+        player = Player.objects.create_user(email='second@example.com', name='Second')
+        self.assertIn(player.unique_code, pooled)
+        self.assertEqual(PooledCode.objects.count(), 4)
+        self.assertFalse(PooledCode.objects.filter(code=player.unique_code).exists())
+        self.assertEqual(refill_pool(5), 1)
+
+    def test_code_collision_is_retried(self):
+        from unittest import mock
+
+        from apps.accounts.models import Player
+
+        existing = Player.objects.create_user(email='first@example.com', name='First')
+        with mock.patch('apps.accounts.code_pool.claim_code', return_value=existing.unique_code):
+            player = Player.objects.create_user(email='second@example.com', name='Second')
+        self.assertNotEqual(player.unique_code, existing.unique_code)
+
+    def test_duplicate_email_is_not_retried(self):
+        from django.db import IntegrityError
+
+        from apps.accounts.code_pool import refill_pool
+        from apps.accounts.models import Player, PooledCode
+
+        Player.objects.create_user(email='first@example.com', name='First')
+        refill_pool(3)
+        pooled = set(PooledCode.objects.values_list('code', flat=True))
+        with self.assertRaises(IntegrityError):
+            Player.objects.create_user(email='first@example.com', name='Again')
+        # The failed insert's claim was rolled back with it.
+        self.assertEqual(set(PooledCode.objects.values_list('code', flat=True)), pooled)
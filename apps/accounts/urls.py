@@ -1,9 +1,10 @@
 from django.urls import path
 
-from .views import CodeLoginView, ProfileView, RegisterView
+from .views import CodeLoginView, ImportAttendeesView, ProfileView, RegisterView
 
 urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
     path('code-login/', CodeLoginView.as_view(), name='code-login'),
     path('me/', ProfileView.as_view(), name='profile'),
+    path('import/', ImportAttendeesView.as_view(), name='import-attendees'),
 ]
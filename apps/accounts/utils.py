@@ -12,3 +12,29 @@ class PlayerCodeGenerator:
     @classmethod
     def generate(cls, length: int = 8) -> str:
         return ''.join(secrets.choice(cls.ALPHABET) for _ in range(length))
+
+    @classmethod
+    def allocate(cls, count: int, length: int = 8, exclude: set[str] | None = None) -> list[str]:
+        """
+        Return ``count`` distinct codes that no player has yet.
+
+        Candidates are checked against the player table with one ``IN`` query
+        per round; only the (rare) collisions are regenerated.
+        """
+        from django.contrib.auth import get_user_model
+
+        Player = get_user_model()
+        taken = set(exclude or ())
+        codes: list[str] = []
+        while len(codes) < count:
+            candidates = set()
+            while len(candidates) < count - len(codes):
+                code = cls.generate(length)
+                if code not in taken:
+                    candidates.add(code)
+            taken |= candidates
+            existing = set(
+                Player.objects.filter(unique_code__in=candidates).order_by().values_list('unique_code', flat=True)
+            )
+            codes.extend(candidates - existing)
+        return codes
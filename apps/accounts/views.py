@@ -1,15 +1,15 @@
 from __future__ import annotations
 
 import logging
-import traceback
-from datetime import datetime
 
-from rest_framework import generics, permissions, response, status
+from rest_framework import generics, permissions, response, serializers, status
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from nbcc_backend.api_docs import openapi, swagger_auto_schema
 
+from apps.gameplay import telemetry
+from .importer import import_attendees, read_attendees
 from .serializers import (
     CodeLoginSerializer,
     LoginResponseSerializer,
@@ -51,11 +51,10 @@ class CodeLoginView(APIView):
         return request.META.get('REMOTE_ADDR', 'unknown')
 
     def _get_request_context(self, request):
-        """Build context dict for logging."""
+        """Build context dict for logging (the record carries its own timestamp)."""
         return {
             'ip': self._get_client_ip(request),
             'user_agent': request.META.get('HTTP_USER_AGENT', 'unknown')[:200],
-            'timestamp': datetime.now().isoformat(),
             'path': request.path,
             'method': request.method,
         }
@@ -87,55 +86,46 @@ class CodeLoginView(APIView):
             400: "Invalid or inactive unique code"
         }
     )
+    @telemetry.track('code_login')
     def post(self, request, *args, **kwargs):
         ctx = self._get_request_context(request)
         unique_code = request.data.get('unique_code', '')
         masked_code = unique_code[:3] + '***' if len(unique_code) > 3 else '***'
         
-        logger.info(
-            f"LOGIN_ATTEMPT | code={masked_code} | ip={ctx['ip']} | "
-            f"user_agent={ctx['user_agent'][:50]} | timestamp={ctx['timestamp']}"
-        )
+        # Events are logged with structured fields (see log_handlers.py);
+        # nothing is formatted on the request thread.
+        logger.info('LOGIN_ATTEMPT', extra={**ctx, 'code': masked_code})
         
         try:
-            # Step 1: Validate serializer
-            logger.debug(f"LOGIN_STEP_1 | Validating serializer | code={masked_code}")
+            # Step 1: Validate serializer (resolves the active player in one query)
+            logger.debug('LOGIN_STEP_1', extra={'step': 'validate', 'code': masked_code})
             serializer = CodeLoginSerializer(data=request.data)
             
             if not serializer.is_valid():
                 errors = serializer.errors
                 logger.warning(
-                    f"LOGIN_VALIDATION_FAILED | code={masked_code} | ip={ctx['ip']} | "
-                    f"errors={errors} | timestamp={ctx['timestamp']}"
+                    'LOGIN_VALIDATION_FAILED',
+                    extra={'code': masked_code, 'ip': ctx['ip'], 'errors': errors},
                 )
                 return response.Response(
                     {'detail': 'Invalid request data', 'errors': errors},
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Step 2: Authenticate and get player
-            logger.debug(f"LOGIN_STEP_2 | Looking up player | code={masked_code}")
+            # Step 2: Player resolved during validation
             player = serializer.save()
             
-            if not player:
-                logger.warning(
-                    f"LOGIN_PLAYER_NOT_FOUND | code={masked_code} | ip={ctx['ip']} | "
-                    f"timestamp={ctx['timestamp']}"
-                )
-                return response.Response(
-                    {'detail': 'Invalid or inactive unique code'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
             # Step 3: Generate JWT tokens
-            logger.debug(f"LOGIN_STEP_3 | Generating tokens | player_id={player.id}")
+            logger.debug('LOGIN_STEP_3', extra={'step': 'tokens', 'player_id': player.id})
             refresh = RefreshToken.for_user(player)
             
             # Step 4: Success - log and return
             logger.info(
-                f"LOGIN_SUCCESS | player_id={player.id} | name={player.name} | "
-                f"code={masked_code} | ip={ctx['ip']} | is_staff={player.is_staff} | "
-                f"timestamp={ctx['timestamp']}"
+                'LOGIN_SUCCESS',
+                extra={
+                    'player_id': player.id, 'player_name': player.name, 'code': masked_code,
+                    'ip': ctx['ip'], 'is_staff': player.is_staff,
+                },
             )
             
             return response.Response(
@@ -146,10 +136,10 @@ class CodeLoginView(APIView):
                 }
             )
             
-        except serializer.ValidationError as ve:
+        except serializers.ValidationError as ve:
             logger.warning(
-                f"LOGIN_VALIDATION_ERROR | code={masked_code} | ip={ctx['ip']} | "
-                f"error={str(ve)} | timestamp={ctx['timestamp']}"
+                'LOGIN_VALIDATION_ERROR',
+                extra={'code': masked_code, 'ip': ctx['ip'], 'error': ve},
             )
             return response.Response(
                 {'detail': str(ve)},
@@ -158,11 +148,10 @@ class CodeLoginView(APIView):
             
         except Exception as e:
             # Log full traceback for unexpected errors
-            tb = traceback.format_exc()
             logger.error(
-                f"LOGIN_ERROR | code={masked_code} | ip={ctx['ip']} | "
-                f"error_type={type(e).__name__} | error={str(e)} | "
-                f"timestamp={ctx['timestamp']}\n{tb}"
+                'LOGIN_ERROR',
+                extra={'code': masked_code, 'ip': ctx['ip'], 'error_type': type(e).__name__, 'error': e},
+                exc_info=True,
             )
             return response.Response(
                 {'detail': 'Login failed. Please try again.'},
@@ -175,3 +164,39 @@ class ProfileView(generics.RetrieveAPIView):
 
     def get_object(self):
         return self.request.user
+
+
+class ImportAttendeesView(APIView):
+    """
+    POST /api/auth/import/
+
+    Staff-only bulk registration. Send a ``file`` upload (CSV with a
+    name,email,organization,location header, or a JSON array), or a JSON
+    body with an ``attendees`` array. Add ``dry_run=true`` to only validate.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    parser_classes = [JSONParser, MultiPartParser]
+
+    @swagger_auto_schema(
+        operation_description="Bulk-import attendees from CSV/JSON. Returns the created players with their unique codes.",
+        responses={201: "Import summary", 400: "Unreadable attendee list"}
+    )
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        try:
+            if upload is not None:
+                fmt = request.data.get('format') or ('json' if upload.name.endswith('.json') else 'csv')
+                rows = read_attendees(upload, fmt)
+            else:
+                rows = request.data.get('attendees')
+                if not isinstance(rows, list):
+                    raise ValueError('Provide a file upload or an attendees array.')
+        except (ValueError, UnicodeDecodeError) as exc:
+            return response.Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true')
+        result = import_attendees(rows, dry_run=dry_run)
+        return response.Response(
+            result.as_dict(),
+            status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED,
+        )
@@ -1,32 +1,46 @@
 from django.contrib import admin
 
+from .admin_scaling import ScalableAdminMixin
 from .models import QuizResult, GameAnswer, GameSession, Challenge, UserFeedback
 
+# Player columns behind player / player_name in list_display (Player.__str__).
+PLAYER_LIST_FIELDS = ('player__name', 'player__unique_code')
+
 
 @admin.register(QuizResult)
-class QuizResultAdmin(admin.ModelAdmin):
+class QuizResultAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ('player_name', 'score', 'total_questions', 'created_at')
+    list_select_related = ('player',)
+    list_only = ('display_name', 'score', 'total_questions', 'created_at', *PLAYER_LIST_FIELDS)
     search_fields = ('display_name', 'player__name', 'player__email')
-    list_filter = ('created_at',)
+    date_hierarchy = 'created_at'
     ordering = ('-score', '-created_at')
 
 
 @admin.register(GameAnswer)
-class GameAnswerAdmin(admin.ModelAdmin):
+class GameAnswerAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ('player', 'game_type', 'question_id', 'is_correct', 'time_taken_seconds', 'created_at')
+    list_select_related = ('player',)
+    list_only = ('game_type', 'question_id', 'is_correct', 'time_taken_seconds', 'created_at', *PLAYER_LIST_FIELDS)
     search_fields = ('player__name', 'player__email', 'question_text')
-    list_filter = ('game_type', 'is_correct', 'created_at')
+    list_filter = ('game_type', 'is_correct')
+    date_hierarchy = 'created_at'
     ordering = ('-created_at',)
     readonly_fields = ('created_at',)
 
 
 @admin.register(GameSession)
-class GameSessionAdmin(admin.ModelAdmin):
+class GameSessionAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ('player', 'game_type', 'correct_answers', 'total_questions', 'score_percentage',
                     'is_correct', 'set_a_score', 'set_a_total', 'set_b_score', 'set_b_total',
                     'completed', 'started_at')
+    list_select_related = ('player',)
+    # answers_data is left out: it's only shown on the change form.
+    list_only = ('game_type', 'correct_answers', 'total_questions', 'is_correct', 'set_a_score', 'set_a_total',
+                 'set_b_score', 'set_b_total', 'completed', 'started_at', *PLAYER_LIST_FIELDS)
     search_fields = ('player__name', 'player__email')
-    list_filter = ('game_type', 'completed', 'is_correct', 'started_at')
+    list_filter = ('game_type', 'completed', 'is_correct')
+    date_hierarchy = 'started_at'
     ordering = ('-started_at',)
     readonly_fields = ('started_at', 'score_percentage', 'formatted_answers_data')
 
@@ -61,7 +75,7 @@ class GameSessionAdmin(admin.ModelAdmin):
 
 @admin.register(Challenge)
 class ChallengeAdmin(admin.ModelAdmin):
-    list_display = ('name', 'is_active', 'started_at', 'ended_at')
+    list_display = ('name', 'is_active', 'started_at', 'ended_at', 'archived_at')
     list_filter = ('is_active',)
     ordering = ('-started_at',)
 
@@ -0,0 +1,64 @@
+"""
+Admin changelists for tables that grow to millions of rows.
+
+ScalableAdminMixin makes a changelist page cost a fixed number of queries:
+
+* ``list_select_related`` joins the player in, and ``list_only`` limits
+  the columns loaded to what the list shows, so large JSON/text columns
+  (GameSession.answers_data, GameAnswer.question_text, ...) stay in the
+  database until a row is opened.
+* EstimatedCountPaginator uses the planner's row estimate instead of
+  ``COUNT(*)`` on PostgreSQL once a table or filter is past
+  ADMIN_ESTIMATED_COUNT_THRESHOLD rows; below it, or on other databases,
+  counts stay exact. ``show_full_result_count`` is off, so filtered pages
+  don't run a second, unfiltered count.
+
+Page numbers past the end of an estimated count simply show an empty page.
+"""
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimated_count(queryset):
+    """The planner's row estimate for ``queryset``, or None where there isn't one."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that trusts the planner's estimate for large result sets."""
+
+    @cached_property
+    def count(self):
+        threshold = getattr(settings, 'ADMIN_ESTIMATED_COUNT_THRESHOLD', 0)
+        if threshold and hasattr(self.object_list, 'query'):
+            estimate = estimated_count(self.object_list)
+            if estimate is not None and estimate >= threshold:
+                return estimate
+        return super().count
+
+
+class ScalableAdminMixin:
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    # Fields (including player__ lookups) loaded for changelist rows; None loads every column.
+    list_only = None
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if self.list_only and match and match.url_name and match.url_name.endswith('_changelist'):
+            queryset = queryset.only(*self.list_only)
+        return queryset
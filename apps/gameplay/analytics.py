@@ -0,0 +1,156 @@
+"""
+Vectorised answer statistics.
+
+Each loader pulls only the columns it needs with a single ``values_list``
+query and returns NumPy arrays. The summary helpers then work on whole
+arrays (``bincount``, ``argsort``-based grouping, ``percentile``) instead of
+looping over querysets row by row.
+"""
+from itertools import chain
+
+import numpy as np
+
+from .archive import game_answer_values, quiz_stat_values
+from .models import GameSession
+
+TIME_PERCENTILES = (50, 90, 95, 99)
+
+
+def _to_columns(rows, width):
+    """Turn ``values_list`` rows from one query into a float array per column."""
+    flat = np.fromiter(chain.from_iterable(rows), dtype=np.float64)
+    table = flat.reshape(-1, width)
+    return [table[:, i] for i in range(width)]
+
+
+def load_quiz_answers(challenge_id=None):
+    """Return (player_ids, is_correct, time_taken) arrays for QuizStat rows, archived ones included."""
+    filters = {} if challenge_id is None else {'challenge_id': challenge_id}
+    rows = quiz_stat_values(('user_id', 'is_correct', 'time_taken'), **filters)
+    player_ids, correct, times = _to_columns(rows, 3)
+    return player_ids.astype(np.int64), correct.astype(bool), times
+
+
+def load_game_answers(game_type=None):
+    """Return (player_ids, is_correct, time_taken) arrays for GameAnswer rows, archived ones included."""
+    filters = {'game_type': game_type} if game_type else {}
+    rows = game_answer_values(('player_id', 'is_correct', 'time_taken_seconds'), **filters)
+    player_ids, correct, times = _to_columns(rows, 3)
+    return player_ids.astype(np.int64), correct.astype(bool), times
+
+
+def load_game_sessions(game_type=None):
+    """Return (player_ids, correct_answers, total_questions, total_time) arrays for GameSession rows."""
+    queryset = GameSession.objects.order_by()
+    if game_type:
+        queryset = queryset.filter(game_type=game_type)
+    rows = queryset.values_list('player_id', 'correct_answers', 'total_questions', 'total_time_seconds')
+    player_ids, correct, totals, times = _to_columns(rows, 4)
+    return player_ids.astype(np.int64), correct.astype(np.int64), totals.astype(np.int64), times
+
+
+def _percentiles(values):
+    if values.size == 0:
+        return {f'p{p}': None for p in TIME_PERCENTILES}
+    points = np.percentile(values, TIME_PERCENTILES)
+    return {f'p{p}': round(float(v), 3) for p, v in zip(TIME_PERCENTILES, points)}
+
+
+def _distribution(values):
+    summary = {'mean': round(float(values.mean()), 3) if values.size else None}
+    summary.update(_percentiles(values))
+    return summary
+
+
+def _group_medians(inverse, values, counts):
+    """
+    Per-group (lower) median using a single argsort: rows are ordered by group
+    and then by value, so each group's median sits at a fixed offset from the
+    start of its run.
+    """
+    # Fold the value into the fractional part of the group index so one
+    # float argsort replaces a much slower two-key lexsort.
+    span = values.max() - values.min() + 1.0
+    order = np.argsort(inverse + (values - values.min()) / span)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return values[order][starts + (counts - 1) // 2]
+
+
+def summarise_answers(player_ids, is_correct, time_taken):
+    """
+    Aggregate individual answers (QuizStat or GameAnswer rows).
+
+    Returns overall accuracy, time-taken percentiles, a histogram of correct
+    answers per player and the distribution of per-player accuracy, volume
+    and median answer time.
+    """
+    total = int(player_ids.size)
+    if total == 0:
+        return {
+            'total_answers': 0,
+            'total_players': 0,
+            'accuracy': None,
+            'time_taken': _distribution(time_taken),
+            'score_histogram': [],
+            'per_player': {},
+        }
+
+    players, inverse = np.unique(player_ids, return_inverse=True)
+    answered = np.bincount(inverse)
+    correct = np.bincount(inverse, weights=is_correct).astype(np.int64)
+    accuracy = correct / answered
+    median_times = _group_medians(inverse, time_taken, answered)
+
+    return {
+        'total_answers': total,
+        'total_players': int(players.size),
+        'accuracy': round(float(is_correct.mean()) * 100, 2),
+        'time_taken': _distribution(time_taken),
+        'score_histogram': np.bincount(correct).tolist(),
+        'per_player': {
+            'answered': _distribution(answered),
+            'accuracy': _distribution(accuracy * 100),
+            'median_time': _distribution(median_times),
+        },
+    }
+
+
+def summarise_sessions(player_ids, correct_answers, total_questions, total_time):
+    """
+    Aggregate completed game sessions.
+
+    Besides the per-session score histogram and time percentiles, each
+    player's best session score is found by sorting once and reducing over
+    the per-player runs.
+    """
+    total = int(player_ids.size)
+    if total == 0:
+        return {
+            'total_sessions': 0,
+            'total_players': 0,
+            'accuracy': None,
+            'time_taken': _distribution(total_time),
+            'score_histogram': [],
+            'per_player': {},
+        }
+
+    order = np.argsort(player_ids, kind='stable')
+    sorted_ids = player_ids[order]
+    starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+    best_scores = np.maximum.reduceat(correct_answers[order], starts)
+    sessions_per_player = np.diff(np.r_[starts, total])
+
+    question_total = int(total_questions.sum())
+    accuracy = correct_answers.sum() / question_total * 100 if question_total else 0.0
+
+    return {
+        'total_sessions': total,
+        'total_players': int(starts.size),
+        'accuracy': round(float(accuracy), 2),
+        'time_taken': _distribution(total_time),
+        'score_histogram': np.bincount(correct_answers).tolist(),
+        'per_player': {
+            'sessions': _distribution(sessions_per_player),
+            'best_score': _distribution(best_scores),
+        },
+    }
@@ -0,0 +1,69 @@
+from nbcc_backend.api_docs import openapi, swagger_auto_schema
+from rest_framework import status, permissions
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+from .models import GameType
+from .response_cache import cached_response
+
+
+class AnswerAnalyticsAPIView(APIView):
+    """
+    Aggregate answer statistics for dashboards.
+
+    GET /api/gameplay/analytics/?source=quiz&challenge_id=3
+    GET /api/gameplay/analytics/?source=game_answers&game_type=beer_cup
+    GET /api/gameplay/analytics/?source=game_sessions&game_type=jigsaw
+
+    Staff only: each miss loads every matching answer, hot and archived.
+    Results are cached for GAMEPLAY_RESPONSE_CACHE_TTLS['analytics'] seconds
+    rather than versioned, since answers arrive constantly during an event.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    SOURCES = ('quiz', 'game_answers', 'game_sessions')
+
+    @swagger_auto_schema(
+        operation_description="Accuracy, time-taken percentiles, score histogram and per-player distributions.",
+        manual_parameters=[
+            openapi.Parameter('source', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=list(SOURCES)),
+            openapi.Parameter('challenge_id', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('game_type', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
+    )
+    @cached_response('analytics', params=('source', 'challenge_id', 'game_type'))
+    def get(self, request):
+        # NumPy is only needed here; keep it out of worker start-up.
+        from . import analytics
+
+        source = request.query_params.get('source', 'quiz')
+        if source not in self.SOURCES:
+            return Response(
+                {'error': f'Invalid source. Must be one of: {list(self.SOURCES)}'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        game_type = request.query_params.get('game_type') or None
+        if game_type and game_type not in GameType.values:
+            return Response(
+                {'error': f'Invalid game_type. Must be one of: {GameType.values}'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if source == 'quiz':
+            challenge_id = request.query_params.get('challenge_id')
+            if challenge_id is not None:
+                try:
+                    challenge_id = int(challenge_id)
+                except ValueError:
+                    return Response({'error': 'challenge_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+            stats = analytics.summarise_answers(*analytics.load_quiz_answers(challenge_id))
+            filters = {'challenge_id': challenge_id}
+        elif source == 'game_answers':
+            stats = analytics.summarise_answers(*analytics.load_game_answers(game_type))
+            filters = {'game_type': game_type}
+        else:
+            stats = analytics.summarise_sessions(*analytics.load_game_sessions(game_type))
+            filters = {'game_type': game_type}
+
+        return Response({'source': source, 'filters': filters, 'stats': stats}, status=status.HTTP_200_OK)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GameplayConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.gameplay'
+
+    def ready(self):
+        from . import signals
+        signals.connect()
@@ -0,0 +1,183 @@
+"""
+Hot/cold partitioning of answer rows.
+
+Live endpoints only ever read answers for the active challenge, so once a
+challenge ends its QuizStat rows (and the GameAnswer rows created while it
+ran) are moved in chunked batches into the archive tables. This keeps the hot
+tables and their indexes small for the next event.
+
+Historical reads go through the helpers at the bottom of this module, which
+read the hot and archive tables together so callers don't need to know
+whether (or how far) a challenge has been archived.
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from .models import ArchivedGameAnswer, ArchivedQuizStat, Challenge, GameAnswer
+from .quiz_stats import QuizStat
+
+logger = logging.getLogger(__name__)
+
+QUIZ_STAT_FIELDS = ('id', 'user_id', 'challenge_id', 'question_id', 'is_correct', 'time_taken', 'timestamp')
+GAME_ANSWER_FIELDS = (
+    'id', 'player_id', 'game_type', 'question_id', 'question_text', 'selected_answer',
+    'correct_answer', 'is_correct', 'time_taken_seconds', 'created_at',
+)
+
+
+def _batch_size():
+    return getattr(settings, 'GAMEPLAY_ARCHIVE_BATCH_SIZE', 2000)
+
+
+def _move_rows(queryset, archive_model, fields, batch_size, **extra):
+    """
+    Copy rows into ``archive_model`` and delete them from the hot table, one
+    batch per transaction so a crash never loses or duplicates a row and locks
+    are held only briefly.
+
+    Archive rows keep their hot-table ids, so when two runs overlap (e.g. two
+    workers ending challenges at once) the second copy of a batch is skipped
+    rather than raising IntegrityError. Only the rows a run deletes count as
+    moved by it.
+    """
+    moved = 0
+    hot_model = queryset.model
+    while True:
+        with transaction.atomic():
+            rows = list(queryset.order_by('pk').values(*fields)[:batch_size])
+            if not rows:
+                break
+            archive_model.objects.bulk_create([archive_model(**row, **extra) for row in rows], ignore_conflicts=True)
+            deleted, _ = hot_model.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+        moved += deleted
+    return moved
+
+
+def archive_challenge(challenge, batch_size=None):
+    """Move an ended challenge's answers into the archive tables."""
+    if challenge.is_active:
+        raise ValueError('Cannot archive an active challenge.')
+
+    batch_size = batch_size or _batch_size()
+    quiz_stats = _move_rows(
+        QuizStat.objects.filter(challenge=challenge),
+        ArchivedQuizStat,
+        QUIZ_STAT_FIELDS,
+        batch_size,
+    )
+
+    game_answers = 0
+    if challenge.ended_at:
+        game_answers = _move_rows(
+            GameAnswer.objects.filter(created_at__gte=challenge.started_at, created_at__lt=challenge.ended_at),
+            ArchivedGameAnswer,
+            GAME_ANSWER_FIELDS,
+            batch_size,
+            challenge_id=challenge.id,
+        )
+
+    challenge.archived_at = timezone.now()
+    challenge.save(update_fields=['archived_at'])
+    logger.info(
+        'Archived challenge %s: %s quiz stats, %s game answers', challenge.id, quiz_stats, game_answers,
+    )
+    return {'quiz_stats': quiz_stats, 'game_answers': game_answers}
+
+
+def archive_ended_challenges(batch_size=None):
+    """Archive every ended challenge that hasn't been archived yet."""
+    results = {}
+    pending = Challenge.objects.filter(is_active=False, archived_at__isnull=True).order_by('started_at')
+    for challenge in pending:
+        results[challenge.id] = archive_challenge(challenge, batch_size=batch_size)
+    return results
+
+
+def _archive_in_background():
+    close_old_connections()
+    try:
+        archive_ended_challenges()
+    except Exception:
+        logger.exception('Background challenge archival failed')
+    finally:
+        connection.close()
+
+
+def schedule_archival():
+    """
+    Archive ended challenges off the request thread once the current
+    transaction commits. Does nothing unless GAMEPLAY_ARCHIVE_ENDED_CHALLENGES
+    is enabled.
+    """
+    if not getattr(settings, 'GAMEPLAY_ARCHIVE_ENDED_CHALLENGES', False):
+        return
+    transaction.on_commit(
+        lambda: threading.Thread(target=_archive_in_background, name='challenge-archiver', daemon=True).start()
+    )
+
+
+# Historical reads ---------------------------------------------------------
+
+def quiz_stat_sources(**filters):
+    """Hot and archived QuizStat querysets with the same filters applied."""
+    return QuizStat.objects.filter(**filters), ArchivedQuizStat.objects.filter(**filters)
+
+
+def quiz_stat_values(fields, **filters):
+    """``values_list`` rows for QuizStat across the hot and archive tables."""
+    hot, archived = quiz_stat_sources(**filters)
+    return hot.order_by().values_list(*fields).union(archived.order_by().values_list(*fields), all=True)
+
+
+def game_answer_values(fields, **filters):
+    """``values_list`` rows for GameAnswer across the hot and archive tables."""
+    hot = GameAnswer.objects.filter(**filters).order_by().values_list(*fields)
+    archived = ArchivedGameAnswer.objects.filter(**filters).order_by().values_list(*fields)
+    return hot.union(archived, all=True)
+
+
+def _quiz_totals_by_user(model, user_ids):
+    """Per-player counts and latest question for one table, grouped in SQL."""
+    latest = model.objects.filter(user_id=OuterRef('user_id')).order_by('-timestamp', '-pk')
+    return (
+        model.objects.filter(user_id__in=user_ids)
+        .order_by()
+        .values('user_id')
+        .annotate(
+            answered=Count('pk'),
+            correct=Count('pk', filter=Q(is_correct=True)),
+            last_timestamp=Max('timestamp'),
+            last_question=Subquery(latest.values('question_id')[:1]),
+        )
+        .values_list('user_id', 'answered', 'correct', 'last_timestamp', 'last_question')
+    )
+
+
+def player_quiz_totals(user_ids):
+    """
+    Answered/correct/failed counts and the latest question per player, over
+    every challenge including archived ones. Each table is aggregated in SQL
+    and the two are combined in a single query, so at most two rows per
+    player reach Python.
+    """
+    totals = {}
+    rows = _quiz_totals_by_user(QuizStat, user_ids).union(
+        _quiz_totals_by_user(ArchivedQuizStat, user_ids), all=True,
+    )
+    for user_id, answered, correct, last_timestamp, last_question in rows:
+        entry = totals.setdefault(user_id, {
+            'total_answered': 0, 'total_correct': 0, 'total_failed': 0,
+            'current_question': None, 'last_timestamp': None,
+        })
+        entry['total_answered'] += answered
+        entry['total_correct'] += correct
+        entry['total_failed'] += answered - correct
+        if entry['last_timestamp'] is None or last_timestamp > entry['last_timestamp']:
+            entry['last_timestamp'] = last_timestamp
+            entry['current_question'] = last_question
+    return totals
@@ -1,164 +1,197 @@
 import json
 import asyncio
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
-from channels.db import database_sync_to_async
-from django.contrib.auth import get_user_model
-from django.db.models import Sum, F, Q
-from .models import Challenge
-from .quiz_stats import QuizStat
+from django.conf import settings
+from .db_executor import consumer_db
+from . import leaderboard, standings
+from .leaderboard import snapshots
+from .outbound import OutboundMixin
+from .telemetry import collector
 
+logger = logging.getLogger(__name__)
 
-class LeaderboardConsumer(AsyncWebsocketConsumer):
+
+class LeaderboardConsumer(OutboundMixin, AsyncWebsocketConsumer):
     """
     WebSocket consumer for real-time leaderboard updates.
     Sends updates only when rankings change.
+
+    Every socket in the process reads the same LeaderboardSnapshot, so the
+    leaderboard is queried and JSON-encoded once per refresh interval
+    instead of once per viewer; a socket only remembers the rank version it
+    last sent.
+
+    Challenge starts and ends arrive as ``challenge.event`` messages on the
+    leaderboard group and are sent on at once. While no challenge is active
+    the socket waits for the next start event, re-checking only every
+    GAMEPLAY_WS_FALLBACK_POLL_SECONDS for starts published in other
+    processes, which the in-memory channel layer doesn't carry.
+
+    Frames go through the socket's outbox (outbound.py), where a snapshot
+    the client hasn't been sent yet is replaced by the next one.
     """
+    stream = 'leaderboard'
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.previous_leaderboard = []
         self.update_task = None
+        self.sent_rank_version = None
         self.challenge_id = None
+        self.wake = asyncio.Event()
         
     async def connect(self):
         """Accept WebSocket connection and start background task."""
+        await self.channel_layer.group_add(leaderboard.GROUP, self.channel_name)
         await self.accept()
+        self.start_outbound()
         
         # Start background task to periodically check for leaderboard updates
         self.update_task = asyncio.create_task(self.send_leaderboard_updates())
         
     async def disconnect(self, close_code):
         """Cancel background task on disconnect."""
+        await self.channel_layer.group_discard(leaderboard.GROUP, self.channel_name)
         if self.update_task:
             self.update_task.cancel()
-            
-    async def receive(self, text_data):
-        """Handle messages from WebSocket (optional for future use)."""
-        pass
-    
-    @database_sync_to_async
-    def get_leaderboard_data(self):
-        """
-        Fetch and calculate leaderboard rankings for the active challenge.
-        Rankings based on:
-        1. Number of correct answers (DESC)
-        2. Total time taken (ASC) - faster is better
-        """
-        # Get the latest active challenge
-        challenge = Challenge.objects.filter(is_active=True).order_by('-started_at').first()
-        
-        if not challenge:
-            return None, []
-        
-        User = get_user_model()
-        
-        # Get all users who have answered questions in this challenge
-        user_stats = QuizStat.objects.filter(
-            challenge=challenge
-        ).values('user').distinct()
-        
-        leaderboard = []
-        
-        for user_stat in user_stats:
-            user_id = user_stat['user']
-            user = User.objects.filter(id=user_id).first()
-            
-            if not user:
-                continue
-            
-            # Get stats for this user in the current challenge
-            stats = QuizStat.objects.filter(
-                user_id=user_id,
-                challenge=challenge
-            )
-            
-            total_answered = stats.count()
-            total_correct = stats.filter(is_correct=True).count()
-            total_time = stats.aggregate(total=Sum('time_taken'))['total'] or 0.0
-            
-            leaderboard.append({
-                'user_id': user.id,
-                'unique_code': user.unique_code,
-                'name': user.name,
-                'total_answered': total_answered,
-                'total_correct': total_correct,
-                'total_time': round(total_time, 2),
-            })
-        
-        # Sort by total_correct (DESC), then by total_time (ASC)
-        leaderboard.sort(key=lambda x: (-x['total_correct'], x['total_time']))
-        
-        # Add rank to each entry
-        for idx, entry in enumerate(leaderboard, start=1):
-            entry['rank'] = idx
-            
-        return challenge.id, leaderboard
+        self.stop_outbound()
     
-    def has_leaderboard_changed(self, new_leaderboard):
+    async def get_snapshot(self):
         """
-        Compare new leaderboard with previous to detect ranking changes.
-        Returns True if any rank position has changed.
+        The shared snapshot; only the first socket to find it stale goes to
+        the DB, through the bounded consumer executor.
         """
-        if len(new_leaderboard) != len(self.previous_leaderboard):
-            return True
-        
-        # Create rank mapping for comparison
-        new_ranks = {entry['user_id']: entry['rank'] for entry in new_leaderboard}
-        old_ranks = {entry['user_id']: entry['rank'] for entry in self.previous_leaderboard}
-        
-        # Check if any ranks have changed
-        for user_id, new_rank in new_ranks.items():
-            if old_ranks.get(user_id) != new_rank:
-                return True
-                
-        return False
+        max_age = settings.GAMEPLAY_LEADERBOARD_REFRESH_SECONDS
+        return snapshots.peek(max_age) or await consumer_db.run(snapshots.get, max_age)
+
+    def send_snapshot(self, snapshot):
+        # Send on a new challenge or when any rank position has changed
+        if (snapshot.challenge_id != self.challenge_id
+                or snapshot.rank_version != self.sent_rank_version):
+            self.outbox.put_latest('leaderboard', snapshot.text)
+            self.challenge_id = snapshot.challenge_id
+            self.sent_rank_version = snapshot.rank_version
+
+    async def challenge_event(self, event):
+        """A challenge started or ended: tell the client, then send the leaderboard it switched to."""
+        challenge_id, active = event['challenge_id'], event['active']
+        self.outbox.put_event(json.dumps({
+            'type': 'challenge_started' if active else 'challenge_ended',
+            'challenge_id': challenge_id,
+        }))
+        snapshot = await consumer_db.run(snapshots.sync_challenge, challenge_id, active)
+        self.send_snapshot(snapshot)
+        self.wake.set()
     
     async def send_leaderboard_updates(self):
         """
-        Background task that periodically fetches leaderboard and sends updates.
+        Background task that periodically checks the shared snapshot and sends it.
         Only sends when rankings change to optimize network usage.
         """
         try:
             while True:
-                challenge_id, leaderboard = await self.get_leaderboard_data()
-                
-                if challenge_id is None:
-                    # No active challenge, send empty state
-                    await self.send(text_data=json.dumps({
-                        'type': 'leaderboard_update',
-                        'challenge_id': None,
-                        'leaderboard': [],
-                        'message': 'No active challenge'
-                    }))
-                    await asyncio.sleep(5)  # Check every 5 seconds
+                # Cleared before reading, so an event that lands meanwhile still wakes us.
+                self.wake.clear()
+                try:
+                    snapshot = await self.get_snapshot()
+                except Exception as e:
+                    # Keep the socket; report and try again on the next tick.
+                    logger.exception('Leaderboard refresh failed')
+                    self.outbox.put_latest('error', json.dumps({'type': 'error', 'message': str(e)}))
+                    await asyncio.sleep(settings.GAMEPLAY_LEADERBOARD_REFRESH_SECONDS)
                     continue
-                
-                # Check if challenge has changed
-                if self.challenge_id != challenge_id:
-                    self.challenge_id = challenge_id
-                    self.previous_leaderboard = []
-                
-                # Only send update if rankings have changed
-                if self.has_leaderboard_changed(leaderboard):
-                    await self.send(text_data=json.dumps({
-                        'type': 'leaderboard_update',
-                        'challenge_id': challenge_id,
-                        'leaderboard': leaderboard,
-                        'timestamp': asyncio.get_event_loop().time()
-                    }))
-                    
-                    self.previous_leaderboard = leaderboard
-                
-                # Poll every 2 seconds for optimal real-time updates
-                await asyncio.sleep(2)
+                self.send_snapshot(snapshot)
+
+                if snapshot.challenge_id is None:
+                    # Nothing to poll for: wait for a challenge_event, or the fallback re-check.
+                    try:
+                        await asyncio.wait_for(self.wake.wait(), settings.GAMEPLAY_WS_FALLBACK_POLL_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await asyncio.sleep(settings.GAMEPLAY_LEADERBOARD_REFRESH_SECONDS)
                 
         except asyncio.CancelledError:
             # Task cancelled on disconnect
             pass
-        except Exception as e:
-            # Log error and close connection
-            await self.send(text_data=json.dumps({
-                'type': 'error',
-                'message': str(e)
-            }))
+
+
+class StandingsConsumer(OutboundMixin, AsyncWebsocketConsumer):
+    """
+    WebSocket feed of the combined cross-game standings.
+    Sends the current standings on connect, then whatever standings.broadcast
+    pushes to the group when a saved session changes them. With the in-memory
+    channel layer nothing is pushed, so the socket also re-checks every
+    GAMEPLAY_WS_FALLBACK_POLL_SECONDS.
+    """
+    stream = 'standings'
+
+    async def connect(self):
+        await self.channel_layer.group_add(standings.GROUP, self.channel_name)
+        await self.accept()
+        self.start_outbound()
+        self.queue_standings(await consumer_db.run(standings.message_text))
+        self.poll_task = asyncio.create_task(self.poll_standings())
+
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(standings.GROUP, self.channel_name)
+        task = getattr(self, 'poll_task', None)
+        if task:
+            task.cancel()
+        self.stop_outbound()
+
+    def queue_standings(self, text):
+        if text != getattr(self, 'sent_text', None):
+            self.outbox.put_latest('standings', text)
+            self.sent_text = text
+
+    async def standings_update(self, event):
+        self.queue_standings(event['text'])
+
+    async def poll_standings(self):
+        interval = settings.GAMEPLAY_WS_FALLBACK_POLL_SECONDS
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    self.queue_standings(await consumer_db.run(standings.polled_text, interval))
+                except Exception:
+                    logger.exception('Standings re-check failed')
+        except asyncio.CancelledError:
+            pass
+
+
+class TelemetryConsumer(OutboundMixin, AsyncWebsocketConsumer):
+    """
+    WebSocket feed of ingestion telemetry for the ops dashboard.
+    Only staff sessions may connect; a snapshot is pushed every second.
+    """
+
+    INTERVAL_SECONDS = 1
+    stream = 'telemetry'
+
+    async def connect(self):
+        user = self.scope.get('user')
+        if not user or not user.is_staff:
             await self.close()
+            return
+        await self.accept()
+        self.start_outbound()
+        self.push_task = asyncio.create_task(self.push_snapshots())
+
+    async def disconnect(self, close_code):
+        task = getattr(self, 'push_task', None)
+        if task:
+            task.cancel()
+        self.stop_outbound()
+
+    async def push_snapshots(self):
+        try:
+            while True:
+                self.outbox.put_latest('telemetry', json.dumps({
+                    'type': 'telemetry_update',
+                    'telemetry': collector.snapshot(),
+                }))
+                await asyncio.sleep(self.INTERVAL_SECONDS)
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,136 @@
+"""
+Bounded database access for WebSocket consumers.
+
+Consumers live for as long as their socket, so they never send the
+request_started/request_finished signals that make Django close or
+health-check old connections, and every thread that runs a
+``database_sync_to_async`` call keeps its own persistent connection
+(CONN_MAX_AGE) for as long as the thread lives.
+
+``consumer_db.run()`` sends consumer DB work to a dedicated pool of
+GAMEPLAY_CONSUMER_DB_WORKERS threads instead. Each thread holds at most one
+connection per alias, so however many sockets are open, consumers in a
+process never use more than that many connection slots; extra calls queue
+for a free thread. Around each call the thread does what the request
+signals do for HTTP: ``close_old_connections()`` drops connections that are
+past CONN_MAX_AGE or broken and arms the CONN_HEALTH_CHECKS ping for the
+next query, so a connection is reused until the pooler drops it and no
+longer.
+
+Connections open, new connections, time spent queueing and per-query
+latency are exported on /metrics (nbcc_backend/metrics.py).
+"""
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from nbcc_backend.metrics import (
+    CONSUMER_DB_CONNECTIONS,
+    CONSUMER_DB_CONNECTS,
+    CONSUMER_DB_QUERY_DURATION,
+    CONSUMER_DB_WAIT,
+)
+
+
+def _open_aliases():
+    return {alias for alias in connections if connections[alias].connection is not None}
+
+
+def _query_timer(label):
+    def timer(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            CONSUMER_DB_QUERY_DURATION.observe(label, time.perf_counter() - start)
+    return timer
+
+
+class ConsumerDatabase:
+    """A fixed-size thread pool that owns every DB connection consumers use."""
+
+    def __init__(self, workers=None):
+        self._workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._open = {}
+        self.peak_connections = 0
+
+    @property
+    def workers(self):
+        return self._workers or settings.GAMEPLAY_CONSUMER_DB_WORKERS
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='consumer-db')
+        return self._executor
+
+    async def run(self, func, *args, **kwargs):
+        """Run ``func(*args, **kwargs)`` on a pool thread and return its result."""
+        label = getattr(func, '__qualname__', type(func).__name__)
+        call = functools.partial(self._call, func, label, time.perf_counter(), args, kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), call)
+
+    def _call(self, func, label, submitted, args, kwargs):
+        CONSUMER_DB_WAIT.observe(label, time.perf_counter() - submitted)
+        close_old_connections()
+        before = _open_aliases()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(_query_timer(label)))
+                return func(*args, **kwargs)
+        finally:
+            for alias in _open_aliases() - before:
+                CONSUMER_DB_CONNECTS.inc(alias)
+            close_old_connections()
+            self._track(_open_aliases())
+
+    def _track(self, aliases):
+        """Record which connections this thread still holds and update the gauge."""
+        with self._lock:
+            self._open[threading.get_ident()] = aliases
+            counts = {alias: 0 for alias in connections}
+            for held in self._open.values():
+                for alias in held:
+                    counts[alias] += 1
+            self.peak_connections = max(self.peak_connections, sum(counts.values()))
+        for alias, count in counts.items():
+            CONSUMER_DB_CONNECTIONS.set(alias, count)
+
+    def open_connections(self):
+        with self._lock:
+            return sum(len(held) for held in self._open.values())
+
+    def shutdown(self):
+        """Stop the pool and close its connections (tests, benchmarks)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        # One task per thread: the barrier keeps a thread from taking a second one.
+        barrier = threading.Barrier(self.workers)
+
+        def close():
+            connections.close_all()
+            barrier.wait()
+
+        for _ in range(self.workers):
+            executor.submit(close)
+        executor.shutdown(wait=True)
+        with self._lock:
+            self._open.clear()
+            self.peak_connections = 0
+        for alias in connections:
+            CONSUMER_DB_CONNECTIONS.set(alias, 0)
+
+
+consumer_db = ConsumerDatabase()
@@ -4,6 +4,9 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from django.contrib.auth import get_user_model
 from .models import UserFeedback
+from .query_budget import query_budget
+from .response_cache import cached_response
+from .throttling import ClientIPThrottle, PlayerCodeThrottle
 
 User = get_user_model()
 
@@ -21,6 +24,8 @@ class SubmitFeedbackAPIView(APIView):
     }
     """
     permission_classes = [AllowAny]
+    throttle_classes = [PlayerCodeThrottle, ClientIPThrottle]
+    throttle_scope = 'feedback'
     
     def post(self, request):
         data = request.data
@@ -52,6 +57,7 @@ class SubmitFeedbackAPIView(APIView):
         }, status=status.HTTP_201_CREATED)
 
 
+@query_budget(1)
 class GetAllFeedbacksAPIView(APIView):
     """
     API endpoint to list all user feedbacks (admin use)
@@ -88,6 +94,7 @@ class GetAllFeedbacksAPIView(APIView):
         })
 
 
+@query_budget(2)
 class GetFeedbackStatsAPIView(APIView):
     """
     API endpoint to get feedback statistics (admin use)
@@ -96,6 +103,7 @@ class GetFeedbackStatsAPIView(APIView):
     """
     permission_classes = [AllowAny]  # Change to IsAdminUser for production
     
+    @cached_response('feedback_stats', depends_on=('UserFeedback',))
     def get(self, request):
         total_feedbacks = UserFeedback.objects.count()
         
@@ -1,10 +1,16 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import permissions, status
+from django.db.models import Count, OuterRef, Subquery
 from django.utils import timezone
 
 from apps.accounts.models import Player
 from .models import GameAnswer, GameSession, GameType
+from . import standings, telemetry
+from .leaderboard import build_game_leaderboard
+from .query_budget import query_budget
+from .response_cache import cached_response
+from .throttling import ClientIPThrottle, PlayerCodeThrottle
 
 
 class SubmitGameAnswerAPIView(APIView):
@@ -13,7 +19,11 @@ class SubmitGameAnswerAPIView(APIView):
 
     POST /api/gameplay/game-answer/
     """
+    throttle_classes = [PlayerCodeThrottle, ClientIPThrottle]
+    throttle_scope = 'submit_game_answer'
+    throttle_code_field = 'player_code'
 
+    @telemetry.track('submit_game_answer')
     def post(self, request):
         data = request.data
         player_code = data.get('player_code', '').strip().upper()
@@ -108,6 +118,7 @@ class SubmitBulkGameAnswersAPIView(APIView):
     }
     """
 
+    @telemetry.track('submit_bulk_game_answers')
     def post(self, request):
         data = request.data
         player_code = data.get('player_code', '').strip().upper()
@@ -152,6 +163,7 @@ class SubmitBulkGameAnswersAPIView(APIView):
                 answers_data=answers_data,
                 completed_at=timezone.now(),
             )
+            standings.record_session(session)
 
             return Response({
                 'message': 'Jigsaw result saved',
@@ -181,6 +193,7 @@ class SubmitBulkGameAnswersAPIView(APIView):
                 set_b_total=set_b_total,
                 completed_at=timezone.now(),
             )
+            standings.record_session(session)
 
             return Response({
                 'message': 'Drag & Drop results saved',
@@ -206,6 +219,7 @@ class SubmitBulkGameAnswersAPIView(APIView):
                 answers_data=answers_data or answers,
                 completed_at=timezone.now(),
             )
+            standings.record_session(session)
 
             return Response({
                 'message': 'Game results saved',
@@ -246,6 +260,7 @@ class SaveGameSessionAPIView(APIView):
             completed=completed,
             completed_at=timezone.now() if completed else None,
         )
+        standings.record_session(session)
 
         return Response({
             'message': 'Session saved',
@@ -253,6 +268,8 @@ class SaveGameSessionAPIView(APIView):
         }, status=status.HTTP_201_CREATED)
 
 
+# The player lookup, the grouped stats, and JWTAuthentication loading request.user.
+@query_budget(3)
 class GetPlayerGameStatsAPIView(APIView):
     """
     Get game statistics for a player.
@@ -260,6 +277,7 @@ class GetPlayerGameStatsAPIView(APIView):
     GET /api/gameplay/player-stats/?player_code=ABC123
     """
 
+    @cached_response('player_stats', scoped_on=('GameSession', 'Player'), scope_param='player_code')
     def get(self, request):
         player_code = request.query_params.get('player_code', '').strip().upper()
 
@@ -271,18 +289,34 @@ class GetPlayerGameStatsAPIView(APIView):
         except Player.DoesNotExist:
             return Response({'error': 'Invalid player code'}, status=status.HTTP_404_NOT_FOUND)
 
-        sessions = GameSession.objects.filter(player=player)
+        # One grouped query; the best session per game type comes from
+        # correlated subqueries instead of per-type follow-up queries.
+        best = GameSession.objects.filter(
+            player=player, game_type=OuterRef('game_type'),
+        ).order_by('-correct_answers', '-started_at')
+        rows = (
+            GameSession.objects.filter(player=player)
+            .order_by()
+            .values('game_type')
+            .annotate(
+                total_sessions=Count('id'),
+                best_score=Subquery(best.values('correct_answers')[:1]),
+                best_total=Subquery(best.values('total_questions')[:1]),
+                best_time=Subquery(best.values('total_time_seconds')[:1]),
+            )
+        )
+        by_type = {row['game_type']: row for row in rows}
+
         stats = {}
         for game_type, label in GameType.choices:
-            game_sessions = sessions.filter(game_type=game_type)
-            if game_sessions.exists():
-                best = game_sessions.order_by('-correct_answers').first()
+            row = by_type.get(game_type)
+            if row:
                 stats[game_type] = {
                     'label': label,
-                    'total_sessions': game_sessions.count(),
-                    'best_score': best.correct_answers,
-                    'best_total': best.total_questions,
-                    'best_time': best.total_time_seconds,
+                    'total_sessions': row['total_sessions'],
+                    'best_score': row['best_score'],
+                    'best_total': row['best_total'],
+                    'best_time': row['best_time'],
                 }
 
         return Response({
@@ -290,3 +324,34 @@ class GetPlayerGameStatsAPIView(APIView):
             'player_name': player.name,
             'stats': stats,
         })
+
+
+@query_budget(1)
+class GameLeaderboardAPIView(APIView):
+    """
+    Leaderboard for one game type, ranking each player's best session:
+    fastest correct jigsaw solves, top drag_drop set_a + set_b totals,
+    top beer_cup scores.
+
+    GET /api/gameplay/game-leaderboard/?game_type=jigsaw&limit=20
+    """
+    permission_classes = [permissions.AllowAny]
+
+    @cached_response('game_leaderboard', params=('limit',), scoped_on=('GameType',), scope_param='game_type')
+    def get(self, request):
+        game_type = request.query_params.get('game_type', '').strip().lower()
+        if game_type not in GameType.values:
+            return Response(
+                {'error': f'Invalid game_type. Must be one of: {GameType.values}'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = max(1, min(100, int(request.query_params.get('limit', 20))))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'game_type': game_type,
+            'label': GameType(game_type).label,
+            'leaderboard': build_game_leaderboard(game_type, limit),
+        })
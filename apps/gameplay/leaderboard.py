@@ -0,0 +1,259 @@
+"""
+Leaderboard queries shared by the WebSocket consumer and HTTP views.
+
+LeaderboardSnapshotStore keeps one encoded leaderboard per process, so the
+JSON is built once per change rather than once per viewer or request.
+Challenge starts and ends are published to the ``leaderboard`` channel-layer
+group (publish_challenge_event), so sockets that share the publisher's channel
+layer switch challenges at once. With the in-memory layer that is only the
+publishing process, so idle sockets still re-check every
+GAMEPLAY_WS_FALLBACK_POLL_SECONDS.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from django.db.models import Count, F, Q, Sum, Window
+from django.db.models.functions import RowNumber
+
+from .models import Challenge, GameSession, GameType
+from .query_budget import query_budget
+from .quiz_stats import QuizStat
+from .response_cache import cached
+
+
+GROUP = 'leaderboard'
+
+
+def get_active_challenge():
+    """The latest active challenge, or None."""
+    return Challenge.objects.filter(is_active=True).order_by('-started_at').first()
+
+
+def active_challenge_id():
+    """get_active_challenge()'s id, read without loading the row."""
+    return Challenge.objects.filter(is_active=True).order_by('-started_at').values_list('id', flat=True).first()
+
+
+def cached_active_challenge_id():
+    """
+    active_challenge_id(), cached until a Challenge is saved in this process
+    and for at most GAMEPLAY_RESPONSE_CACHE_TTLS['active_challenge'] seconds
+    after a change made in another worker.
+    """
+    return cached('active_challenge', ('Challenge',), active_challenge_id)
+
+
+@query_budget(2)
+def get_active_leaderboard():
+    """(challenge_id, leaderboard) for the active challenge, or (None, [])."""
+    challenge = get_active_challenge()
+    if not challenge:
+        return None, []
+    return challenge.id, build_leaderboard(challenge)
+
+
+def build_leaderboard(challenge):
+    """
+    Rank every player who answered in ``challenge`` with one aggregate query.
+    Rankings based on:
+    1. Number of correct answers (DESC)
+    2. Total time taken (ASC) - faster is better
+    """
+    rows = (
+        QuizStat.objects.filter(challenge=challenge)
+        .values('user_id', 'user__unique_code', 'user__name')
+        .annotate(
+            total_answered=Count('id'),
+            total_correct=Count('id', filter=Q(is_correct=True)),
+            total_time=Sum('time_taken'),
+        )
+        .order_by('-total_correct', 'total_time', 'user_id')
+    )
+    return [
+        {
+            'user_id': row['user_id'],
+            'unique_code': row['user__unique_code'],
+            'name': row['user__name'],
+            'total_answered': row['total_answered'],
+            'total_correct': row['total_correct'],
+            'total_time': round(row['total_time'] or 0.0, 2),
+            'rank': rank,
+        }
+        for rank, row in enumerate(rows, start=1)
+    ]
+
+
+# Sessions each game leaderboard ranks; matches the partial indexes on GameSession.
+GAME_LEADERBOARD_FILTERS = {
+    GameType.JIGSAW: Q(game_type=GameType.JIGSAW, completed=True, is_correct=True),
+    GameType.DRAG_DROP: Q(game_type=GameType.DRAG_DROP, completed=True),
+    GameType.BEER_CUP: Q(game_type=GameType.BEER_CUP, completed=True),
+}
+
+
+@query_budget(1)
+def build_game_leaderboard(game_type, limit):
+    """
+    Rank players within one game type by their best session (most correct
+    answers, then fastest) in a single query: ROW_NUMBER() over each
+    player's sessions picks the best one, then those rows are ordered.
+    """
+    best = (
+        GameSession.objects.filter(GAME_LEADERBOARD_FILTERS[game_type])
+        .annotate(position=Window(
+            RowNumber(),
+            partition_by=[F('player_id')],
+            order_by=[F('correct_answers').desc(), F('total_time_seconds').asc(), F('id').asc()],
+        ))
+        .filter(position=1)
+        .select_related('player')
+        .order_by('-correct_answers', 'total_time_seconds', 'id')[:limit]
+    )
+    rows = []
+    for rank, session in enumerate(best, start=1):
+        row = {
+            'rank': rank,
+            'player_id': session.player_id,
+            'name': session.player.name,
+            'session_id': session.id,
+            'correct_answers': session.correct_answers,
+            'total_questions': session.total_questions,
+            'total_time_seconds': round(session.total_time_seconds, 2),
+            'completed_at': session.completed_at,
+        }
+        if game_type == GameType.DRAG_DROP:
+            row['set_a_score'] = session.set_a_score
+            row['set_b_score'] = session.set_b_score
+        rows.append(row)
+    return rows
+
+
+@dataclass(frozen=True, eq=False)
+class LeaderboardSnapshot:
+    """
+    An immutable, pre-encoded view of the active challenge's leaderboard.
+
+    ``version`` increases whenever the rows change and ``rank_version`` only
+    when somebody's rank does. ``text``/``payload`` hold the JSON message
+    once for every socket and HTTP response in the process.
+    """
+    challenge_id: int | None
+    version: int
+    rank_version: int
+    ranks: MappingProxyType
+    text: str
+    payload: bytes
+    etag: str
+
+    @classmethod
+    def build(cls, challenge_id, leaderboard, version, rank_version):
+        message = {
+            'type': 'leaderboard_update',
+            'challenge_id': challenge_id,
+            'version': version,
+            'leaderboard': leaderboard,
+            # Same key as the message always had, so existing clients keep working.
+            'timestamp': time.time(),
+        }
+        if challenge_id is None:
+            message['message'] = 'No active challenge'
+        text = json.dumps(message, separators=(',', ':'))
+        # Hash the rows, not the timestamp, so the ETag only moves with the data.
+        rows = json.dumps([challenge_id, leaderboard], separators=(',', ':')).encode()
+        return cls(
+            challenge_id=challenge_id,
+            version=version,
+            rank_version=rank_version,
+            ranks=MappingProxyType({entry['user_id']: entry['rank'] for entry in leaderboard}),
+            text=text,
+            payload=text.encode(),
+            etag='"%s"' % hashlib.sha1(rows).hexdigest(),
+        )
+
+
+class LeaderboardSnapshotStore:
+    """
+    The current snapshot for this process. Readers share it; the database is
+    asked at most once per ``max_age`` seconds however many sockets and
+    requests read, and a new snapshot replaces the old one only when the
+    leaderboard actually changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._rows = None
+        self._checked_at = 0.0
+
+    def peek(self, max_age):
+        """The current snapshot if it was checked within ``max_age`` seconds; never touches the DB."""
+        if self._snapshot is not None and time.monotonic() - self._checked_at < max_age:
+            return self._snapshot
+        return None
+
+    def get(self, max_age):
+        """A snapshot checked within ``max_age`` seconds, querying if needed (sync; call off the event loop)."""
+        snapshot = self.peek(max_age)
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            snapshot = self.peek(max_age)
+            if snapshot is None:
+                snapshot = self._refresh(*get_active_leaderboard())
+            return snapshot
+
+    def _refresh(self, challenge_id, leaderboard):
+        current = self._snapshot
+        rows = (challenge_id, leaderboard)
+        if current is None or rows != self._rows:
+            ranks = {entry['user_id']: entry['rank'] for entry in leaderboard}
+            rank_version = current.rank_version if current else 0
+            if current is None or current.challenge_id != challenge_id or current.ranks != ranks:
+                rank_version += 1
+            version = current.version + 1 if current else 1
+            self._snapshot = LeaderboardSnapshot.build(challenge_id, leaderboard, version, rank_version)
+            self._rows = rows
+        self._checked_at = time.monotonic()
+        return self._snapshot
+
+    def sync_challenge(self, challenge_id, active):
+        """
+        The snapshot after ``challenge_id`` started (``active``) or ended,
+        re-querying only if the current one doesn't reflect that yet, so the
+        first socket to hear of the event refreshes and the rest reuse it.
+        """
+        with self._lock:
+            current = self._snapshot
+            if current is not None and (current.challenge_id == challenge_id) == active:
+                return current
+            return self._refresh(*get_active_leaderboard())
+
+    def clear(self):
+        with self._lock:
+            self._snapshot = None
+            self._rows = None
+            self._checked_at = 0.0
+
+
+snapshots = LeaderboardSnapshotStore()
+
+
+def publish_challenge_event(challenge_id, active):
+    """
+    Tell LeaderboardConsumers that a challenge started or ended. Only sockets
+    on this channel layer hear it: with InMemoryChannelLayer, those in the
+    publishing process.
+    """
+    from asgiref.sync import async_to_sync
+    from channels.layers import get_channel_layer
+
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    async_to_sync(layer.group_send)(GROUP, {'type': 'challenge.event', 'challenge_id': challenge_id, 'active': active})
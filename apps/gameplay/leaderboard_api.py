@@ -1,12 +1,19 @@
 # Ensure all imports are at the top
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from nbcc_backend.api_docs import openapi, swagger_auto_schema
 from rest_framework import status, permissions, serializers
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
 from .quiz_stats import QuizStat
+from .leaderboard import publish_challenge_event, snapshots
 from .models import QuizResult, Challenge
+from .archive import player_quiz_totals, schedule_archival
+from .query_budget import query_budget
+from .telemetry import collector as telemetry_collector
+from .response_cache import cached_response
 
 # Challenge serializers and view
 class ChallengeSerializer(serializers.Serializer):
@@ -15,6 +22,7 @@ class ChallengeSerializer(serializers.Serializer):
     is_active = serializers.BooleanField()
     started_at = serializers.DateTimeField()
     ended_at = serializers.DateTimeField(allow_null=True)
+    archived_at = serializers.DateTimeField(allow_null=True)
 
 class GetChallengesResponseSerializer(serializers.Serializer):
     challenges = ChallengeSerializer(many=True)
@@ -26,6 +34,7 @@ class GetChallengesAPIView(APIView):
         operation_description="Get all challenges.",
         responses={200: GetChallengesResponseSerializer}
     )
+    @cached_response('challenges', depends_on=('Challenge',))
     def get(self, request):
         challenges = Challenge.objects.all().order_by('-started_at')
         data = [
@@ -35,6 +44,7 @@ class GetChallengesAPIView(APIView):
                 'is_active': c.is_active,
                 'started_at': c.started_at,
                 'ended_at': c.ended_at,
+                'archived_at': c.archived_at,
             } for c in challenges
         ]
         return Response({'challenges': data}, status=status.HTTP_200_OK)
@@ -64,10 +74,20 @@ class StartChallengeAPIView(APIView):
         name = serializer.validated_data['name']
         
         # Mark all previous challenges as inactive
-        Challenge.objects.filter(is_active=True).update(is_active=False, ended_at=timezone.now())
+        previous = Challenge.objects.filter(is_active=True)
+        ended_ids = list(previous.values_list('id', flat=True))
+        previous.update(is_active=False, ended_at=timezone.now())
         
-        # Create new active challenge
+        # Create new active challenge (its post_save tells leaderboard sockets it started)
         new_challenge = Challenge.objects.create(name=name, is_active=True)
+        # update() sends no post_save, so announce the ended ones by hand, after the start
+        # so sockets switch straight over instead of showing "No active challenge" first.
+        for challenge_id in ended_ids:
+            publish_challenge_event(challenge_id, False)
+        telemetry_collector.reset(new_challenge.id)
+
+        # Move the ended challenges' answers out of the hot tables (archive mode only)
+        schedule_archival()
         
         return Response({
             'challenge_id': new_challenge.id,
@@ -124,14 +144,6 @@ class GameSessionAPIView(APIView):
             'total_failed': total_failed,
         }, status=status.HTTP_200_OK)
 
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
-from rest_framework import status, permissions, serializers
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from django.contrib.auth import get_user_model
-from .quiz_stats import QuizStat
-from .models import QuizResult
 
 # Serializer for adding leaderboard participant
 class AddLeaderboardParticipantSerializer(serializers.Serializer):
@@ -184,6 +196,7 @@ class LeaderboardStatsResponseUserSerializer(serializers.Serializer):
 class LeaderboardStatsResponseSerializer(serializers.Serializer):
     leaderboard = LeaderboardStatsResponseUserSerializer(many=True)
 
+@query_budget(2)
 class LeaderboardStatsAPIView(APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -195,19 +208,41 @@ class LeaderboardStatsAPIView(APIView):
         serializer = LeaderboardStatsSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user_ids = serializer.validated_data['user_ids']
+        # Totals span archived challenges too
+        totals = player_quiz_totals(user_ids)
         stats = []
         for user in get_user_model().objects.filter(id__in=user_ids):
-            user_stats = QuizStat.objects.filter(user=user)
-            total_answered = user_stats.count()
-            total_correct = user_stats.filter(is_correct=True).count()
-            total_failed = user_stats.filter(is_correct=False).count()
-            last_question = user_stats.order_by('-timestamp').first()
+            user_totals = totals.get(user.id, {})
             stats.append({
                 'user_id': user.id,
-                'username': user.username,
-                'current_question': last_question.question_id if last_question else None,
-                'total_answered': total_answered,
-                'total_correct': total_correct,
-                'total_failed': total_failed,
+                'username': user.get_username(),
+                'current_question': user_totals.get('current_question'),
+                'total_answered': user_totals.get('total_answered', 0),
+                'total_correct': user_totals.get('total_correct', 0),
+                'total_failed': user_totals.get('total_failed', 0),
             })
         return Response({'leaderboard': stats}, status=status.HTTP_200_OK)
+
+
+@query_budget(2)
+class LeaderboardAPIView(APIView):
+    """
+    The active challenge's leaderboard, in the same message the
+    ws/leaderboard/ socket sends. Served from the shared snapshot, so polls
+    within GAMEPLAY_LEADERBOARD_REFRESH_SECONDS cost no queries; send the
+    ETag back as If-None-Match to get a 304 while nothing changed.
+
+    GET /api/gameplay/leaderboard/
+    """
+    permission_classes = [permissions.AllowAny]
+
+    @swagger_auto_schema(operation_description="Active challenge leaderboard (same payload as ws/leaderboard/).")
+    def get(self, request):
+        snapshot = snapshots.get(settings.GAMEPLAY_LEADERBOARD_REFRESH_SECONDS)
+        if snapshot.etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(snapshot.payload, content_type='application/json')
+        response['ETag'] = snapshot.etag
+        response['Cache-Control'] = 'no-cache'
+        return response
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.gameplay.archive import archive_challenge, archive_ended_challenges
+from apps.gameplay.models import Challenge
+
+
+class Command(BaseCommand):
+    help = 'Moves answers of ended challenges from the hot tables into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--challenge', type=int, help='Archive only this challenge id')
+        parser.add_argument('--batch-size', type=int, default=None, help='Rows moved per transaction')
+
+    def handle(self, *args, **options):
+        if options['challenge']:
+            try:
+                challenge = Challenge.objects.get(id=options['challenge'])
+            except Challenge.DoesNotExist:
+                raise CommandError(f"Challenge {options['challenge']} does not exist")
+            if challenge.is_active:
+                raise CommandError('Cannot archive the active challenge')
+            results = {challenge.id: archive_challenge(challenge, batch_size=options['batch_size'])}
+        else:
+            results = archive_ended_challenges(batch_size=options['batch_size'])
+
+        if not results:
+            self.stdout.write(self.style.WARNING('No ended challenges waiting to be archived.'))
+            return
+
+        for challenge_id, moved in results.items():
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Challenge {challenge_id}: {moved['quiz_stats']} quiz stats, "
+                    f"{moved['game_answers']} game answers archived"
+                )
+            )
@@ -0,0 +1,21 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from nbcc_backend.api_docs import generate_schema, reset_schema
+
+
+class Command(BaseCommand):
+    help = 'Generates the OpenAPI schema once and writes it to API_SCHEMA_FILE (run after collectstatic)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Write the schema here instead of API_SCHEMA_FILE')
+
+    def handle(self, *args, **options):
+        path = Path(options['output']) if options['output'] else settings.API_SCHEMA_FILE
+        content = generate_schema()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        reset_schema()
+        self.stdout.write(self.style.SUCCESS(f'Wrote {len(content)} bytes of OpenAPI schema to {path}'))
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.gameplay.standings import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the combined cross-game standings from completed game sessions'
+
+    def handle(self, *args, **options):
+        players = rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Rebuilt standings for {players} players '
+                f'(mode={settings.GAMEPLAY_STANDINGS_MODE}, weights={settings.GAMEPLAY_STANDINGS_WEIGHTS})'
+            )
+        )
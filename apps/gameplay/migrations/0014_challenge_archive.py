@@ -0,0 +1,55 @@
+# Generated by Django 5.0.3 on 2026-10-19 06:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gameplay', '0013_gamesession_answers_data_gamesession_is_correct_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='challenge',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, help_text="When this challenge's answers were moved to the archive tables", null=True),
+        ),
+        migrations.CreateModel(
+            name='ArchivedGameAnswer',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('game_type', models.CharField(choices=[('drag_drop', 'Drag & Drop Game'), ('beer_cup', 'Beer Cup Game'), ('jigsaw', 'Jigsaw Puzzle Game')], max_length=20)),
+                ('question_id', models.IntegerField()),
+                ('question_text', models.TextField(blank=True)),
+                ('selected_answer', models.TextField()),
+                ('correct_answer', models.TextField(blank=True)),
+                ('is_correct', models.BooleanField()),
+                ('time_taken_seconds', models.FloatField(default=0.0)),
+                ('created_at', models.DateTimeField()),
+                ('challenge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gameplay.challenge')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['challenge', 'game_type'], name='gameplay_ar_challen_29d661_idx'), models.Index(fields=['player', 'game_type'], name='gameplay_ar_player__778223_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedQuizStat',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('question_id', models.IntegerField()),
+                ('is_correct', models.BooleanField()),
+                ('time_taken', models.FloatField(default=0.0)),
+                ('timestamp', models.DateTimeField()),
+                ('challenge', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gameplay.challenge')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['challenge', 'user'], name='gameplay_ar_challen_698b28_idx'), models.Index(fields=['user', 'timestamp'], name='gameplay_ar_user_id_1fc3af_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.3 on 2026-10-19 06:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gameplay', '0014_challenge_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quizresult',
+            index=models.Index(fields=['score', 'created_at'], name='gameplay_qu_score_5a74c8_idx'),
+        ),
+    ]
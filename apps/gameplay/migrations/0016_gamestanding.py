@@ -0,0 +1,30 @@
+# Generated by Django 5.0.3 on 2026-10-19 06:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gameplay', '0015_quizresult_score_created_at_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameStanding',
+            fields=[
+                ('player', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='game_standing', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('game_scores', models.JSONField(default=dict, help_text="Per game type: the counted session's id, percentage and time")),
+                ('combined_score', models.FloatField(default=0.0, help_text='Weighted sum of the per-game percentages')),
+                ('total_time_seconds', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-combined_score', 'total_time_seconds'],
+                'indexes': [models.Index(fields=['-combined_score', 'total_time_seconds'], name='gameplay_ga_combine_f94085_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.3 on 2026-10-19 06:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gameplay', '0016_gamestanding'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gamesession',
+            index=models.Index(condition=models.Q(('completed', True), ('game_type', 'jigsaw'), ('is_correct', True)), fields=['player', '-correct_answers', 'total_time_seconds'], name='gamesession_jigsaw_best_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gamesession',
+            index=models.Index(condition=models.Q(('completed', True), ('game_type', 'drag_drop')), fields=['player', '-correct_answers', 'total_time_seconds'], name='gamesession_drag_drop_best_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gamesession',
+            index=models.Index(condition=models.Q(('completed', True), ('game_type', 'beer_cup')), fields=['player', '-correct_answers', 'total_time_seconds'], name='gamesession_beer_cup_best_idx'),
+        ),
+    ]
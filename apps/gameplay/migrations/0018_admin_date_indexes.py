@@ -0,0 +1,27 @@
+# Generated by Django 5.0.3 on 2026-10-19 06:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gameplay', '0017_gamesession_best_score_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gameanswer',
+            index=models.Index(fields=['created_at'], name='gameplay_ga_created_26cf83_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gamesession',
+            index=models.Index(fields=['started_at'], name='gameplay_ga_started_0274c1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizresult',
+            index=models.Index(fields=['created_at'], name='gameplay_qu_created_1ed853_idx'),
+        ),
+    ]
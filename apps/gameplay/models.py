@@ -14,6 +14,7 @@ class Challenge(models.Model):
     is_active = models.BooleanField(default=True)
     started_at = models.DateTimeField(auto_now_add=True)
     ended_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(null=True, blank=True, help_text="When this challenge's answers were moved to the archive tables")
 
     class Meta:
         ordering = ['-started_at']
@@ -42,6 +43,10 @@ class QuizResult(models.Model):
 
     class Meta:
         ordering = ['-score', '-created_at']
+        indexes = [
+            models.Index(fields=['score', 'created_at']),
+            models.Index(fields=['created_at']),
+        ]
 
     def __str__(self) -> str:
         return f"{self.player_name} - {self.score}/{self.total_questions}"
@@ -77,6 +82,7 @@ class GameAnswer(models.Model):
         indexes = [
             models.Index(fields=['player', 'game_type']),
             models.Index(fields=['game_type', 'created_at']),
+            models.Index(fields=['created_at']),
         ]
 
     def __str__(self):
@@ -110,6 +116,27 @@ class GameSession(models.Model):
 
     class Meta:
         ordering = ['-started_at']
+        indexes = [
+            # Admin date hierarchy and changelist ordering.
+            models.Index(fields=['started_at']),
+            # One per game leaderboard (leaderboard.build_game_leaderboard): rows it can
+            # rank, in the order its ROW_NUMBER() picks each player's best session.
+            models.Index(
+                fields=['player', '-correct_answers', 'total_time_seconds'],
+                condition=models.Q(game_type='jigsaw', completed=True, is_correct=True),
+                name='gamesession_jigsaw_best_idx',
+            ),
+            models.Index(
+                fields=['player', '-correct_answers', 'total_time_seconds'],
+                condition=models.Q(game_type='drag_drop', completed=True),
+                name='gamesession_drag_drop_best_idx',
+            ),
+            models.Index(
+                fields=['player', '-correct_answers', 'total_time_seconds'],
+                condition=models.Q(game_type='beer_cup', completed=True),
+                name='gamesession_beer_cup_best_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.player} - {self.game_type} ({self.correct_answers}/{self.total_questions})"
@@ -121,6 +148,29 @@ class GameSession(models.Model):
         return round((self.correct_answers / self.total_questions) * 100, 2)
 
 
+class GameStanding(models.Model):
+    """A player's combined cross-game standing, maintained by standings.record_session"""
+    player = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='game_standing',
+    )
+    game_scores = models.JSONField(default=dict, help_text="Per game type: the counted session's id, percentage and time")
+    combined_score = models.FloatField(default=0.0, help_text="Weighted sum of the per-game percentages")
+    total_time_seconds = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-combined_score', 'total_time_seconds']
+        indexes = [
+            models.Index(fields=['-combined_score', 'total_time_seconds']),
+        ]
+
+    def __str__(self):
+        return f"{self.player} - {self.combined_score}"
+
+
 class UserFeedback(models.Model):
     """Model to store user feedback from the event"""
     player = models.ForeignKey(
@@ -146,3 +196,41 @@ class UserFeedback(models.Model):
     
     def __str__(self):
         return f"Feedback from {self.unique_code} at {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+
+
+class ArchivedQuizStat(models.Model):
+    """QuizStat rows of an ended challenge, moved out of the hot table by archive.archive_challenge"""
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    challenge = models.ForeignKey(Challenge, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    question_id = models.IntegerField()
+    is_correct = models.BooleanField()
+    time_taken = models.FloatField(default=0.0)
+    timestamp = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['challenge', 'user']),
+            models.Index(fields=['user', 'timestamp']),
+        ]
+
+
+class ArchivedGameAnswer(models.Model):
+    """GameAnswer rows created during an ended challenge, moved out of the hot table"""
+    id = models.BigIntegerField(primary_key=True)
+    challenge = models.ForeignKey(Challenge, on_delete=models.CASCADE, related_name='+')
+    player = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    game_type = models.CharField(max_length=20, choices=GameType.choices)
+    question_id = models.IntegerField()
+    question_text = models.TextField(blank=True)
+    selected_answer = models.TextField()
+    correct_answer = models.TextField(blank=True)
+    is_correct = models.BooleanField()
+    time_taken_seconds = models.FloatField(default=0.0)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['challenge', 'game_type']),
+            models.Index(fields=['player', 'game_type']),
+        ]
@@ -0,0 +1,160 @@
+"""
+Per-socket outbound delivery for the WebSocket consumers.
+
+Consumers never await ``send`` from their own logic. Frames go into an
+Outbox, which one writer task per socket drains:
+
+* Snapshot-style frames (leaderboard, standings, telemetry) take a
+  latest-wins slot per key. If the client hasn't been sent version N by
+  the time N+1 is ready, N is dropped and the client gets N+1.
+* Event frames (challenge started/ended) keep their order in a queue
+  capped at GAMEPLAY_WS_MAX_QUEUED_EVENTS; past the cap the oldest goes.
+
+ASGI servers accept ``send`` without waiting for the client, so a slow
+client is spotted with an application-level heartbeat. Every
+GAMEPLAY_WS_PING_SECONDS the socket gets ``{"type": "ping", "seq": n}``,
+where ``n`` counts the frames sent before it. A client that answers
+``{"type": "pong", "seq": n}`` has read those frames. Once a client has
+answered a ping, at most GAMEPLAY_WS_MAX_IN_FLIGHT frames are sent ahead of
+its last pong; later snapshots wait in their slot, coalescing, until the
+next pong. Such a client is closed if it then goes
+GAMEPLAY_WS_PONG_TIMEOUT_SECONDS without answering. Clients that never answer pings are neither
+held back nor reaped here; Daphne's protocol-level pings still close their
+dead connections.
+
+Drops, frames sent and reaped sockets are counted per stream on /metrics.
+"""
+import asyncio
+import json
+import time
+from collections import deque
+
+from django.conf import settings
+
+from nbcc_backend import metrics
+
+# Application close code for sockets that stopped answering pings.
+REAPED_CLOSE_CODE = 4408
+
+
+class Outbox:
+    """Frames waiting for one socket: an ordered, bounded event queue and latest-wins slots."""
+
+    def __init__(self, stream, max_events):
+        self.stream = stream
+        self.max_events = max_events
+        self._events = deque()
+        self._latest = {}
+        self._ready = asyncio.Event()
+
+    def put_event(self, text):
+        if len(self._events) >= self.max_events:
+            self._events.popleft()
+            metrics.WS_FRAMES_DROPPED.inc(self.stream)
+        self._events.append(text)
+        self._ready.set()
+
+    def put_latest(self, key, text):
+        if key in self._latest:
+            metrics.WS_FRAMES_DROPPED.inc(self.stream)
+        self._latest[key] = text
+        self._ready.set()
+
+    def __len__(self):
+        return len(self._events) + len(self._latest)
+
+    async def get(self):
+        """The next frame to send: queued events first, then the oldest pending slot."""
+        while not len(self):
+            self._ready.clear()
+            await self._ready.wait()
+        if self._events:
+            return self._events.popleft()
+        return self._latest.pop(next(iter(self._latest)))
+
+
+class OutboundMixin:
+    """
+    Mixin for AsyncWebsocketConsumer. Call ``start_outbound()`` after
+    ``accept()`` and ``stop_outbound()`` on disconnect, then queue frames
+    on ``self.outbox``. Subclasses overriding ``receive`` should pass
+    frames to ``await handle_pong(message)`` first.
+    """
+    stream = 'ws'
+
+    def start_outbound(self):
+        self.outbox = Outbox(self.stream, settings.GAMEPLAY_WS_MAX_QUEUED_EVENTS)
+        self.sent_frames = 0
+        self.acked_frames = 0
+        self.ping_sent_at = None
+        self.speaks_heartbeat = False
+        self.credit = asyncio.Event()
+        self.credit.set()
+        self.outbound_tasks = [
+            asyncio.create_task(self.write_frames()),
+            asyncio.create_task(self.heartbeat()),
+        ]
+
+    def stop_outbound(self):
+        for task in getattr(self, 'outbound_tasks', ()):
+            task.cancel()
+
+    def in_flight(self):
+        return self.sent_frames - self.acked_frames
+
+    async def write_frames(self):
+        try:
+            while True:
+                await self.credit.wait()
+                text = await self.outbox.get()
+                await self.send(text_data=text)
+                self.sent_frames += 1
+                metrics.WS_FRAMES_SENT.inc(self.stream)
+                if self.speaks_heartbeat and self.in_flight() >= settings.GAMEPLAY_WS_MAX_IN_FLIGHT:
+                    # Hold further frames until the client shows it has read these.
+                    self.credit.clear()
+                    if self.ping_sent_at is None:
+                        await self.ping()
+        except asyncio.CancelledError:
+            pass
+
+    async def ping(self):
+        self.ping_sent_at = time.monotonic()
+        await self.send(text_data=json.dumps({'type': 'ping', 'seq': self.sent_frames}))
+
+    async def heartbeat(self):
+        try:
+            while True:
+                await asyncio.sleep(settings.GAMEPLAY_WS_PING_SECONDS)
+                if self.speaks_heartbeat and self.ping_sent_at is not None:
+                    if time.monotonic() - self.ping_sent_at > settings.GAMEPLAY_WS_PONG_TIMEOUT_SECONDS:
+                        metrics.WS_SOCKETS_REAPED.inc(self.stream)
+                        await self.close(code=REAPED_CLOSE_CODE)
+                        return
+                    continue
+                await self.ping()
+        except asyncio.CancelledError:
+            pass
+
+    async def handle_pong(self, message):
+        """Record a pong; returns whether ``message`` was one."""
+        if not isinstance(message, dict) or message.get('type') != 'pong':
+            return False
+        seq = message.get('seq')
+        if isinstance(seq, int):
+            self.acked_frames = max(self.acked_frames, min(seq, self.sent_frames))
+        self.speaks_heartbeat = True
+        self.ping_sent_at = None
+        if self.in_flight() < settings.GAMEPLAY_WS_MAX_IN_FLIGHT:
+            self.credit.set()
+        else:
+            # An older ping's answer: still behind, so ask again rather than wait for the heartbeat.
+            await self.ping()
+        return True
+
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            message = json.loads(text_data or '')
+        except ValueError:
+            return
+        await self.handle_pong(message)
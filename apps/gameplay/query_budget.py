@@ -0,0 +1,23 @@
+"""
+Per-view query budgets.
+
+A budget is the maximum number of DB queries a view (or data helper) may
+issue for one call, regardless of how many rows it returns. Budgets are
+declared next to the code with ``@query_budget(n)``, asserted at 1 and 500
+rows by tests/test_query_budgets.py, and checked on sampled live requests by
+the profiling middleware, which logs any overrun.
+"""
+
+
+def query_budget(max_queries):
+    """Declare the query budget of an APIView class or a plain function."""
+    def decorator(target):
+        target.query_budget = max_queries
+        return target
+    return decorator
+
+
+def budget_for(view):
+    """The declared budget of a resolved view function, if any."""
+    view_class = getattr(view, 'view_class', None) or getattr(view, 'cls', None)
+    return getattr(view_class or view, 'query_budget', None)
@@ -0,0 +1,73 @@
+"""
+Signed question packs.
+
+QuizQuestionsAPIView returns a token with every pack it serves. The token is
+signed with SECRET_KEY (django.core.signing) and carries the active
+challenge id, the served question ids, a digest of each expected answer and
+the time the pack was issued. SubmitAnswerAPIView checks an answer against
+the token alone, so a submission costs the QuizStat insert and no reads of
+Question or Challenge.
+
+Answer digests are keyed HMACs, not plain hashes: the options are in the
+same response, so a plain hash would give the answer away to anyone who
+hashed them. Tokens older than GAMEPLAY_QUESTION_TOKEN_MAX_AGE are refused,
+and so is an answer whose ``time_taken`` is longer than the pack has been
+out, which stops clients from reporting times the server knows are wrong.
+"""
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+SALT = 'gameplay.question_tokens'
+DIGEST_SALT = 'gameplay.question_tokens.answer'
+DIGEST_LENGTH = 16
+# Allowance for the time between the client's timer starting and the pack being issued.
+CLOCK_GRACE_SECONDS = 2.0
+
+
+class InvalidToken(Exception):
+    """The token is malformed, tampered with or expired."""
+
+
+def answer_digest(question_id, answer):
+    """Keyed digest of an answer, normalised the way check_answer compares them."""
+    normalised = str(answer).strip().lower()
+    return salted_hmac(DIGEST_SALT, f'{question_id}:{normalised}').hexdigest()[:DIGEST_LENGTH]
+
+
+def issue(challenge_id, digests, now=None):
+    """A token for a pack; ``digests`` maps each served question id to its answer_digest."""
+    payload = {
+        'c': challenge_id,
+        'q': {str(question_id): digest for question_id, digest in digests.items()},
+        't': time.time() if now is None else now,
+    }
+    return signing.dumps(payload, salt=SALT, compress=True)
+
+
+def read(token):
+    """The pack a token describes, as {'challenge_id', 'digests', 'issued_at'}; raises InvalidToken."""
+    try:
+        payload = signing.loads(token, salt=SALT, max_age=settings.GAMEPLAY_QUESTION_TOKEN_MAX_AGE)
+    except signing.SignatureExpired as exc:
+        raise InvalidToken('Question token has expired') from exc
+    except signing.BadSignature as exc:
+        raise InvalidToken('Invalid question token') from exc
+    return {'challenge_id': payload['c'], 'digests': payload['q'], 'issued_at': payload['t']}
+
+
+def check(pack, question_id, answer, time_taken, now=None):
+    """
+    Whether ``answer`` is correct for ``question_id`` in ``pack``. Raises
+    InvalidToken if the question wasn't served in the pack, or if
+    ``time_taken`` is longer than the pack has been out.
+    """
+    expected = pack['digests'].get(str(question_id))
+    if expected is None:
+        raise InvalidToken('Question was not served with this token')
+    elapsed = (time.time() if now is None else now) - pack['issued_at']
+    if time_taken > elapsed + CLOCK_GRACE_SECONDS:
+        raise InvalidToken('time_taken is longer than the questions have been out')
+    return constant_time_compare(answer_digest(question_id, answer), expected)
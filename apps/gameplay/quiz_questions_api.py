@@ -1,10 +1,36 @@
 
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from nbcc_backend.api_docs import openapi, swagger_auto_schema
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions, serializers
+from .leaderboard import active_challenge_id
 from .models import Question
+from . import question_tokens
+from .response_cache import cached
+
+
+def question_pool():
+    """Every question as (id, text, options); reloaded only when a Question changes."""
+    def load():
+        pool = []
+        for q in Question.objects.all():
+            options = getattr(q, 'options', None)
+            if not options:
+                options = [f"Option {i}" for i in range(1, 5)]
+            pool.append((q.id, q.text, options))
+        return pool
+    return cached('quiz_questions', ('Question',), load)
+
+
+def answer_digests():
+    """question_tokens.answer_digest of every question's correct answer, keyed by id."""
+    def load():
+        return {
+            question_id: question_tokens.answer_digest(question_id, correct_answer)
+            for question_id, correct_answer in Question.objects.values_list('id', 'correct_answer')
+        }
+    return cached('quiz_answers', ('Question',), load)
+
 
 class QuizQuestionSerializer(serializers.Serializer):
     id = serializers.IntegerField()
@@ -14,29 +40,31 @@ class QuizQuestionSerializer(serializers.Serializer):
 
 class QuizQuestionsResponseSerializer(serializers.Serializer):
     questions = QuizQuestionSerializer(many=True)
+    token = serializers.CharField(help_text="Signed token for this pack; send it back with each answer")
 
 
 class QuizQuestionsAPIView(APIView):
     permission_classes = [permissions.AllowAny]
 
     @swagger_auto_schema(
-        operation_description="Get a random list of quiz questions with their number and options.",
+        operation_description="Get a random list of quiz questions with their number and options, "
+                              "and a signed token to send back with each answer.",
         responses={200: QuizQuestionsResponseSerializer}
     )
     def get(self, request):
         import random
-        questions = list(Question.objects.all())
+        questions = question_pool()
         num_questions = min(10, len(questions))  # Return up to 10 questions
         random_questions = random.sample(questions, num_questions) if questions else []
-        data = []
-        for idx, q in enumerate(random_questions, start=1):
-            options = getattr(q, 'options', None)
-            if not options:
-                options = [f"Option {i}" for i in range(1, 5)]
-            data.append({
-                'id': q.id,
-                'number': idx,
-                'text': q.text,
-                'options': options,
-            })
-        return Response({'questions': data}, status=status.HTTP_200_OK)
+        data = [
+            {'id': question_id, 'number': idx, 'text': text, 'options': options}
+            for idx, (question_id, text, options) in enumerate(random_questions, start=1)
+        ]
+        digests = answer_digests()
+        # Read uncached: answers are recorded against the challenge in the token, and a
+        # per-worker cache could still name the ended challenge after a switch.
+        token = question_tokens.issue(
+            active_challenge_id(),
+            {question_id: digests[question_id] for question_id, _, _ in random_questions if question_id in digests},
+        )
+        return Response({'questions': data, 'token': token}, status=status.HTTP_200_OK)
@@ -48,20 +48,19 @@ def submit_answer(request):
 def leaderboard_stats(request):
     data = json.loads(request.body)
     user_ids = data.get('user_ids', [])
+    # Imported lazily: archive imports QuizStat from this module
+    from .archive import player_quiz_totals
+    totals = player_quiz_totals(user_ids)
     stats = []
     for user in get_user_model().objects.filter(id__in=user_ids):
-        user_stats = QuizStat.objects.filter(user=user)
-        total_answered = user_stats.count()
-        total_correct = user_stats.filter(is_correct=True).count()
-        total_failed = user_stats.filter(is_correct=False).count()
-        last_question = user_stats.order_by('-timestamp').first()
+        user_totals = totals.get(user.id, {})
         stats.append({
             'user_id': user.id,
-            'username': user.username,
-            'current_question': last_question.question_id if last_question else None,
-            'total_answered': total_answered,
-            'total_correct': total_correct,
-            'total_failed': total_failed,
+            'username': user.get_username(),
+            'current_question': user_totals.get('current_question'),
+            'total_answered': user_totals.get('total_answered', 0),
+            'total_correct': user_totals.get('total_correct', 0),
+            'total_failed': user_totals.get('total_failed', 0),
         })
     return JsonResponse({'leaderboard': stats})
 
@@ -0,0 +1,115 @@
+"""
+Response cache for read-mostly gameplay endpoints.
+
+Cached responses are keyed on the view, its query parameters and the
+current *version* of every model the view depends on. Versions are plain
+counters in the Django cache, bumped by the post_save/post_delete handlers
+in signals.py once the write commits, so a write makes the next read miss instead of anyone having
+to find and delete stale entries. Versions can also be scoped, e.g. per
+player code, so one player's new session doesn't invalidate everyone's
+stats.
+
+Each entry stores the rendered JSON and its ETag. A poll whose
+If-None-Match matches gets a 304 from cache lookups alone, with no DB
+work. TTLs (GAMEPLAY_RESPONSE_CACHE_TTLS) bound staleness for writes that
+skip signals (``update()``, ``bulk_create``) and, with the per-process
+LocMemCache, writes made by other workers; configure REDIS_URL to share
+versions between workers.
+"""
+import functools
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.renderers import JSONRenderer
+
+PREFIX = 'gameplay:rc'
+CACHE_CONTROL = 'no-cache'
+
+
+def enabled():
+    return getattr(settings, 'GAMEPLAY_RESPONSE_CACHE_ENABLED', True)
+
+
+def ttl(name):
+    return getattr(settings, 'GAMEPLAY_RESPONSE_CACHE_TTLS', {}).get(name, 30)
+
+
+def _version_key(model_name, scope=None):
+    key = f'{PREFIX}:v:{model_name}'
+    return f'{key}:{scope}' if scope is not None else key
+
+
+def bump(model_name, scope=None):
+    """Invalidate everything cached against ``model_name`` (and ``scope``)."""
+    key = _version_key(model_name, scope)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Never bumped yet: readers treat a missing version as 0.
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def versions(model_names, scope=None):
+    """Current versions as a tuple, in a single cache round trip."""
+    keys = [_version_key(name, scope) for name in model_names]
+    found = cache.get_many(keys)
+    return tuple(found.get(key, 0) for key in keys)
+
+
+def cached(name, depends_on, builder, scope=None):
+    """Return ``builder()``'s value, cached until a dependency changes or the TTL expires."""
+    if not enabled():
+        return builder()
+    key = f'{PREFIX}:{name}:{scope}:{versions(depends_on, scope)}'
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, ttl(name))
+    return value
+
+
+def cached_response(name, depends_on=(), params=(), scoped_on=(), scope_param=None):
+    """
+    Cache the 200 responses of an APIView ``get`` method.
+
+    ``depends_on`` lists model names whose global version is part of the
+    key; ``scoped_on`` lists model names versioned per value of the
+    ``scope_param`` query parameter (upper-cased, as player codes are).
+    Authentication and permissions still run: the decorator wraps the
+    handler, which DRF calls after its checks.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if not enabled():
+                return method(view, request, *args, **kwargs)
+
+            values = tuple(request.query_params.get(param, '') for param in params)
+            scope = request.query_params.get(scope_param, '').strip().upper() if scope_param else None
+            version = versions(depends_on) + (versions(scoped_on, scope) if scoped_on else ())
+            digest = hashlib.sha1(repr((values, version)).encode()).hexdigest()
+            key = f'{PREFIX}:{name}:{scope}:{digest}'
+
+            entry = cache.get(key)
+            if entry is None:
+                response = method(view, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                body = JSONRenderer().render(response.data)
+                entry = ('"%s"' % hashlib.sha1(body).hexdigest(), body)
+                cache.set(key, entry, ttl(name))
+
+            etag, body = entry
+            if etag in parse_etags(request.headers.get('If-None-Match', '')):
+                response = HttpResponseNotModified()
+            else:
+                response = HttpResponse(body, content_type='application/json')
+            response['ETag'] = etag
+            response['Cache-Control'] = CACHE_CONTROL
+            return response
+        return wrapper
+    return decorator
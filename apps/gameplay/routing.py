@@ -1,6 +1,8 @@
 from django.urls import re_path
-from .consumers import LeaderboardConsumer
+from .consumers import LeaderboardConsumer, StandingsConsumer, TelemetryConsumer
 
 websocket_urlpatterns = [
     re_path(r'ws/leaderboard/$', LeaderboardConsumer.as_asgi()),
+    re_path(r'ws/standings/$', StandingsConsumer.as_asgi()),
+    re_path(r'ws/telemetry/$', TelemetryConsumer.as_asgi()),
 ]
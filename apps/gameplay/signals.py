@@ -0,0 +1,79 @@
+"""
+Bumps response-cache versions (see response_cache.py) when the models
+behind cached endpoints change, keeps the cached top quiz results
+(top_results.py) in step with new QuizResult rows, and publishes challenge
+starts and ends to leaderboard sockets (leaderboard.publish_challenge_event).
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from . import leaderboard, response_cache, top_results
+from .models import Challenge, GameSession, GameStanding, Question, QuizResult, UserFeedback
+
+
+def _player_code(session):
+    if GameSession.player.is_cached(session):
+        return session.player.unique_code if session.player else None
+    return get_user_model().objects.filter(pk=session.player_id).values_list('unique_code', flat=True).first()
+
+
+# Versions are bumped once the write commits: bumped earlier, a concurrent
+# reader could cache pre-commit rows under the new version until the TTL.
+
+def _bump_model(sender, **kwargs):
+    transaction.on_commit(lambda: response_cache.bump(sender.__name__))
+
+
+def _bump_game_session(sender, instance, **kwargs):
+    player_code = _player_code(instance)
+    # Per-game leaderboards; scopes are upper-cased like the scope_param they're read with.
+    game_type = instance.game_type.upper()
+
+    def bump():
+        response_cache.bump('GameSession', player_code)
+        response_cache.bump('GameType', game_type)
+    transaction.on_commit(bump)
+
+
+def _bump_player(sender, instance, **kwargs):
+    unique_code = instance.unique_code
+    transaction.on_commit(lambda: response_cache.bump('Player', unique_code))
+
+
+def _quiz_result_saved(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: top_results.record(instance))
+    else:
+        transaction.on_commit(top_results.invalidate)
+
+
+def _quiz_result_deleted(sender, instance, **kwargs):
+    transaction.on_commit(top_results.invalidate)
+
+
+def _challenge_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'is_active' not in update_fields:
+        return
+    transaction.on_commit(lambda: leaderboard.publish_challenge_event(instance.id, instance.is_active))
+
+
+def _challenge_deleted(sender, instance, **kwargs):
+    challenge_id = instance.id
+    transaction.on_commit(lambda: leaderboard.publish_challenge_event(challenge_id, False))
+
+
+def connect():
+    for model in (Challenge, Question, UserFeedback):
+        post_save.connect(_bump_model, sender=model, dispatch_uid=f'response_cache_{model.__name__}_save')
+        post_delete.connect(_bump_model, sender=model, dispatch_uid=f'response_cache_{model.__name__}_delete')
+    # Standings are only deleted wholesale by standings.rebuild(), which bumps by hand.
+    post_save.connect(_bump_model, sender=GameStanding, dispatch_uid='response_cache_GameStanding_save')
+    post_save.connect(_bump_game_session, sender=GameSession, dispatch_uid='response_cache_game_session_save')
+    post_delete.connect(_bump_game_session, sender=GameSession, dispatch_uid='response_cache_game_session_delete')
+    post_save.connect(_bump_player, sender=get_user_model(), dispatch_uid='response_cache_player_save')
+    post_delete.connect(_bump_player, sender=get_user_model(), dispatch_uid='response_cache_player_delete')
+    post_save.connect(_challenge_saved, sender=Challenge, dispatch_uid='leaderboard_challenge_save')
+    post_delete.connect(_challenge_deleted, sender=Challenge, dispatch_uid='leaderboard_challenge_delete')
+    post_save.connect(_quiz_result_saved, sender=QuizResult, dispatch_uid='top_results_quiz_result_save')
+    post_delete.connect(_quiz_result_deleted, sender=QuizResult, dispatch_uid='top_results_quiz_result_delete')
@@ -0,0 +1,179 @@
+"""
+Combined cross-game standings.
+
+A player's standing counts one completed GameSession per game type, their
+best (highest percentage, then fastest) or their latest one depending on
+GAMEPLAY_STANDINGS_MODE, and adds up the percentages weighted by
+GAMEPLAY_STANDINGS_WEIGHTS. Standings are materialised in GameStanding and
+updated from the session that was just saved, so neither writes nor reads
+ever rescan GameSession; ``rebuild()`` (manage.py rebuild_standings)
+recomputes them from scratch, e.g. after the weights change.
+
+Reads walk the (-combined_score, total_time_seconds) index. When a
+channel layer shared between processes is configured, the top standings are
+pushed to the ``standings`` group after a change. The in-memory layer would
+only reach sockets in the process that saved the session (never the ASGI
+one, since sessions are saved by the WSGI workers), so with it nothing is
+pushed and StandingsConsumer re-reads them (polled_text) every
+GAMEPLAY_WS_FALLBACK_POLL_SECONDS, once per process however many sockets.
+"""
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from . import response_cache
+from .models import GameSession, GameStanding, GameType
+
+GROUP = 'standings'
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+BATCH_SIZE = 1000
+
+_last_broadcast = {}
+_polled = {'text': None, 'at': 0.0}
+_poll_lock = threading.Lock()
+
+
+def _entry(session_id, correct, total, time_taken):
+    return {
+        'session_id': session_id,
+        'percentage': round(correct / total * 100, 2) if total else 0.0,
+        'time': time_taken,
+    }
+
+
+def _counts_over(new, current):
+    """Whether ``new`` replaces ``current`` as the session counted for its game type."""
+    if current is None or settings.GAMEPLAY_STANDINGS_MODE == 'latest':
+        return True
+    return (new['percentage'], -new['time']) > (current['percentage'], -current['time'])
+
+
+def _combine(game_scores):
+    weights = settings.GAMEPLAY_STANDINGS_WEIGHTS
+    combined = sum(weights.get(game_type, 1.0) * entry['percentage'] for game_type, entry in game_scores.items())
+    return round(combined, 2), sum(entry['time'] for entry in game_scores.values())
+
+
+def record_session(session):
+    """
+    Fold a just-saved session into its player's standing. Returns whether
+    the standing changed; incomplete sessions and unknown game types don't count.
+    """
+    if not session.completed or session.game_type not in GameType.values:
+        return False
+    entry = _entry(session.id, session.correct_answers, session.total_questions, session.total_time_seconds)
+    with transaction.atomic():
+        standing, _ = GameStanding.objects.select_for_update().get_or_create(player_id=session.player_id)
+        if not _counts_over(entry, standing.game_scores.get(session.game_type)):
+            return False
+        standing.game_scores[session.game_type] = entry
+        standing.combined_score, standing.total_time_seconds = _combine(standing.game_scores)
+        standing.save()
+    transaction.on_commit(broadcast)
+    return True
+
+
+def top(limit=DEFAULT_LIMIT):
+    standings = (
+        GameStanding.objects.select_related('player')
+        .order_by('-combined_score', 'total_time_seconds')[:limit]
+    )
+    return [
+        {
+            'rank': rank,
+            'player_id': standing.player_id,
+            'name': standing.player.name,
+            'combined_score': standing.combined_score,
+            'total_time_seconds': standing.total_time_seconds,
+            'games': {game_type: entry['percentage'] for game_type, entry in standing.game_scores.items()},
+        }
+        for rank, standing in enumerate(standings, start=1)
+    ]
+
+
+def payload(limit=DEFAULT_LIMIT):
+    return {
+        'mode': settings.GAMEPLAY_STANDINGS_MODE,
+        'weights': settings.GAMEPLAY_STANDINGS_WEIGHTS,
+        'standings': top(limit),
+    }
+
+
+def _encode():
+    return json.dumps({'type': 'standings_update', **payload()}, cls=DjangoJSONEncoder)
+
+
+def message_text():
+    """The socket frame for the current top standings, cached until a standing changes."""
+    return response_cache.cached('standings', ('GameStanding',), _encode)
+
+
+def polled_text(max_age):
+    """
+    The frame read from the database, at most once per ``max_age`` seconds in
+    this process. Bypasses the response cache, whose versions other worker
+    processes don't bump with LocMemCache.
+    """
+    with _poll_lock:
+        if _polled['text'] is None or time.monotonic() - _polled['at'] >= max_age:
+            _polled['text'] = _encode()
+            _polled['at'] = time.monotonic()
+        return _polled['text']
+
+
+def pushes_reach_sockets():
+    """Whether a group_send from this process reaches every process's sockets."""
+    backend = settings.CHANNEL_LAYERS.get('default', {}).get('BACKEND', '')
+    return bool(backend) and not backend.endswith('InMemoryChannelLayer')
+
+
+def broadcast():
+    """
+    Push the top standings to connected sockets, unless the channel layer
+    isn't shared or this process already sent the same frame.
+    """
+    if not pushes_reach_sockets():
+        return
+    from asgiref.sync import async_to_sync
+    from channels.layers import get_channel_layer
+
+    layer = get_channel_layer()
+    text = message_text()
+    if layer is None or _last_broadcast.get('text') == text:
+        return
+    _last_broadcast['text'] = text
+    async_to_sync(layer.group_send)(GROUP, {'type': 'standings.update', 'text': text})
+
+
+def rebuild():
+    """Recompute every standing from the completed sessions; returns the number of players."""
+    scores = {}
+    sessions = (
+        GameSession.objects.filter(completed=True, game_type__in=GameType.values)
+        .order_by('started_at', 'id')
+        .values_list('id', 'player_id', 'game_type', 'correct_answers', 'total_questions', 'total_time_seconds')
+    )
+    for session_id, player_id, game_type, correct, total, time_taken in sessions.iterator(chunk_size=BATCH_SIZE):
+        games = scores.setdefault(player_id, {})
+        entry = _entry(session_id, correct, total, time_taken)
+        if _counts_over(entry, games.get(game_type)):
+            games[game_type] = entry
+
+    standings = []
+    for player_id, games in scores.items():
+        combined, total_time = _combine(games)
+        standings.append(GameStanding(
+            player_id=player_id, game_scores=games, combined_score=combined, total_time_seconds=total_time,
+        ))
+    with transaction.atomic():
+        GameStanding.objects.all().delete()
+        GameStanding.objects.bulk_create(standings, batch_size=BATCH_SIZE)
+        # bulk_create sends no post_save, so bump the cached reads by hand.
+        transaction.on_commit(lambda: response_cache.bump('GameStanding'))
+        transaction.on_commit(broadcast)
+    return len(standings)
@@ -0,0 +1,28 @@
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import standings
+from .query_budget import query_budget
+from .response_cache import cached_response
+
+
+@query_budget(1)
+class StandingsAPIView(APIView):
+    """
+    Combined standings across drag_drop, beer_cup and jigsaw, read from the
+    materialised GameStanding table (see standings.py).
+
+    GET /api/gameplay/standings/?limit=20
+    """
+    permission_classes = [AllowAny]
+
+    @cached_response('standings', depends_on=('GameStanding',), params=('limit',))
+    def get(self, request):
+        limit = request.query_params.get('limit', standings.DEFAULT_LIMIT)
+        try:
+            limit = max(1, min(standings.MAX_LIMIT, int(limit)))
+        except (TypeError, ValueError):
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(standings.payload(limit), status=status.HTTP_200_OK)
@@ -1,12 +1,16 @@
 
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from nbcc_backend.api_docs import openapi, swagger_auto_schema
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions, serializers
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError
 from .quiz_stats import QuizStat, check_answer
 from .models import Challenge
+from . import question_tokens, telemetry
+from .leaderboard import cached_active_challenge_id
+from .response_cache import cached
+from .throttling import ClientIPThrottle, PlayerCodeThrottle
 
 class SubmitAnswerSerializer(serializers.Serializer):
     user_id = serializers.CharField(max_length=12, help_text="User's unique_code")
@@ -14,19 +18,35 @@ class SubmitAnswerSerializer(serializers.Serializer):
     answer = serializers.CharField()
     time_taken = serializers.FloatField(required=True, help_text="Time taken to answer in seconds")
     challenge_id = serializers.IntegerField(required=False, allow_null=True, help_text="Challenge ID (optional, will use active challenge if not provided)")
+    token = serializers.CharField(required=False, help_text="Token served with the questions; when sent, the answer is checked against it")
 
 class SubmitAnswerResponseSerializer(serializers.Serializer):
     status = serializers.CharField()
     is_correct = serializers.BooleanField()
 
+
+def player_id(unique_code):
+    """The id of the player with ``unique_code`` (or None), cached until that player changes."""
+    User = get_user_model()
+    return cached(
+        'player_ids', ('Player',),
+        lambda: User.objects.filter(unique_code=unique_code).values_list('id', flat=True).first(),
+        scope=unique_code,
+    )
+
 class SubmitAnswerAPIView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [PlayerCodeThrottle, ClientIPThrottle]
+    throttle_scope = 'submit_answer'
+    throttle_code_field = 'user_id'
 
     @swagger_auto_schema(
-        operation_description="Submit an answer for a question. user_id should be the user's unique_code.",
+        operation_description="Submit an answer for a question. user_id should be the user's unique_code. "
+                              "With the token from quiz_questions, the answer is checked without reading the question.",
         request_body=SubmitAnswerSerializer,
         responses={200: SubmitAnswerResponseSerializer}
     )
+    @telemetry.track('submit_answer')
     def post(self, request):
         serializer = SubmitAnswerSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -35,30 +55,45 @@ class SubmitAnswerAPIView(APIView):
         answer = serializer.validated_data['answer']
         time_taken = serializer.validated_data['time_taken']
         challenge_id = serializer.validated_data.get('challenge_id')
-        
-        User = get_user_model()
-        try:
-            user = User.objects.get(unique_code=unique_code)
-        except User.DoesNotExist:
+        token = serializer.validated_data.get('token')
+
+        user_id = player_id(unique_code)
+        if user_id is None:
             return Response({'status': 'error', 'message': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
-        
-        # Get challenge - use provided challenge_id or get active challenge
-        if challenge_id:
+
+        pack = None
+        if token:
             try:
-                challenge = Challenge.objects.get(id=challenge_id)
-            except Challenge.DoesNotExist:
+                pack = question_tokens.read(token)
+                is_correct = question_tokens.check(pack, question_id, answer, time_taken)
+            except question_tokens.InvalidToken as exc:
+                return Response({'status': 'error', 'message': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Get challenge - the one the pack was served for, the provided challenge_id, or the active challenge
+        if pack and pack['challenge_id']:
+            challenge_id = pack['challenge_id']
+            # Packs outlive their challenge; answers to an ended one would never be archived.
+            if challenge_id != cached_active_challenge_id():
+                return Response({'status': 'error', 'message': 'Challenge has ended'}, status=status.HTTP_400_BAD_REQUEST)
+        elif challenge_id:
+            if not Challenge.objects.filter(id=challenge_id).exists():
                 return Response({'status': 'error', 'message': 'Challenge not found'}, status=status.HTTP_404_NOT_FOUND)
         else:
-            challenge = Challenge.objects.filter(is_active=True).order_by('-started_at').first()
-            if not challenge:
+            challenge_id = Challenge.objects.filter(is_active=True).order_by('-started_at').values_list('id', flat=True).first()
+            if not challenge_id:
                 return Response({'status': 'error', 'message': 'No active challenge found'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        is_correct = check_answer(question_id, answer)
-        QuizStat.objects.create(
-            user=user, 
-            challenge=challenge,
-            question_id=question_id, 
-            is_correct=is_correct, 
-            time_taken=time_taken
-        )
+
+        if pack is None:
+            is_correct = check_answer(question_id, answer)
+        try:
+            QuizStat.objects.create(
+                user_id=user_id,
+                challenge_id=challenge_id,
+                question_id=question_id,
+                is_correct=is_correct,
+                time_taken=time_taken
+            )
+        except IntegrityError:
+            # The cached player or the pack's challenge was deleted in the meantime.
+            return Response({'status': 'error', 'message': 'User or challenge not found'}, status=status.HTTP_404_NOT_FOUND)
         return Response({'status': 'ok', 'is_correct': is_correct}, status=status.HTTP_200_OK)
@@ -0,0 +1,170 @@
+"""
+In-process ingestion telemetry for live challenges.
+
+Each tracked endpoint gets a stream with a fixed-size ring buffer of
+per-second request counters and a fixed-bucket latency histogram. Everything
+is allocated once at import time: recording a request only increments
+existing slots under a short lock, and nothing is written to the database.
+
+Counters are per worker process and reset whenever a new challenge starts,
+so a snapshot describes the current challenge on this worker.
+"""
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+from django.conf import settings
+
+# Upper bounds in milliseconds; the last bucket catches everything slower.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+STREAMS = ('submit_answer', 'submit_game_answer', 'submit_bulk_game_answers', 'code_login')
+
+
+class StreamMetrics:
+    """Per-second counters and a latency histogram for one endpoint."""
+
+    __slots__ = ('name', 'window', '_lock', '_seconds', '_counts', '_errors',
+                 '_histogram', '_total', '_total_errors', '_latency_sum')
+
+    def __init__(self, name, window):
+        self.name = name
+        self.window = window
+        self._lock = threading.Lock()
+        self._seconds = [0] * window
+        self._counts = [0] * window
+        self._errors = [0] * window
+        self._histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._total = 0
+        self._total_errors = 0
+        self._latency_sum = 0.0
+
+    def reset(self):
+        with self._lock:
+            for i in range(self.window):
+                self._seconds[i] = 0
+                self._counts[i] = 0
+                self._errors[i] = 0
+            for i in range(len(self._histogram)):
+                self._histogram[i] = 0
+            self._total = 0
+            self._total_errors = 0
+            self._latency_sum = 0.0
+
+    def record(self, elapsed_ms, failed=False):
+        now = int(time.time())
+        slot = now % self.window
+        bucket = bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)
+        with self._lock:
+            if self._seconds[slot] != now:
+                # Slot last held a second that has scrolled out of the window.
+                self._seconds[slot] = now
+                self._counts[slot] = 0
+                self._errors[slot] = 0
+            self._counts[slot] += 1
+            self._histogram[bucket] += 1
+            self._total += 1
+            self._latency_sum += elapsed_ms
+            if failed:
+                self._errors[slot] += 1
+                self._total_errors += 1
+
+    def _percentile(self, histogram, total, fraction):
+        """Upper bound of the bucket holding the given fraction of requests."""
+        if not total:
+            return None
+        target = fraction * total
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, histogram):
+            seen += count
+            if seen >= target:
+                return bound
+        return None  # Slower than the largest bucket
+
+    def snapshot(self, series_seconds=60):
+        now = int(time.time())
+        with self._lock:
+            seconds = list(self._seconds)
+            counts = list(self._counts)
+            errors = list(self._errors)
+            histogram = list(self._histogram)
+            total = self._total
+            total_errors = self._total_errors
+            latency_sum = self._latency_sum
+
+        def count_for(second, source):
+            slot = second % self.window
+            return source[slot] if seconds[slot] == second else 0
+
+        # The current second is still filling up, so rates use complete seconds.
+        series = [count_for(now - offset, counts) for offset in range(series_seconds, 0, -1)]
+        last_10 = series[-10:]
+        return {
+            'total': total,
+            'errors': total_errors,
+            'rate_1s': series[-1] if series else 0,
+            'rate_10s': round(sum(last_10) / len(last_10), 2) if last_10 else 0,
+            'rate_60s': round(sum(series) / len(series), 2) if series else 0,
+            'errors_60s': sum(count_for(now - offset, errors) for offset in range(series_seconds, 0, -1)),
+            'per_second': series,
+            'latency_ms': {
+                'mean': round(latency_sum / total, 2) if total else None,
+                'p50': self._percentile(histogram, total, 0.50),
+                'p95': self._percentile(histogram, total, 0.95),
+                'p99': self._percentile(histogram, total, 0.99),
+                'buckets': dict(zip([str(b) for b in LATENCY_BUCKETS_MS] + ['+Inf'], histogram)),
+            },
+        }
+
+
+class TelemetryCollector:
+    """All endpoint streams for this process, tagged with the current challenge."""
+
+    def __init__(self, window):
+        self.window = window
+        self.challenge_id = None
+        self.started_at = time.time()
+        self.streams = {name: StreamMetrics(name, window) for name in STREAMS}
+
+    def reset(self, challenge_id=None):
+        for stream in self.streams.values():
+            stream.reset()
+        self.challenge_id = challenge_id
+        self.started_at = time.time()
+
+    def record(self, stream, elapsed_ms, failed=False):
+        self.streams[stream].record(elapsed_ms, failed)
+
+    def snapshot(self):
+        return {
+            'challenge_id': self.challenge_id,
+            'since': self.started_at,
+            'window_seconds': self.window,
+            'streams': {name: stream.snapshot() for name, stream in self.streams.items()},
+        }
+
+
+collector = TelemetryCollector(getattr(settings, 'GAMEPLAY_TELEMETRY_WINDOW_SECONDS', 300))
+
+
+def track(stream):
+    """
+    Decorator for APIView handlers: times the call and counts 4xx/5xx
+    responses (or raised exceptions) as errors for ``stream``.
+    """
+    metrics = collector.streams[stream]
+
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = handler(*args, **kwargs)
+                failed = result.status_code >= 400
+                return result
+            finally:
+                metrics.record((time.perf_counter() - start) * 1000, failed)
+        return wrapper
+    return decorator
@@ -0,0 +1,18 @@
+from rest_framework import status, permissions
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+from .telemetry import collector
+
+
+class TelemetryAPIView(APIView):
+    """
+    Live ingestion rates and latencies for the ops dashboard (staff only).
+    Figures cover this worker process since the current challenge started.
+
+    GET /api/gameplay/telemetry/
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(collector.snapshot(), status=status.HTTP_200_OK)
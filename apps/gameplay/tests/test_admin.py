@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.gameplay.admin_scaling import EstimatedCountPaginator
+from apps.gameplay.models import GameAnswer, GameSession, GameType, QuizResult
+
+Player = get_user_model()
+
+
+class AdminChangelistTests(TestCase):
+    def setUp(self):
+        self.client.force_login(Player.objects.create_superuser(email='admin@example.com', name='Admin', password='pw'))
+        self.seeded = 0
+
+    def seed(self, count):
+        players = Player.objects.bulk_create([
+            Player(email=f'a{i}@example.com', name=f'Player {i}', unique_code=f'A{i:07d}', password='!')
+            for i in range(self.seeded, self.seeded + count)
+        ])
+        self.seeded += count
+        QuizResult.objects.bulk_create([QuizResult(player=p, score=5, total_questions=10) for p in players])
+        GameAnswer.objects.bulk_create([
+            GameAnswer(player=p, game_type=GameType.BEER_CUP, question_id=1, selected_answer='x', is_correct=True)
+            for p in players
+        ])
+        GameSession.objects.bulk_create([
+            GameSession(player=p, game_type=GameType.JIGSAW, total_questions=16, correct_answers=16,
+                        answers_data={'pieces': list(range(16))}, completed=True)
+            for p in players
+        ])
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        for model in ('quizresult', 'gameanswer', 'gamesession'):
+            url = reverse(f'admin:gameplay_{model}_changelist')
+            counts = []
+            for size in (1, 40):
+                self.seed(size - self.seeded)
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                counts.append(len(queries))
+            self.assertEqual(counts[0], counts[1], model)
+            self.seeded = 0
+            for cleared in (QuizResult, GameAnswer, GameSession):
+                cleared.objects.all().delete()
+            Player.objects.filter(is_superuser=False).delete()
+
+    def test_list_rows_leave_answers_data_unloaded(self):
+        self.seed(1)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('admin:gameplay_gamesession_changelist'))
+        row_query = next(q['sql'] for q in queries if '"gameplay_gamesession"."set_a_score"' in q['sql'])
+        self.assertNotIn('answers_data', row_query)
+
+    def test_change_form_still_shows_answers_data(self):
+        self.seed(1)
+        session = GameSession.objects.get()
+        response = self.client.get(reverse('admin:gameplay_gamesession_change', args=[session.pk]))
+        self.assertContains(response, '&quot;pieces&quot;')
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1000)
+    def test_uses_estimate_only_past_threshold(self):
+        queryset = QuizResult.objects.order_by('id')
+        with mock.patch('apps.gameplay.admin_scaling.estimated_count', return_value=2_500_000):
+            self.assertEqual(EstimatedCountPaginator(queryset, 100).count, 2_500_000)
+        with mock.patch('apps.gameplay.admin_scaling.estimated_count', return_value=10):
+            self.assertEqual(EstimatedCountPaginator(queryset, 100).count, 0)
+
+    def test_exact_count_without_planner_estimates(self):
+        QuizResult.objects.create(display_name='Ada', score=1, total_questions=2)
+        self.assertEqual(EstimatedCountPaginator(QuizResult.objects.order_by('id'), 100).count, 1)
@@ -0,0 +1,79 @@
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.gameplay import analytics
+from apps.gameplay.models import Challenge
+from apps.gameplay.quiz_stats import QuizStat
+
+
+class SummariseAnswersTests(APITestCase):
+    def test_grouped_aggregates(self):
+        player_ids = np.array([7, 3, 7, 3, 7])
+        is_correct = np.array([True, False, True, True, False])
+        time_taken = np.array([1.0, 4.0, 3.0, 2.0, 5.0])
+
+        stats = analytics.summarise_answers(player_ids, is_correct, time_taken)
+
+        self.assertEqual(stats['total_answers'], 5)
+        self.assertEqual(stats['total_players'], 2)
+        self.assertEqual(stats['accuracy'], 60.0)
+        # Player 3 has one correct answer, player 7 has two.
+        self.assertEqual(stats['score_histogram'], [0, 1, 1])
+        # Lower medians: player 3 -> 2.0, player 7 -> 3.0.
+        self.assertEqual(stats['per_player']['median_time']['mean'], 2.5)
+
+    def test_best_session_per_player(self):
+        stats = analytics.summarise_sessions(
+            np.array([1, 2, 1]),
+            np.array([4, 6, 9]),
+            np.array([10, 10, 10]),
+            np.array([30.0, 20.0, 25.0]),
+        )
+
+        self.assertEqual(stats['total_players'], 2)
+        self.assertEqual(stats['per_player']['best_score']['mean'], 7.5)
+        self.assertEqual(stats['accuracy'], 63.33)
+
+    def test_empty_input(self):
+        empty = np.array([])
+        stats = analytics.summarise_answers(empty.astype(np.int64), empty.astype(bool), empty)
+        self.assertEqual(stats['total_answers'], 0)
+        self.assertIsNone(stats['accuracy'])
+
+
+class AnswerAnalyticsApiTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.staff = get_user_model().objects.create_superuser(email='staff@example.com', name='Staff', password='pw')
+        self.client.force_authenticate(self.staff)
+
+    def test_quiz_stats_for_challenge(self):
+        player = get_user_model().objects.create_user(email='p@example.com', name='Player')
+        challenge = Challenge.objects.create(name='Morning')
+        QuizStat.objects.create(user=player, challenge=challenge, question_id=1, is_correct=True, time_taken=2.0)
+        QuizStat.objects.create(user=player, challenge=challenge, question_id=2, is_correct=False, time_taken=4.0)
+
+        response = self.client.get(reverse('answer_analytics'), {'source': 'quiz', 'challenge_id': challenge.id})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['stats']['total_answers'], 2)
+        self.assertEqual(response.json()['stats']['accuracy'], 50.0)
+
+        # Served from the cache until the TTL runs out, however many answers arrive.
+        QuizStat.objects.create(user=player, challenge=challenge, question_id=3, is_correct=True, time_taken=1.0)
+        with self.assertNumQueries(0):
+            again = self.client.get(reverse('answer_analytics'), {'source': 'quiz', 'challenge_id': challenge.id})
+        self.assertEqual(again.json()['stats']['total_answers'], 2)
+
+    def test_staff_only(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(reverse('answer_analytics')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rejects_unknown_source(self):
+        response = self.client.get(reverse('answer_analytics'), {'source': 'nope'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from nbcc_backend import api_docs
+
+
+class SchemaCacheTests(SimpleTestCase):
+    def setUp(self):
+        api_docs.reset_schema()
+        self.addCleanup(api_docs.reset_schema)
+
+    def test_schema_is_generated_once_and_revalidated_with_etag(self):
+        from unittest import mock
+
+        with mock.patch.object(api_docs, 'generate_schema', wraps=api_docs.generate_schema) as generate:
+            first = self.client.get(reverse('schema-json', kwargs={'format': '.json'}))
+            second = self.client.get(
+                reverse('schema-json', kwargs={'format': '.json'}), HTTP_IF_NONE_MATCH=first['ETag'],
+            )
+            yaml = self.client.get(reverse('schema-json', kwargs={'format': '.yaml'}))
+
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('/gameplay/submit_answer/', first.json()['paths'])
+        self.assertEqual(second.status_code, 304)
+        self.assertIn(b'swagger:', yaml.content)
+
+    def test_prebuilt_artifact_is_served(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            artifact = Path(tmp) / 'openapi.json'
+            call_command('build_api_schema', output=str(artifact), stdout=StringIO())
+            self.assertIn(b'"paths"', artifact.read_bytes())
+            artifact.write_bytes(b'{"swagger": "2.0", "paths": {}}')
+            with override_settings(API_SCHEMA_FILE=artifact, DEBUG=False, ALLOWED_HOSTS=['testserver']):
+                response = self.client.get(reverse('schema-json', kwargs={'format': '.json'}))
+        self.assertEqual(response.json(), {'swagger': '2.0', 'paths': {}})
+        self.assertEqual(response['Cache-Control'], api_docs.CACHE_CONTROL)
+
+    def test_docs_pages_point_at_cached_schema(self):
+        for name in ('schema-swagger-ui', 'schema-redoc'):
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, '/swagger.json')
+
+
+class WsgiStartupTests(SimpleTestCase):
+    def test_urlconf_loads_without_drf_yasg_under_wsgi_settings(self):
+        code = 'import sys, django; django.setup(); import nbcc_backend.urls; print("drf_yasg" in sys.modules)'
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'nbcc_backend.settings_wsgi'}
+        result = subprocess.run(
+            [sys.executable, '-c', code], env=env, cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(result.stdout.strip(), 'False')
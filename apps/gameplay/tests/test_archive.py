@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.gameplay import analytics
+from apps.gameplay.archive import archive_challenge
+from apps.gameplay.models import ArchivedQuizStat, Challenge
+from apps.gameplay.quiz_stats import QuizStat
+
+
+class ChallengeArchiveTests(APITestCase):
+    def setUp(self):
+        self.player = get_user_model().objects.create_user(email='p@example.com', name='Player')
+        self.ended = Challenge.objects.create(name='Morning', is_active=False, ended_at=timezone.now() + timedelta(minutes=1))
+        self.active = Challenge.objects.create(name='Afternoon')
+        for question_id in range(5):
+            QuizStat.objects.create(user=self.player, challenge=self.ended, question_id=question_id,
+                                    is_correct=question_id % 2 == 0, time_taken=1.5)
+        QuizStat.objects.create(user=self.player, challenge=self.active, question_id=9, is_correct=True)
+
+    def test_moves_rows_in_batches(self):
+        moved = archive_challenge(self.ended, batch_size=2)
+
+        self.assertEqual(moved['quiz_stats'], 5)
+        self.assertFalse(QuizStat.objects.filter(challenge=self.ended).exists())
+        self.assertEqual(ArchivedQuizStat.objects.filter(challenge=self.ended).count(), 5)
+        self.assertEqual(QuizStat.objects.filter(challenge=self.active).count(), 1)
+        self.ended.refresh_from_db()
+        self.assertIsNotNone(self.ended.archived_at)
+
+    def test_overlapping_run_skips_rows_already_copied(self):
+        # Another run copied these two but hasn't deleted them from the hot table yet.
+        ArchivedQuizStat.objects.bulk_create([
+            ArchivedQuizStat(**row) for row in QuizStat.objects.filter(challenge=self.ended).order_by('pk').values()[:2]
+        ])
+
+        moved = archive_challenge(self.ended, batch_size=2)
+
+        self.assertEqual(moved['quiz_stats'], 5)
+        self.assertEqual(ArchivedQuizStat.objects.filter(challenge=self.ended).count(), 5)
+        self.assertFalse(QuizStat.objects.filter(challenge=self.ended).exists())
+
+    def test_refuses_active_challenge(self):
+        with self.assertRaises(ValueError):
+            archive_challenge(self.active)
+
+    def test_historical_reads_include_archive(self):
+        archive_challenge(self.ended)
+
+        player_ids, is_correct, _ = analytics.load_quiz_answers(self.ended.id)
+        self.assertEqual(player_ids.size, 5)
+        self.assertEqual(int(is_correct.sum()), 3)
+
+        response = self.client.post(reverse('leaderboard_stats_api'), {'user_ids': [self.player.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['leaderboard'][0]['total_answered'], 6)
+        self.assertEqual(response.data['leaderboard'][0]['total_correct'], 4)
+        self.assertEqual(response.data['leaderboard'][0]['current_question'], 9)
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+from asgiref.sync import async_to_sync
+from django.test import TransactionTestCase
+
+from apps.gameplay.db_executor import ConsumerDatabase
+from apps.gameplay.models import Challenge
+from nbcc_backend import metrics
+
+
+def count_challenges(threads):
+    threads.add(threading.get_ident())
+    return Challenge.objects.count()
+
+
+class ConsumerDatabaseTests(TransactionTestCase):
+    def setUp(self):
+        for metric in metrics.REGISTRY:
+            metric.clear()
+
+    def run_calls(self, executor, calls):
+        async def gather():
+            return await asyncio.gather(*(executor.run(func, *args) for func, args in calls))
+
+        return async_to_sync(gather)()
+
+    def test_many_sockets_share_a_fixed_number_of_connections(self):
+        Challenge.objects.create(name='Morning')
+        executor = ConsumerDatabase(workers=2)
+        self.addCleanup(executor.shutdown)
+        threads = set()
+
+        results = self.run_calls(executor, [(count_challenges, (threads,))] * 50)
+
+        self.assertEqual(results, [1] * 50)
+        self.assertLessEqual(len(threads), 2)
+        self.assertLessEqual(executor.peak_connections, 2)
+
+    def test_connections_are_reused_and_reported(self):
+        executor = ConsumerDatabase(workers=1)
+        self.addCleanup(executor.shutdown)
+        for _ in range(3):
+            self.run_calls(executor, [(count_challenges, (set(),))])
+
+        body = metrics.render_metrics()
+        self.assertIn('nbcc_consumer_db_connects_total{alias="default"} 1', body)
+        self.assertIn('nbcc_consumer_db_connections_open{alias="default"} 1', body)
+        self.assertIn('nbcc_consumer_db_query_duration_seconds_count{call="count_challenges"} 3', body)
+        self.assertIn('nbcc_consumer_db_wait_seconds_count{call="count_challenges"} 3', body)
+
+        executor.shutdown()
+        self.assertEqual(executor.open_connections(), 0)
+        self.assertIn('nbcc_consumer_db_connections_open{alias="default"} 0', metrics.render_metrics())
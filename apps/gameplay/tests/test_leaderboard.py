@@ -0,0 +1,195 @@
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from apps.gameplay.consumers import LeaderboardConsumer
+from apps.gameplay import leaderboard
+from apps.gameplay.leaderboard import snapshots
+from apps.gameplay.models import Challenge, GameSession, GameType
+from apps.gameplay.quiz_stats import QuizStat
+
+Player = get_user_model()
+
+
+@override_settings(GAMEPLAY_LEADERBOARD_REFRESH_SECONDS=60)
+class LeaderboardSnapshotTests(APITestCase):
+    def setUp(self):
+        snapshots.clear()
+        self.addCleanup(snapshots.clear)
+        self.challenge = Challenge.objects.create(name='Morning')
+        self.alice = Player.objects.create_user(email='alice@example.com', name='Alice')
+        self.bob = Player.objects.create_user(email='bob@example.com', name='Bob')
+
+    def answer(self, player, is_correct, time_taken=5.0):
+        QuizStat.objects.create(user=player, challenge=self.challenge, question_id=1,
+                                is_correct=is_correct, time_taken=time_taken)
+
+    def test_versions_track_row_and_rank_changes(self):
+        self.answer(self.alice, True)
+        self.answer(self.bob, False)
+        first = snapshots.get(0)
+        self.assertEqual(dict(first.ranks), {self.alice.id: 1, self.bob.id: 2})
+
+        self.assertIs(snapshots.get(0), first)  # unchanged rows keep the same object
+
+        self.answer(self.alice, False)  # alice's row changes, ranks don't
+        second = snapshots.get(0)
+        self.assertEqual((second.version, second.rank_version), (first.version + 1, first.rank_version))
+
+        self.answer(self.bob, True, 1.0)
+        self.answer(self.bob, True, 1.0)  # bob overtakes alice
+        third = snapshots.get(0)
+        self.assertEqual(third.rank_version, first.rank_version + 1)
+        self.assertEqual(third.ranks[self.bob.id], 1)
+
+    def test_http_endpoint_serves_snapshot_with_etag(self):
+        self.answer(self.alice, True)
+        response = self.client.get(reverse('leaderboard'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['leaderboard'][0]['name'], 'Alice')
+
+        with self.assertNumQueries(0):
+            again = self.client.get(reverse('leaderboard'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_socket_sends_the_shared_encoded_snapshot(self):
+        self.answer(self.alice, True)
+        snapshot = snapshots.get(60)
+
+        async def receive():
+            communicator = WebsocketCommunicator(LeaderboardConsumer.as_asgi(), '/ws/leaderboard/')
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            message = await communicator.receive_from()
+            await communicator.disconnect()
+            return message
+
+        message = async_to_sync(receive)()
+        self.assertEqual(message, snapshot.text)
+        self.assertEqual(json.loads(message)['challenge_id'], self.challenge.id)
+
+
+
+@override_settings(GAMEPLAY_LEADERBOARD_REFRESH_SECONDS=0.01, GAMEPLAY_WS_FALLBACK_POLL_SECONDS=60)
+class ChallengeEventTests(TransactionTestCase):
+    """Runs outside a test transaction: the consumer reads on its executor's threads."""
+
+    def setUp(self):
+        snapshots.clear()
+        self.addCleanup(snapshots.clear)
+
+    def test_idle_sockets_wait_for_a_start_event_instead_of_polling(self):
+        old = Challenge.objects.create(name='Morning', is_active=False)
+        client = APIClient()
+
+        async def watch():
+            communicator = WebsocketCommunicator(LeaderboardConsumer.as_asgi(), '/ws/leaderboard/')
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            idle = json.loads(await communicator.receive_from())
+            with mock.patch.object(leaderboard, 'get_active_leaderboard', wraps=leaderboard.get_active_leaderboard) as reads:
+                self.assertTrue(await communicator.receive_nothing(timeout=0.2))
+                idle_reads = reads.call_count
+                response = await sync_to_async(client.post)(reverse('start_challenge'), {'name': 'Noon'}, format='json')
+                frames = [json.loads(await communicator.receive_from()) for _ in range(2)]
+            await communicator.disconnect()
+            return idle, idle_reads, response, frames
+
+        idle, idle_reads, response, frames = async_to_sync(watch)()
+        self.assertEqual(idle['message'], 'No active challenge')
+        self.assertEqual(idle_reads, 0)
+        new_id = response.data['challenge_id']
+        self.assertEqual(frames[0], {'type': 'challenge_started', 'challenge_id': new_id})
+        self.assertEqual((frames[1]['type'], frames[1]['challenge_id']), ('leaderboard_update', new_id))
+        self.assertIn('timestamp', frames[1])
+        self.assertNotEqual(old.id, new_id)
+
+    @override_settings(GAMEPLAY_WS_FALLBACK_POLL_SECONDS=0.05)
+    def test_idle_sockets_notice_starts_published_elsewhere(self):
+        async def watch():
+            communicator = WebsocketCommunicator(LeaderboardConsumer.as_asgi(), '/ws/leaderboard/')
+            await communicator.connect()
+            idle = json.loads(await communicator.receive_from())
+            # bulk_create sends no post_save, like a start made in a WSGI worker.
+            await sync_to_async(Challenge.objects.bulk_create)([Challenge(name='Noon', is_active=True)])
+            update = json.loads(await communicator.receive_from(timeout=2))
+            await communicator.disconnect()
+            return idle, update
+
+        idle, update = async_to_sync(watch)()
+        self.assertIsNone(idle['challenge_id'])
+        self.assertEqual(update['challenge_id'], Challenge.objects.get(name='Noon').id)
+
+    def test_ending_the_shown_challenge_switches_sockets_to_idle(self):
+        challenge = Challenge.objects.create(name='Morning', is_active=True)
+
+        async def watch():
+            communicator = WebsocketCommunicator(LeaderboardConsumer.as_asgi(), '/ws/leaderboard/')
+            await communicator.connect()
+            first = json.loads(await communicator.receive_from())
+            challenge.is_active = False
+            await sync_to_async(challenge.save)()
+            frames = [json.loads(await communicator.receive_from()) for _ in range(2)]
+            await communicator.disconnect()
+            return first, frames
+
+        first, frames = async_to_sync(watch)()
+        self.assertEqual(first['challenge_id'], challenge.id)
+        self.assertEqual(frames[0], {'type': 'challenge_ended', 'challenge_id': challenge.id})
+        self.assertEqual(frames[1]['message'], 'No active challenge')
+
+class GameLeaderboardTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.ada = Player.objects.create_user(email='ada@example.com', name='Ada')
+        self.bob = Player.objects.create_user(email='bob@example.com', name='Bob')
+
+    def session(self, player, game_type, correct, time_taken, **fields):
+        fields.setdefault('completed', True)
+        with self.captureOnCommitCallbacks(execute=True):
+            return GameSession.objects.create(player=player, game_type=game_type, total_questions=16,
+                                              correct_answers=correct, total_time_seconds=time_taken, **fields)
+
+    def leaderboard(self, game_type, **headers):
+        return self.client.get(reverse('game_leaderboard'), {'game_type': game_type}, **headers)
+
+    def test_ranks_each_players_best_session(self):
+        self.session(self.ada, GameType.JIGSAW, 16, 40.0, is_correct=True)
+        self.session(self.ada, GameType.JIGSAW, 16, 30.0, is_correct=True)
+        self.session(self.bob, GameType.JIGSAW, 16, 35.0, is_correct=True)
+        self.session(self.bob, GameType.JIGSAW, 16, 10.0, is_correct=False)  # unsolved, not ranked
+
+        rows = self.leaderboard('jigsaw').json()['leaderboard']
+        self.assertEqual([(row['name'], row['total_time_seconds']) for row in rows], [('Ada', 30.0), ('Bob', 35.0)])
+        self.assertEqual([row['rank'] for row in rows], [1, 2])
+
+        self.session(self.ada, GameType.DRAG_DROP, 20, 90.0, set_a_score=10, set_b_score=10)
+        self.session(self.bob, GameType.DRAG_DROP, 25, 120.0, set_a_score=12, set_b_score=13)
+        rows = self.leaderboard('drag_drop').json()['leaderboard']
+        self.assertEqual([(row['name'], row['set_b_score']) for row in rows], [('Bob', 13), ('Ada', 10)])
+
+    def test_cache_is_invalidated_per_game_type(self):
+        self.session(self.ada, GameType.BEER_CUP, 3, 20.0)
+        first = self.leaderboard('beer_cup')
+
+        self.session(self.bob, GameType.JIGSAW, 16, 30.0, is_correct=True)
+        with self.assertNumQueries(0):
+            unchanged = self.leaderboard('beer_cup', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(unchanged.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.session(self.bob, GameType.BEER_CUP, 5, 25.0)
+        changed = self.leaderboard('beer_cup', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertEqual(changed.json()['leaderboard'][0]['name'], 'Bob')
+
+    def test_rejects_unknown_game_type(self):
+        self.assertEqual(self.leaderboard('chess').status_code, status.HTTP_400_BAD_REQUEST)
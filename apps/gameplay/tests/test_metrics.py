@@ -0,0 +1,32 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.gameplay.models import Challenge
+from nbcc_backend import metrics
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=1.0, METRICS_TOKEN='scrape')
+class RequestProfilingTests(APITestCase):
+    def setUp(self):
+        for metric in metrics.REGISTRY:
+            metric.clear()
+
+    def test_records_per_url_name(self):
+        Challenge.objects.create(name='Morning')
+        self.client.get(reverse('get_challenges'))
+
+        body = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape').content.decode()
+
+        self.assertIn('nbcc_sampled_requests_total{view="get_challenges"} 1', body)
+        self.assertIn('nbcc_db_queries_per_request_sum{view="get_challenges"} 1', body)
+        self.assertIn('nbcc_response_size_bytes_count{view="get_challenges"} 1', body)
+        self.assertIn('nbcc_render_duration_seconds_count{view="get_challenges"} 1', body)
+
+    def test_requires_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+    @override_settings(PROFILING_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_are_skipped(self):
+        self.client.get(reverse('get_challenges'))
+        self.assertNotIn('get_challenges', metrics.render_metrics())
@@ -0,0 +1,101 @@
+import json
+
+from asgiref.sync import async_to_sync
+from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.test import SimpleTestCase, override_settings
+
+from apps.gameplay.outbound import REAPED_CLOSE_CODE, OutboundMixin
+from nbcc_backend import metrics
+
+GROUP = 'outbound-test'
+
+
+class SnapshotConsumer(OutboundMixin, AsyncWebsocketConsumer):
+    stream = 'test'
+
+    async def connect(self):
+        await self.channel_layer.group_add(GROUP, self.channel_name)
+        await self.accept()
+        self.start_outbound()
+
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(GROUP, self.channel_name)
+        self.stop_outbound()
+
+    async def publish(self, event):
+        for text in event['snapshots']:
+            self.outbox.put_latest('snapshot', text)
+        for text in event.get('events', ()):
+            self.outbox.put_event(text)
+
+
+async def publish(snapshots, events=()):
+    await get_channel_layer().group_send(GROUP, {'type': 'publish', 'snapshots': snapshots, 'events': list(events)})
+
+
+@override_settings(GAMEPLAY_WS_PING_SECONDS=0.05, GAMEPLAY_WS_PONG_TIMEOUT_SECONDS=0.1,
+                   GAMEPLAY_WS_MAX_IN_FLIGHT=1, GAMEPLAY_WS_MAX_QUEUED_EVENTS=2)
+class OutboundTests(SimpleTestCase):
+    def setUp(self):
+        for metric in metrics.REGISTRY:
+            metric.clear()
+
+    @override_settings(GAMEPLAY_WS_PING_SECONDS=60)
+    def test_unsent_snapshots_are_replaced_and_events_keep_order(self):
+        async def watch():
+            communicator = WebsocketCommunicator(SnapshotConsumer.as_asgi(), '/ws/test/')
+            await communicator.connect()
+            await publish(['v1', 'v2', 'v3'], events=['e1', 'e2', 'e3'])
+            frames = [await communicator.receive_from() for _ in range(3)]
+            await communicator.disconnect()
+            return frames
+
+        self.assertEqual(async_to_sync(watch)(), ['e2', 'e3', 'v3'])
+        body = metrics.render_metrics()
+        self.assertIn('nbcc_ws_frames_dropped_total{stream="test"} 3', body)
+        self.assertIn('nbcc_ws_frames_sent_total{stream="test"} 3', body)
+
+    @override_settings(GAMEPLAY_WS_PONG_TIMEOUT_SECONDS=5)
+    def test_client_that_has_not_drained_gets_only_the_latest_snapshot(self):
+        async def receive_json(communicator):
+            return json.loads(await communicator.receive_from())
+
+        async def watch():
+            communicator = WebsocketCommunicator(SnapshotConsumer.as_asgi(), '/ws/test/')
+            await communicator.connect()
+            ping = await receive_json(communicator)
+            await communicator.send_to(text_data=json.dumps({'type': 'pong', 'seq': ping['seq']}))
+
+            await publish([json.dumps({'version': 1})])
+            first = await receive_json(communicator)
+            gate = await receive_json(communicator)  # sent as soon as a frame is in flight
+            for version in (2, 3, 4):
+                await publish([json.dumps({'version': version})])
+            held = await communicator.receive_nothing(timeout=0.03)
+            await communicator.send_to(text_data=json.dumps({'type': 'pong', 'seq': gate['seq']}))
+            latest = await receive_json(communicator)
+            await communicator.disconnect()
+            return first, gate, held, latest
+
+        first, gate, held, latest = async_to_sync(watch)()
+        self.assertEqual(first, {'version': 1})
+        self.assertEqual(gate, {'type': 'ping', 'seq': 1})
+        self.assertTrue(held)
+        self.assertEqual(latest, {'version': 4})
+        self.assertIn('nbcc_ws_frames_dropped_total{stream="test"} 2', metrics.render_metrics())
+
+    def test_heartbeat_clients_that_go_quiet_are_reaped(self):
+        async def watch():
+            communicator = WebsocketCommunicator(SnapshotConsumer.as_asgi(), '/ws/test/')
+            await communicator.connect()
+            ping = json.loads(await communicator.receive_from())
+            await communicator.send_to(text_data=json.dumps({'type': 'pong', 'seq': ping['seq']}))
+            await communicator.receive_from()  # the next ping, left unanswered
+            closed = await communicator.receive_output(timeout=1)
+            await communicator.wait()
+            return closed
+
+        self.assertEqual(async_to_sync(watch)(), {'type': 'websocket.close', 'code': REAPED_CLOSE_CODE})
+        self.assertIn('nbcc_ws_sockets_reaped_total{stream="test"} 1', metrics.render_metrics())
@@ -0,0 +1,159 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.gameplay.feedback_api import GetAllFeedbacksAPIView, GetFeedbackStatsAPIView
+from apps.gameplay.game_answer_api import GameLeaderboardAPIView, GetPlayerGameStatsAPIView
+from apps.gameplay.leaderboard import get_active_leaderboard
+from apps.gameplay.leaderboard_api import LeaderboardStatsAPIView
+from apps.gameplay.models import Challenge, GameSession, GameStanding, GameType, UserFeedback
+from apps.gameplay.quiz_stats import QuizStat
+from apps.gameplay.standings_api import StandingsAPIView
+
+Player = get_user_model()
+
+SMALL, LARGE = 1, 500
+
+
+@override_settings(GAMEPLAY_RESPONSE_CACHE_ENABLED=False)
+class QueryBudgetTestCase(APITestCase):
+    """
+    Runs an endpoint once with SMALL rows seeded and again after topping up
+    to LARGE rows. Both runs must stay within the declared budget and issue
+    the same number of queries, so an N+1 fails here rather than at an event.
+    Budgets cover the uncached path, so the response cache is off.
+    """
+
+    def make_players(self, count, start=0):
+        return Player.objects.bulk_create([
+            Player(email=f'p{i}@example.com', name=f'Player {i}', unique_code=f'Q{i:07d}', password='!')
+            for i in range(start, start + count)
+        ])
+
+    def assertWithinBudget(self, owner, seed, call, prepare=None):
+        """``prepare`` builds call() arguments outside the measured block."""
+        counts = []
+        seeded = 0
+        for size in (SMALL, LARGE):
+            seed(seeded, size - seeded)
+            seeded = size
+            args = prepare() if prepare else ()
+            with CaptureQueriesContext(connection) as queries:
+                call(*args)
+            counts.append(len(queries))
+
+        budget = owner.query_budget
+        self.assertLessEqual(counts[0], budget, f'{SMALL} row(s) used {counts[0]} queries, budget {budget}')
+        self.assertLessEqual(counts[1], budget, f'{LARGE} rows used {counts[1]} queries, budget {budget}')
+        self.assertEqual(counts[0], counts[1], 'Query count grows with data size')
+
+
+class LeaderboardQueryBudgetTests(QueryBudgetTestCase):
+    def test_active_leaderboard(self):
+        challenge = Challenge.objects.create(name='Morning')
+
+        def seed(start, count):
+            players = self.make_players(count, start)
+            QuizStat.objects.bulk_create([
+                QuizStat(user=p, challenge=challenge, question_id=1, is_correct=True, time_taken=2.0) for p in players
+            ])
+
+        self.assertWithinBudget(get_active_leaderboard, seed, get_active_leaderboard)
+        self.assertEqual(len(get_active_leaderboard()[1]), LARGE)
+
+    def test_leaderboard_stats_api(self):
+        def seed(start, count):
+            players = self.make_players(count, start)
+            QuizStat.objects.bulk_create([
+                QuizStat(user=p, question_id=1, is_correct=False, time_taken=2.0) for p in players
+            ])
+
+        def call(user_ids):
+            response = self.client.post(reverse('leaderboard_stats_api'), {'user_ids': user_ids}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        def prepare():
+            return (list(Player.objects.values_list('id', flat=True)),)
+
+        self.assertWithinBudget(LeaderboardStatsAPIView, seed, call, prepare)
+
+
+class GameStatsQueryBudgetTests(QueryBudgetTestCase):
+    def test_player_game_stats(self):
+        player = self.make_players(1)[0]
+        # A real token, so the budget covers JWTAuthentication's user lookup.
+        token = RefreshToken.for_user(player).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        game_types = GameType.values
+
+        def seed(start, count):
+            GameSession.objects.bulk_create([
+                GameSession(player=player, game_type=game_types[i % len(game_types)],
+                            total_questions=10, correct_answers=i % 11, total_time_seconds=30.0, completed=True)
+                for i in range(start, start + count)
+            ])
+
+        def call():
+            response = self.client.get(reverse('get_player_game_stats'), {'player_code': player.unique_code})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertWithinBudget(GetPlayerGameStatsAPIView, seed, call)
+
+        response = self.client.get(reverse('get_player_game_stats'), {'player_code': player.unique_code})
+        self.assertEqual(response.data['stats']['jigsaw']['best_score'], 10)
+        self.assertEqual(sum(s['total_sessions'] for s in response.data['stats'].values()), LARGE)
+
+    def test_game_leaderboard(self):
+        def seed(start, count):
+            GameSession.objects.bulk_create([
+                GameSession(player=player, game_type=GameType.JIGSAW, total_questions=16, correct_answers=16,
+                            total_time_seconds=30.0 + i, completed=True, is_correct=True)
+                for i, player in enumerate(self.make_players(count, start))
+                for _ in range(2)
+            ])
+
+        def call():
+            response = self.client.get(reverse('game_leaderboard'), {'game_type': 'jigsaw', 'limit': 100})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertWithinBudget(GameLeaderboardAPIView, seed, call)
+
+    def test_standings(self):
+        def seed(start, count):
+            GameStanding.objects.bulk_create([
+                GameStanding(player=player, combined_score=float(i), game_scores={'jigsaw': {'percentage': float(i)}})
+                for i, player in enumerate(self.make_players(count, start), start=start)
+            ])
+
+        def call():
+            response = self.client.get(reverse('standings'), {'limit': 100})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertWithinBudget(StandingsAPIView, seed, call)
+
+
+class FeedbackQueryBudgetTests(QueryBudgetTestCase):
+    def seed(self, start, count):
+        players = self.make_players(count, start)
+        UserFeedback.objects.bulk_create([
+            UserFeedback(player=p, unique_code=p.unique_code, full_name='', what_works='Quiz') for p in players
+        ])
+
+    def test_all_feedbacks(self):
+        def call():
+            response = self.client.get(reverse('all_feedbacks'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertWithinBudget(GetAllFeedbacksAPIView, self.seed, call)
+
+    def test_feedback_stats(self):
+        def call():
+            response = self.client.get(reverse('feedback_stats'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertWithinBudget(GetFeedbackStatsAPIView, self.seed, call)
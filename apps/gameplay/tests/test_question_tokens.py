@@ -0,0 +1,97 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.gameplay import question_tokens
+from apps.gameplay.models import Challenge, Question
+from apps.gameplay.quiz_stats import QuizStat
+
+Player = get_user_model()
+
+
+class QuestionTokenTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.player = Player.objects.create(email='ada@example.com', name='Ada', unique_code='ADA12345', password='!')
+        self.challenge = Challenge.objects.create(name='Morning', is_active=True)
+        self.question = Question.objects.create(text='Capital of France?', correct_answer='Paris')
+
+    def serve(self):
+        response = self.client.get(reverse('quiz_questions_api'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['token']
+
+    def submit(self, token, answer='paris ', time_taken=0.5, question_id=None):
+        return self.client.post(reverse('submit_answer'), {
+            'user_id': 'ADA12345',
+            'question_id': question_id or self.question.id,
+            'answer': answer,
+            'time_taken': time_taken,
+            'token': token,
+        }, format='json')
+
+    def test_answers_are_checked_from_the_token_with_only_the_insert(self):
+        token = self.serve()
+        self.submit(token)  # warms the player lookup
+
+        with self.assertNumQueries(1):
+            right = self.submit(token)
+        wrong = self.submit(token, answer='Lyon')
+
+        self.assertTrue(right.data['is_correct'])
+        self.assertFalse(wrong.data['is_correct'])
+        stat = QuizStat.objects.latest('id')
+        self.assertEqual((stat.challenge_id, stat.is_correct), (self.challenge.id, False))
+
+    def test_tokens_name_the_challenge_active_when_served(self):
+        self.serve()
+        # bulk_create bumps no cache versions, like a switch made in another worker.
+        Challenge.objects.filter(pk=self.challenge.pk).update(is_active=False)
+        [noon] = Challenge.objects.bulk_create([Challenge(name='Noon', is_active=True)])
+        self.assertEqual(question_tokens.read(self.serve())['challenge_id'], noon.id)
+
+    def test_tokens_for_an_ended_challenge_are_refused(self):
+        token = self.serve()
+        self.submit(token)  # caches the active challenge
+        with self.captureOnCommitCallbacks(execute=True):
+            started = self.client.post(reverse('start_challenge'), {'name': 'Noon'}, format='json')
+        self.assertEqual(started.status_code, status.HTTP_201_CREATED)
+
+        response = self.submit(token)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(QuizStat.objects.filter(challenge=self.challenge).count(), 1)
+        self.assertFalse(QuizStat.objects.filter(challenge_id=started.data['challenge_id']).exists())
+
+    def test_token_does_not_reveal_the_answer(self):
+        pack = question_tokens.read(self.serve())
+        digest = pack['digests'][str(self.question.id)]
+        self.assertNotIn('paris', str(pack).lower())
+        self.assertEqual(digest, question_tokens.answer_digest(self.question.id, ' PARIS'))
+
+    def test_tampered_expired_and_foreign_tokens_are_refused(self):
+        token = self.serve()
+        self.assertEqual(self.submit(token[:-2] + 'xx').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.submit(token, question_id=self.question.id + 1).status_code, status.HTTP_400_BAD_REQUEST)
+        with self.settings(GAMEPLAY_QUESTION_TOKEN_MAX_AGE=60), \
+                mock.patch('django.core.signing.time.time', return_value=time.time() + 61):
+            self.assertEqual(self.submit(token).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(QuizStat.objects.exists())
+
+    def test_time_taken_cannot_exceed_time_since_the_pack_was_served(self):
+        token = self.serve()
+        response = self.submit(token, time_taken=30)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('time_taken', response.data['message'])
+
+    def test_submissions_without_a_token_still_read_the_question(self):
+        response = self.client.post(reverse('submit_answer'), {
+            'user_id': 'ADA12345', 'question_id': self.question.id, 'answer': 'Paris', 'time_taken': 3,
+        }, format='json')
+        self.assertTrue(response.data['is_correct'])
+        self.assertEqual(QuizStat.objects.get().challenge_id, self.challenge.id)
@@ -1,9 +1,24 @@
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from apps.gameplay import top_results
+from apps.gameplay.models import QuizResult
+
 
 class QuizResultApiTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def submit(self, score, name='Guest Player', **params):
+        url = reverse('quiz-results-list')
+        if params:
+            url += '?' + '&'.join(f'{key}={value}' for key, value in params.items())
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, {'player_name': name, 'score': score, 'total_questions': 10}, format='json')
+
     def test_guest_can_submit_quiz_score(self):
         url = reverse('quiz-results-list')
         payload = {'player_name': 'Guest Player', 'score': 8, 'total_questions': 10}
@@ -14,3 +29,34 @@ class QuizResultApiTests(APITestCase):
         self.assertIn('leaderboard', response.data)
         self.assertGreaterEqual(len(response.data['leaderboard']), 1)
         self.assertEqual(response.data['leaderboard'][0]['score'], 8)
+
+    def test_new_results_are_folded_into_the_cached_top_list(self):
+        self.submit(5, 'Ada')
+        with self.assertNumQueries(1):  # just the insert
+            response = self.submit(9, 'Grace')
+        self.assertEqual([row['player_name'] for row in response.data['leaderboard']], ['Grace', 'Ada'])
+
+        self.submit(5, 'Linus')  # ties on score go to the most recent
+        with self.assertNumQueries(0):
+            listed = self.client.get(reverse('quiz-results-list'), {'limit': 2})
+        self.assertEqual([row['player_name'] for row in listed.data], ['Grace', 'Linus'])
+
+    def test_full_list_keeps_only_the_best(self):
+        QuizResult.objects.bulk_create([
+            QuizResult(display_name=f'P{i}', score=5, total_questions=10) for i in range(top_results.TOP_SIZE)
+        ])
+        self.client.get(reverse('quiz-results-list'))
+
+        self.submit(1, 'Low')
+        self.submit(10, 'High')
+
+        rows = top_results.top(top_results.TOP_SIZE)
+        self.assertEqual(len(rows), top_results.TOP_SIZE)
+        self.assertEqual(rows[0]['player_name'], 'High')
+        self.assertNotIn('Low', [row['player_name'] for row in rows])
+
+    def test_delete_drops_the_cached_list(self):
+        self.submit(7, 'Ada')
+        with self.captureOnCommitCallbacks(execute=True):
+            QuizResult.objects.get(display_name='Ada').delete()
+        self.assertEqual(self.client.get(reverse('quiz-results-list')).data, [])
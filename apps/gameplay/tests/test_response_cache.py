@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.gameplay.models import Challenge, GameSession, Question, UserFeedback
+
+Player = get_user_model()
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_unchanged_poll_returns_304_without_queries(self):
+        Challenge.objects.create(name='Morning')
+        first = self.client.get(reverse('get_challenges'))
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.json()['challenges'][0]['name'], 'Morning')
+
+        with self.assertNumQueries(0):
+            again = self.client.get(reverse('get_challenges'), HTTP_IF_NONE_MATCH=first['ETag'])
+            cached = self.client.get(reverse('get_challenges'))
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached.content, first.content)
+
+    def test_save_signal_invalidates(self):
+        challenge = Challenge.objects.create(name='Morning')
+        first = self.client.get(reverse('get_challenges'))
+        challenge.name = 'Afternoon'
+        with self.captureOnCommitCallbacks(execute=True):
+            challenge.save()
+            # Not bumped until the write commits, so nothing can cache it under the new version early.
+            pending = self.client.get(reverse('get_challenges'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(pending.status_code, status.HTTP_304_NOT_MODIFIED)
+        second = self.client.get(reverse('get_challenges'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.json()['challenges'][0]['name'], 'Afternoon')
+
+    def test_player_stats_are_versioned_per_player(self):
+        alice = Player.objects.create_user(email='alice@example.com', name='Alice')
+        bob = Player.objects.create_user(email='bob@example.com', name='Bob')
+        self.client.force_authenticate(alice)
+        url = reverse('get_player_game_stats')
+
+        first = self.client.get(url, {'player_code': alice.unique_code})
+        with self.captureOnCommitCallbacks(execute=True):
+            GameSession.objects.create(player=bob, game_type='jigsaw', total_questions=16, correct_answers=16)
+        with self.assertNumQueries(0):
+            unchanged = self.client.get(url, {'player_code': alice.unique_code}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(unchanged.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            GameSession.objects.create(player=alice, game_type='jigsaw', total_questions=16, correct_answers=12)
+        updated = self.client.get(url, {'player_code': alice.unique_code}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(updated.status_code, status.HTTP_200_OK)
+        self.assertEqual(updated.json()['stats']['jigsaw']['best_score'], 12)
+
+    def test_feedback_stats_and_question_pool(self):
+        UserFeedback.objects.create(unique_code='X', full_name='A', what_works='Quiz')
+        self.assertEqual(self.client.get(reverse('feedback_stats')).json()['total_feedbacks'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            UserFeedback.objects.create(unique_code='Y', full_name='B', what_works='Jigsaw')
+        self.assertEqual(self.client.get(reverse('feedback_stats')).json()['total_feedbacks'], 2)
+
+        Question.objects.all().delete()
+        Question.objects.create(text='First?', correct_answer='Yes')
+        self.client.get(reverse('quiz_questions_api'))
+        # Only the active challenge for the pack's token is read; the questions come from the cache.
+        with self.assertNumQueries(1):
+            self.client.get(reverse('quiz_questions_api'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Question.objects.create(text='Second?', correct_answer='No')
+        self.assertEqual(len(self.client.get(reverse('quiz_questions_api')).data['questions']), 2)
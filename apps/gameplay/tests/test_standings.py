@@ -0,0 +1,140 @@
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.gameplay import standings
+from apps.gameplay.consumers import StandingsConsumer
+from apps.gameplay.db_executor import consumer_db
+from apps.gameplay.models import GameStanding
+
+Player = get_user_model()
+
+
+@override_settings(
+    GAMEPLAY_STANDINGS_MODE='best',
+    GAMEPLAY_STANDINGS_WEIGHTS={'drag_drop': 1.0, 'beer_cup': 1.0, 'jigsaw': 2.0},
+)
+class StandingsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        standings._last_broadcast.clear()
+        self.ada = Player.objects.create_user(email='ada@example.com', name='Ada')
+        self.bob = Player.objects.create_user(email='bob@example.com', name='Bob')
+        self.client.force_authenticate(self.ada)
+
+    def jigsaw(self, player, correct_pieces, time_taken=30.0):
+        payload = {
+            'player_code': player.unique_code,
+            'game_type': 'jigsaw',
+            'answers_data': {'total_pieces': 16, 'correct_pieces': correct_pieces},
+            'time_taken_seconds': time_taken,
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('submit_bulk_game_answers'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def save_session(self, player, game_type, correct, total, completed=True):
+        payload = {
+            'player_code': player.unique_code, 'game_type': game_type, 'total_questions': total,
+            'correct_answers': correct, 'total_time_seconds': 20.0, 'completed': completed,
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('save_game_session'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_best_session_per_game_is_weighted_and_ranked(self):
+        self.jigsaw(self.ada, 8)     # 50% x 2
+        self.jigsaw(self.ada, 4)     # worse, ignored in best mode
+        self.save_session(self.ada, 'beer_cup', 3, 4)   # 75%
+        self.save_session(self.bob, 'beer_cup', 4, 4)   # 100%
+        self.save_session(self.bob, 'drag_drop', 9, 10, completed=False)  # incomplete, ignored
+
+        ada = GameStanding.objects.get(player=self.ada)
+        self.assertEqual(ada.combined_score, 175.0)
+        self.assertEqual(set(ada.game_scores), {'jigsaw', 'beer_cup'})
+
+        response = self.client.get(reverse('standings'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = response.json()['standings']
+        self.assertEqual([(row['rank'], row['name']) for row in rows], [(1, 'Ada'), (2, 'Bob')])
+        self.assertEqual(rows[0]['games'], {'jigsaw': 50.0, 'beer_cup': 75.0})
+
+    @override_settings(GAMEPLAY_STANDINGS_MODE='latest')
+    def test_latest_mode_and_rebuild_agree(self):
+        self.jigsaw(self.ada, 16)
+        self.jigsaw(self.ada, 4)
+        self.save_session(self.bob, 'drag_drop', 5, 10)
+        incremental = {s.player_id: s.combined_score for s in GameStanding.objects.all()}
+        self.assertEqual(incremental[self.ada.id], 50.0)
+
+        self.assertEqual(standings.rebuild(), 2)
+        self.assertEqual({s.player_id: s.combined_score for s in GameStanding.objects.all()}, incremental)
+
+    def test_in_memory_layer_gets_no_pushes(self):
+        with mock.patch.object(standings, 'message_text') as message_text:
+            self.jigsaw(self.ada, 16)
+        message_text.assert_not_called()
+        self.assertTrue(GameStanding.objects.filter(player=self.ada).exists())
+
+    # Stands in for a shared layer: the socket and the save are in this one process.
+    @mock.patch.object(standings, 'pushes_reach_sockets', return_value=True)
+    def test_socket_gets_standings_on_connect_and_on_change(self, _):
+        self.jigsaw(self.ada, 16)
+        standings.message_text()  # warm the frame so the consumer's read stays in the cache
+
+        async def watch():
+            communicator = WebsocketCommunicator(StandingsConsumer.as_asgi(), '/ws/standings/')
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            first = json.loads(await communicator.receive_from())
+            await sync_to_async(self.save_session)(self.bob, 'beer_cup', 4, 4)
+            second = json.loads(await communicator.receive_from())
+            await communicator.disconnect()
+            return first, second
+
+        first, second = async_to_sync(watch)()
+        self.assertEqual(first['type'], 'standings_update')
+        self.assertEqual([row['name'] for row in first['standings']], ['Ada'])
+        self.assertEqual([row['name'] for row in second['standings']], ['Ada', 'Bob'])
+
+
+@override_settings(GAMEPLAY_WS_FALLBACK_POLL_SECONDS=0.05)
+class StandingsFallbackTests(TransactionTestCase):
+    """Runs outside a test transaction: the consumer reads on its executor's threads."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        standings._polled.update(text=None, at=0.0)
+        # Waits for in-flight re-checks and closes the executor's connections before the tables are flushed.
+        self.addCleanup(consumer_db.shutdown)
+
+    def test_socket_picks_up_standings_saved_in_another_process(self):
+        # An explicit code: drawing one from the pool would start a refill thread that outlives the test.
+        ada = Player.objects.create(email='ada@example.com', name='Ada', unique_code='ADA12345', password='!')
+
+        async def watch():
+            communicator = WebsocketCommunicator(StandingsConsumer.as_asgi(), '/ws/standings/')
+            await communicator.connect()
+            first = json.loads(await communicator.receive_from())
+            # bulk_create sends no signal and no broadcast, like a save made in a WSGI worker.
+            await sync_to_async(GameStanding.objects.bulk_create)([
+                GameStanding(player=ada, game_scores={'jigsaw': {'session_id': 1, 'percentage': 50.0, 'time': 9.0}},
+                             combined_score=50.0, total_time_seconds=9.0),
+            ])
+            second = json.loads(await communicator.receive_from(timeout=2))
+            await communicator.disconnect()
+            return first, second
+
+        first, second = async_to_sync(watch)()
+        self.assertEqual(first['standings'], [])
+        self.assertEqual([row['name'] for row in second['standings']], ['Ada'])
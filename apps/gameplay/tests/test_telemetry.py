@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.gameplay.telemetry import StreamMetrics, collector
+
+
+class StreamMetricsTests(APITestCase):
+    def test_counts_and_latency_buckets(self):
+        stream = StreamMetrics('test', window=60)
+        for elapsed in (3, 7, 40, 40, 900):
+            stream.record(elapsed)
+        stream.record(12, failed=True)
+
+        snapshot = stream.snapshot()
+
+        self.assertEqual(snapshot['total'], 6)
+        self.assertEqual(snapshot['errors'], 1)
+        self.assertEqual(snapshot['latency_ms']['p50'], 25)
+        self.assertEqual(snapshot['latency_ms']['p99'], 1000)
+        self.assertEqual(len(snapshot['per_second']), 60)
+
+        stream.reset()
+        self.assertEqual(stream.snapshot()['total'], 0)
+
+
+class TelemetryApiTests(APITestCase):
+    def setUp(self):
+        collector.reset()
+
+    def test_login_attempts_are_recorded(self):
+        self.client.post(reverse('code-login'), {'unique_code': 'NOPE1234'}, format='json')
+        self.assertEqual(collector.streams['code_login'].snapshot()['errors'], 1)
+
+    def test_endpoint_is_staff_only(self):
+        self.assertEqual(self.client.get(reverse('telemetry')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        staff = get_user_model().objects.create_superuser(email='ops@example.com', name='Ops', password='pw')
+        self.client.force_authenticate(staff)
+        response = self.client.get(reverse('telemetry'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('submit_answer', response.data['streams'])
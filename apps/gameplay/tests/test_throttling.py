@@ -0,0 +1,83 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.gameplay import throttling
+from apps.gameplay.models import UserFeedback
+from apps.gameplay.throttling import TokenBuckets
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_burst_then_sustained_rate(self):
+        bucket = TokenBuckets()
+        self.assertEqual([bucket.take('k', 2, 3, now=0) for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.take('k', 2, 3, now=0), 0.5)
+        self.assertEqual(bucket.take('k', 2, 3, now=0.5), 0)
+        self.assertGreater(bucket.take('k', 2, 3, now=0.5), 0)
+        self.assertEqual(bucket.take('other', 2, 3, now=0.5), 0)
+
+    def test_full_buckets_are_pruned_past_max_keys(self):
+        bucket = TokenBuckets(max_keys=2)
+        bucket.take('a', 1, 1, now=0)
+        bucket.take('b', 1, 1, now=0)
+        bucket.take('c', 1, 1, now=5)  # a and b have refilled by now
+        self.assertEqual(len(bucket), 1)
+
+
+@override_settings(GAMEPLAY_THROTTLE_ENABLED=True, GAMEPLAY_THROTTLE_SYNC_CACHE=False,
+                   GAMEPLAY_THROTTLE_RATES={'code': (0.01, 2), 'ip': (0.01, 5)})
+class WriteThrottleTests(APITestCase):
+    def setUp(self):
+        throttling.buckets.clear()
+        self.addCleanup(throttling.buckets.clear)
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def feedback(self, code, ip='10.0.0.1'):
+        return self.client.post(reverse('submit_feedback'), {'unique_code': code, 'what_works': 'ok'},
+                                format='json', REMOTE_ADDR=ip)
+
+    def test_code_bucket_returns_429_before_any_insert(self):
+        self.assertEqual(self.feedback('abc12345').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.feedback('ABC12345').status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(0):
+            throttled = self.feedback('ABC12345')
+        self.assertEqual(throttled.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', throttled)
+        self.assertEqual(UserFeedback.objects.count(), 2)
+
+        self.assertEqual(self.feedback('OTHER123').status_code, status.HTTP_201_CREATED)
+
+    def test_ip_bucket_limits_many_codes_from_one_client(self):
+        codes = [f'CODE{i:04d}' for i in range(6)]
+        statuses = [self.feedback(code).status_code for code in codes]
+        self.assertEqual(statuses[-1], status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(statuses.count(status.HTTP_201_CREATED), 5)
+        self.assertEqual(self.feedback('CODE9999', ip='10.0.0.2').status_code, status.HTTP_201_CREATED)
+
+    def test_forged_forwarded_for_does_not_reset_the_ip_bucket(self):
+        def forged(i):
+            # The client sends its own X-Forwarded-For; the proxy appends the address it saw.
+            return self.client.post(reverse('submit_feedback'), {'unique_code': f'CODE{i:04d}', 'what_works': 'ok'},
+                                    format='json', REMOTE_ADDR='10.1.1.1',
+                                    HTTP_X_FORWARDED_FOR=f'198.51.100.{i}, 203.0.113.7').status_code
+
+        statuses = [forged(i) for i in range(6)]
+        self.assertEqual(statuses.count(status.HTTP_201_CREATED), 5)
+        self.assertEqual(statuses[-1], status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(GAMEPLAY_THROTTLE_SYNC_CACHE=True)
+    def test_cache_sync_shares_buckets_between_processes(self):
+        self.assertEqual(self.feedback('SHARED01').status_code, status.HTTP_201_CREATED)
+        throttling.buckets.clear()  # another worker: no local state, same cache
+        self.assertEqual(self.feedback('SHARED01').status_code, status.HTTP_201_CREATED)
+        throttling.buckets.clear()
+        self.assertEqual(self.feedback('SHARED01').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(GAMEPLAY_THROTTLE_ENABLED=False)
+    def test_can_be_switched_off(self):
+        for _ in range(4):
+            self.assertEqual(self.feedback('ABC12345').status_code, status.HTTP_201_CREATED)
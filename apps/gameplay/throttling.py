@@ -0,0 +1,138 @@
+"""
+Token-bucket throttles for the public write endpoints.
+
+Every client key (a player's unique_code, or the client IP) has a bucket of
+``burst`` tokens that refills at ``rate`` tokens per second
+(GAMEPLAY_THROTTLE_RATES). Each request takes one token. A request that
+finds its bucket empty is rejected with a 429 and a Retry-After header
+before the view touches the database. A flooding kiosk or bot is held to
+the sustained rate while every other client keeps its own bucket, so a
+burst degrades one client instead of saturating DB connections.
+
+Buckets live in a plain dict of (tokens, timestamp, full_at) tuples.
+Reading or replacing one dict entry is atomic under the GIL, so checks
+take no lock. Two threads racing on the same key can both spend the same
+token, which only ever lets a request or two extra through. Once the dict
+passes MAX_KEYS, buckets that have refilled completely are dropped,
+because a full bucket is the same as no bucket.
+
+Each process has its own buckets. With GAMEPLAY_THROTTLE_SYNC_CACHE, a
+request that passes locally is also charged against a bucket in the
+Django cache (Redis when REDIS_URL is set), so limits hold across
+workers. The same benign race applies there.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+MAX_KEYS = 50000
+CACHE_PREFIX = 'gameplay:throttle'
+
+
+def _refill(state, rate, burst, now):
+    if state is None:
+        return float(burst)
+    tokens, stamp = state[0], state[1]
+    return min(float(burst), tokens + max(0.0, now - stamp) * rate)
+
+
+def _spend(state, rate, burst, now):
+    """(new state, seconds to wait); the wait is 0 when a token was taken."""
+    tokens = _refill(state, rate, burst, now)
+    if tokens < 1:
+        return (tokens, now, now + (burst - tokens) / rate), (1 - tokens) / rate
+    tokens -= 1
+    return (tokens, now, now + (burst - tokens) / rate), 0.0
+
+
+class TokenBuckets:
+    """Per-process buckets keyed by scope and client."""
+
+    def __init__(self, max_keys=MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets = {}
+
+    def take(self, key, rate, burst, now=None):
+        """Take a token for ``key``; returns 0 if allowed, otherwise seconds until one is available."""
+        now = time.monotonic() if now is None else now
+        if len(self._buckets) >= self.max_keys and key not in self._buckets:
+            self.prune(now)
+        self._buckets[key], wait = _spend(self._buckets.get(key), rate, burst, now)
+        return wait
+
+    def prune(self, now=None):
+        now = time.monotonic() if now is None else now
+        for key, state in list(self._buckets.items()):
+            if state[2] <= now:
+                self._buckets.pop(key, None)
+
+    def clear(self):
+        self._buckets.clear()
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+buckets = TokenBuckets()
+
+
+def take_shared(key, rate, burst):
+    """take() against a bucket kept in the Django cache, shared by every worker."""
+    now = time.time()
+    cache_key = f'{CACHE_PREFIX}:{key}'
+    state, wait = _spend(cache.get(cache_key), rate, burst, now)
+    cache.set(cache_key, state, math.ceil(burst / rate) + 1)
+    return wait
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Base class; subclasses name the bucket ``kind`` and extract the client key.
+    Buckets are separate per view, named by the view's ``throttle_scope``.
+    """
+    kind = None
+
+    def get_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self._wait = 0.0
+        if not settings.GAMEPLAY_THROTTLE_ENABLED:
+            return True
+        ident = self.get_key(request, view)
+        if not ident:
+            return True
+        rate, burst = settings.GAMEPLAY_THROTTLE_RATES[self.kind]
+        key = f"{getattr(view, 'throttle_scope', type(view).__name__)}:{self.kind}:{ident}"
+        self._wait = buckets.take(key, rate, burst)
+        if not self._wait and settings.GAMEPLAY_THROTTLE_SYNC_CACHE:
+            self._wait = take_shared(key, rate, burst)
+        return not self._wait
+
+    def wait(self):
+        return self._wait
+
+
+class PlayerCodeThrottle(TokenBucketThrottle):
+    """One bucket per unique_code, read from the body field named by the view's ``throttle_code_field``."""
+    kind = 'code'
+
+    def get_key(self, request, view):
+        data = request.data
+        if not hasattr(data, 'get'):
+            return None
+        return str(data.get(getattr(view, 'throttle_code_field', 'unique_code')) or '').strip().upper()
+
+
+class ClientIPThrottle(TokenBucketThrottle):
+    """
+    One bucket per client address: the X-Forwarded-For entry added by the
+    outermost of NUM_PROXIES proxies, so values the client sends itself are ignored.
+    """
+    kind = 'ip'
+
+    def get_key(self, request, view):
+        return self.get_ident(request)
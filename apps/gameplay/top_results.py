@@ -0,0 +1,123 @@
+"""
+Top quiz results, maintained incrementally in the shared cache.
+
+QuizResultViewSet answers every list call, and every create, with the best
+results ordered by score and then recency. Rather than re-query and
+re-serialise them each time, the best TOP_SIZE rows (the largest ``limit``
+the API accepts) are kept in the cache, already serialised, next to their
+sort keys. A new result is compared with the current cutoff and, if it
+makes the cut, bisected into place; the list is only rebuilt from the
+database (one query on the (score, created_at) index) when the entry is
+missing. Updates and deletes drop the entry.
+
+Writers and rebuilds take a short lock in the cache so a concurrent insert
+can't be lost between a read and a write. A writer that can't get the lock
+drops the entry instead. With the per-process LocMemCache each worker keeps
+its own list and only folds in the results it created, so the TTL
+(GAMEPLAY_RESPONSE_CACHE_TTLS['quiz_top'], 30 s by default) bounds how long
+other workers miss a new result, and how stale the embedded player names
+can get. With REDIS_URL set the list is shared and every worker updates it.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+from . import response_cache
+from .models import QuizResult
+from .serializers import QuizResultSerializer
+
+TOP_SIZE = 50
+KEY = f'{response_cache.PREFIX}:quiz_top'
+LOCK_KEY = f'{KEY}:lock'
+LOCK_TIMEOUT = 5
+LOCK_WAIT_SECONDS = 0.5
+
+
+def _sort_key(result):
+    # Ascending order of this key is -score, -created_at; the id settles ties.
+    return (-result.score, -result.created_at.timestamp(), -result.pk)
+
+
+def _leaderboard_queryset(limit):
+    return QuizResult.objects.select_related('player').order_by('-score', '-created_at', '-pk')[:limit]
+
+
+def _row(result):
+    return dict(QuizResultSerializer(result).data)
+
+
+@contextmanager
+def _lock():
+    """Yield True once the cache lock is held, or False if it couldn't be taken in time."""
+    deadline = time.monotonic() + LOCK_WAIT_SECONDS
+    while not cache.add(LOCK_KEY, 1, LOCK_TIMEOUT):
+        if time.monotonic() >= deadline:
+            yield False
+            return
+        time.sleep(0.005)
+    try:
+        yield True
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+def _build():
+    results = list(_leaderboard_queryset(TOP_SIZE))
+    return {'keys': [_sort_key(result) for result in results], 'rows': [_row(result) for result in results]}
+
+
+def _insert(entry, result):
+    """Bisect ``result`` into ``entry`` in place; False if it doesn't make the cut or is already there."""
+    keys, rows = entry['keys'], entry['rows']
+    key = _sort_key(result)
+    if len(keys) >= TOP_SIZE and key > keys[-1]:
+        return False
+    position = bisect_left(keys, key)
+    if position < len(keys) and keys[position] == key:
+        return False
+    keys.insert(position, key)
+    rows.insert(position, _row(result))
+    del keys[TOP_SIZE:], rows[TOP_SIZE:]
+    return True
+
+
+def top(limit, include=None):
+    """
+    The best ``limit`` results as serialised rows. ``include`` is a result
+    just created in this request, folded in even if the commit hook that
+    records it hasn't run yet.
+    """
+    if not response_cache.enabled():
+        return QuizResultSerializer(_leaderboard_queryset(limit), many=True).data
+
+    entry = cache.get(KEY)
+    if entry is None:
+        with _lock() as locked:
+            entry = cache.get(KEY) if locked else None
+            if entry is None:
+                entry = _build()
+                if locked:
+                    cache.set(KEY, entry, response_cache.ttl('quiz_top'))
+    if include is not None:
+        _insert(entry, include)
+    return entry['rows'][:limit]
+
+
+def record(result):
+    """Fold a newly created result into the cached list, if it makes the cut."""
+    if not response_cache.enabled():
+        return
+    with _lock() as locked:
+        if not locked:
+            cache.delete(KEY)
+            return
+        entry = cache.get(KEY)
+        # Nothing cached: the next read rebuilds, and will include this row.
+        if entry is not None and _insert(entry, result):
+            cache.set(KEY, entry, response_cache.ttl('quiz_top'))
+
+
+def invalidate():
+    cache.delete(KEY)
@@ -1,7 +1,8 @@
 from django.urls import path
+from rest_framework.routers import SimpleRouter
 from . import quiz_stats
 
-from .leaderboard_api import LeaderboardStatsAPIView, AddLeaderboardParticipantAPIView, GameSessionAPIView, GetChallengesAPIView, StartChallengeAPIView
+from .leaderboard_api import LeaderboardAPIView, LeaderboardStatsAPIView, AddLeaderboardParticipantAPIView, GameSessionAPIView, GetChallengesAPIView, StartChallengeAPIView
 from .submit_answer_api import SubmitAnswerAPIView
 from .quiz_questions_api import QuizQuestionsAPIView
 from .game_answer_api import (
@@ -9,12 +10,21 @@ from .game_answer_api import (
     SubmitBulkGameAnswersAPIView,
     SaveGameSessionAPIView,
     GetPlayerGameStatsAPIView,
+    GameLeaderboardAPIView,
 )
 from .feedback_api import SubmitFeedbackAPIView, GetFeedbackStatsAPIView, GetAllFeedbacksAPIView
+from .analytics_api import AnswerAnalyticsAPIView
+from .telemetry_api import TelemetryAPIView
+from .standings_api import StandingsAPIView
+from .views import QuizResultViewSet
+
+router = SimpleRouter()
+router.register('quiz-results', QuizResultViewSet, basename='quiz-results')
 
 urlpatterns = [
     path('quiz_questions/', QuizQuestionsAPIView.as_view(), name='quiz_questions_api'),
     path('submit_answer/', SubmitAnswerAPIView.as_view(), name='submit_answer'),
+    path('leaderboard/', LeaderboardAPIView.as_view(), name='leaderboard'),
     path('leaderboard_stats/', quiz_stats.leaderboard_stats, name='leaderboard_stats'),
     path('leaderboard_stats_api/', LeaderboardStatsAPIView.as_view(), name='leaderboard_stats_api'),
     path('add_leaderboard_participant/', AddLeaderboardParticipantAPIView.as_view(), name='add_leaderboard_participant'),
@@ -27,9 +37,15 @@ urlpatterns = [
     path('game-answers/bulk/', SubmitBulkGameAnswersAPIView.as_view(), name='submit_bulk_game_answers'),
     path('game-session/save/', SaveGameSessionAPIView.as_view(), name='save_game_session'),
     path('player-stats/', GetPlayerGameStatsAPIView.as_view(), name='get_player_game_stats'),
+    path('game-leaderboard/', GameLeaderboardAPIView.as_view(), name='game_leaderboard'),
+    path('standings/', StandingsAPIView.as_view(), name='standings'),
     
     # Feedback endpoints
     path('feedback/', SubmitFeedbackAPIView.as_view(), name='submit_feedback'),
     path('feedback/stats/', GetFeedbackStatsAPIView.as_view(), name='feedback_stats'),
     path('feedback/all/', GetAllFeedbacksAPIView.as_view(), name='all_feedbacks'),
-]
+
+    # Aggregate answer statistics
+    path('analytics/', AnswerAnalyticsAPIView.as_view(), name='answer_analytics'),
+    path('telemetry/', TelemetryAPIView.as_view(), name='telemetry'),
+] + router.urls
@@ -1,8 +1,11 @@
 from rest_framework import mixins, permissions, response, status, viewsets
 
+from . import top_results
 from .models import QuizResult
 from .serializers import QuizResultCreateSerializer, QuizResultSerializer
 
+DEFAULT_LIMIT = 10
+
 
 class QuizResultViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, viewsets.GenericViewSet):
     queryset = QuizResult.objects.select_related('player')
@@ -13,10 +16,14 @@ class QuizResultViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, viewsets
             return QuizResultCreateSerializer
         return QuizResultSerializer
 
+    def list(self, request, *args, **kwargs):
+        if self._is_leaderboard():
+            return response.Response(top_results.top(self._limit(request.query_params.get('limit'))))
+        return super().list(request, *args, **kwargs)
+
     def get_queryset(self):
-        leaderboard = self.request.query_params.get('leaderboard', 'true').lower()
-        if leaderboard != 'false':
-            return self._leaderboard_queryset(self.request.query_params.get('limit'))
+        if self._is_leaderboard():
+            return QuizResult.objects.select_related('player').order_by('-score', '-created_at')
 
         queryset = QuizResult.objects.select_related('player')
         if self.request.user.is_authenticated:
@@ -34,25 +41,22 @@ class QuizResultViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, viewsets
         quiz_result = serializer.save()
 
         read_serializer = QuizResultSerializer(quiz_result, context=self.get_serializer_context())
-        leaderboard_serializer = QuizResultSerializer(
-            self._leaderboard_queryset(request.query_params.get('limit')),
-            many=True,
-        )
 
         return response.Response(
             {
                 'result': read_serializer.data,
-                'leaderboard': leaderboard_serializer.data,
+                'leaderboard': top_results.top(self._limit(request.query_params.get('limit')), include=quiz_result),
             },
             status=status.HTTP_201_CREATED,
         )
 
-    def _leaderboard_queryset(self, limit_param):
-        queryset = QuizResult.objects.select_related('player').order_by('-score', '-created_at')
-        limit_value = 10
+    def _is_leaderboard(self):
+        return self.request.query_params.get('leaderboard', 'true').lower() != 'false'
+
+    def _limit(self, limit_param):
         if limit_param:
             try:
-                limit_value = max(1, min(50, int(limit_param)))
+                return max(1, min(top_results.TOP_SIZE, int(limit_param)))
             except ValueError:
-                limit_value = 10
-        return queryset[:limit_value]
+                pass
+        return DEFAULT_LIMIT
@@ -0,0 +1,94 @@
+"""
+Shared bootstrap for the benchmark scripts.
+
+Benchmarks never touch the production database: unless DATABASE_URL is set
+explicitly they run against a throwaway SQLite file.
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+
+def setup(database_url=None):
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nbcc_backend.settings')
+    os.environ['DATABASE_URL'] = database_url or os.environ.get(
+        'DATABASE_URL', f'sqlite:///{BASE_DIR / "bench.sqlite3"}'
+    )
+
+    import django
+    django.setup()
+    _begin_sqlite_transactions_immediately()
+
+
+def _begin_sqlite_transactions_immediately():
+    """
+    Take SQLite's write lock when a transaction starts, as Django 5.1's
+    ``transaction_mode='IMMEDIATE'`` does. A deferred transaction that reads
+    and then writes can't upgrade its lock while another writer is queued and
+    fails with "database is locked" instead of waiting, which the concurrent
+    benchmarks hit constantly. PostgreSQL runs are unaffected.
+    """
+    from django.db import connection
+    from django.db.backends.sqlite3.base import DatabaseWrapper
+
+    if connection.vendor == 'sqlite':
+        DatabaseWrapper._start_transaction_under_autocommit = lambda self: self.cursor().execute('BEGIN IMMEDIATE')
+
+
+def migrate():
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0, interactive=False)
+
+
+def save_results(name, results, output=None):
+    """Write results as JSON so runs can be diffed between commits."""
+    path = Path(output) if output else RESULTS_DIR / f'{name}.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True))
+    return path
+
+
+def git_revision():
+    import subprocess
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def latency_summary(samples_ms):
+    """p50/p95/p99/mean/max of a list of latencies in milliseconds."""
+    if not samples_ms:
+        return {'count': 0}
+    ordered = sorted(samples_ms)
+
+    def pick(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+    return {
+        'count': len(ordered),
+        'mean': round(sum(ordered) / len(ordered), 3),
+        'p50': pick(0.50),
+        'p95': pick(0.95),
+        'p99': pick(0.99),
+        'max': round(ordered[-1], 3),
+    }
+
+
+class QueryCounter:
+    """connection.execute_wrapper hook that only counts queries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
@@ -0,0 +1,97 @@
+"""
+Benchmark the vectorised answer analytics on synthetic data.
+
+Compares ``analytics.summarise_answers`` against the per-row Python loop it
+replaces, including the cost of turning ``values_list`` tuples into arrays.
+
+    python -m benchmarks.bench_analytics --answers 1000000 --players 5000
+"""
+import argparse
+import statistics
+import time
+from itertools import chain
+
+import numpy as np
+
+from benchmarks import _django
+
+
+def python_summary(rows):
+    """Reference implementation: the per-row loop style used in consumers.py."""
+    per_player = {}
+    times = []
+    correct_total = 0
+    for user_id, is_correct, time_taken in rows:
+        entry = per_player.setdefault(user_id, [0, 0, []])
+        entry[0] += 1
+        entry[1] += is_correct
+        entry[2].append(time_taken)
+        times.append(time_taken)
+        correct_total += is_correct
+    times.sort()
+    medians = [statistics.median_low(sorted(entry[2])) for entry in per_player.values()]
+    return {
+        'accuracy': correct_total / len(rows) * 100,
+        'p95': times[int(0.95 * (len(times) - 1))],
+        'players': len(per_player),
+        'median_time_mean': sum(medians) / len(medians),
+    }
+
+
+def timed(fn, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--answers', type=int, default=1_000_000)
+    parser.add_argument('--players', type=int, default=5_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='Path for the JSON results (default: benchmarks/results/analytics.json)')
+    args = parser.parse_args()
+
+    _django.setup()
+    from apps.gameplay import analytics
+
+    rng = np.random.default_rng(2026)
+    player_ids = rng.integers(1, args.players + 1, size=args.answers)
+    is_correct = rng.random(args.answers) < 0.6
+    time_taken = rng.gamma(2.0, 3.0, size=args.answers).round(2)
+    rows = list(zip(player_ids.tolist(), is_correct.tolist(), time_taken.tolist()))
+
+    def to_arrays(rows):
+        flat = np.fromiter(chain.from_iterable(rows), dtype=np.float64).reshape(-1, 3)
+        return flat[:, 0].astype(np.int64), flat[:, 1].astype(bool), flat[:, 2]
+
+    convert_time, arrays = timed(to_arrays, rows, repeat=args.repeat)
+    numpy_time, numpy_stats = timed(analytics.summarise_answers, *arrays, repeat=args.repeat)
+    python_time, python_stats = timed(python_summary, rows, repeat=args.repeat)
+
+    results = {
+        'answers': args.answers,
+        'players': args.players,
+        'rows_to_arrays_seconds': round(convert_time, 4),
+        'numpy_summary_seconds': round(numpy_time, 4),
+        'python_loop_seconds': round(python_time, 4),
+        'speedup': round(python_time / (convert_time + numpy_time), 1),
+        'check': {
+            'numpy_accuracy': numpy_stats['accuracy'],
+            'python_accuracy': round(python_stats['accuracy'], 2),
+            'numpy_players': numpy_stats['total_players'],
+            'python_players': python_stats['players'],
+        },
+    }
+    path = _django.save_results('analytics', results, args.output)
+    for key, value in results.items():
+        print(f'{key:>24}: {value}')
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
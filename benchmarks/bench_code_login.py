@@ -0,0 +1,87 @@
+"""
+Code-login latency benchmark.
+
+Replays POST /api/auth/code-login/ for a pool of registered players through
+the full middleware stack and reports latency percentiles and queries per
+login, for both valid and unknown codes.
+
+    python -m benchmarks.bench_code_login --players 200 --logins 2000
+"""
+import argparse
+import logging
+import random
+import time
+import uuid
+
+from benchmarks import _django
+
+
+def seed(players):
+    from apps.accounts.models import Player
+
+    tag = uuid.uuid4().hex[:6].upper()
+    created = Player.objects.bulk_create([
+        Player(email=f'login{i}.{tag}@bench.example.com', name=f'Attendee {i}',
+               unique_code=f'L{tag}{i:05d}'[:12], password='!')
+        for i in range(players)
+    ])
+    return [player.unique_code for player in created]
+
+
+def replay(client, codes, logins):
+    from django.db import connection
+
+    latencies, queries = [], []
+    for _ in range(logins):
+        counter = _django.QueryCounter()
+        code = random.choice(codes)
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = client.post('/api/auth/code-login/', {'unique_code': code}, content_type='application/json')
+        latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(counter.count)
+        assert response.status_code in (200, 400), response.status_code
+    return {
+        'latency_ms': _django.latency_summary(latencies),
+        'queries_per_login': round(sum(queries) / len(queries), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=200)
+    parser.add_argument('--logins', type=int, default=2000)
+    parser.add_argument('--database-url', help='Defaults to a throwaway SQLite file')
+    parser.add_argument('--output', help='Path for the JSON results (default: benchmarks/results/code_login.json)')
+    args = parser.parse_args()
+
+    _django.setup(args.database_url)
+    from django.conf import settings
+    from django.test import Client
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    settings.PROFILING_ENABLED = False
+    # Keep the console quiet; the file handler still runs, as in production.
+    for handler in logging.getLogger('accounts.login').handlers:
+        if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
+            handler.setLevel(logging.CRITICAL)
+    _django.migrate()
+
+    codes = seed(args.players)
+    client = Client()
+    client.post('/api/auth/code-login/', {'unique_code': codes[0]}, content_type='application/json')
+
+    results = {
+        'revision': _django.git_revision(),
+        'logins': args.logins,
+        'valid_codes': replay(client, codes, args.logins),
+        'unknown_codes': replay(client, ['ZZZZZZZZ'], args.logins // 4),
+    }
+    path = _django.save_results('code_login', results, args.output)
+    for key, value in results.items():
+        print(f'{key:>14}: {value}')
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Cold-start benchmark for the WSGI entry point.
+
+Boots ``nbcc_backend.wsgi`` in fresh interpreters, once per settings
+module, and reports:
+
+* boot time: importing the module and building the WSGI application
+  (what every gunicorn worker and Vercel cold start pays)
+* first-request time: the first GET through the stack, which loads the
+  URLconf and view modules
+* an ``-X importtime`` breakdown of the slowest top-level packages
+
+    python -m benchmarks.bench_cold_start --runs 5
+    python -m benchmarks.bench_cold_start --settings nbcc_backend.settings nbcc_backend.settings_wsgi
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+from benchmarks import _django
+
+BOOT_SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+from nbcc_backend.wsgi import application
+booted = time.perf_counter()
+from django.conf import settings
+settings.ALLOWED_HOSTS = ['testserver']
+from django.test import Client
+response = Client().get('/api/gameplay/quiz_questions/')
+first = time.perf_counter()
+print(json.dumps({
+    'boot_ms': (booted - start) * 1000,
+    'first_request_ms': (first - booted) * 1000,
+    'status': response.status_code,
+    'modules': len(sys.modules),
+}))
+"""
+
+
+def run_once(settings_module, database_url, importtime=False):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module, DATABASE_URL=database_url)
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', BOOT_SCRIPT]
+    completed = subprocess.run(command, cwd=_django.BASE_DIR, env=env, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1]), completed.stderr
+
+
+def import_breakdown(stderr, top):
+    """Cumulative import time (ms) per top-level package, from -X importtime output."""
+    totals = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace('import time:', '|').split('|'))
+        # Self time summed per top-level package is exact; cumulative would double count.
+        totals[name.split('.')[0]] += int(self_us)
+    return {name: round(us / 1000, 1) for name, us in totals.most_common(top)}
+
+
+def profile(settings_module, database_url, runs, top):
+    samples = [run_once(settings_module, database_url)[0] for _ in range(runs)]
+    _, stderr = run_once(settings_module, database_url, importtime=True)
+    result = {
+        'boot_ms': round(statistics.median(s['boot_ms'] for s in samples), 1),
+        'first_request_ms': round(statistics.median(s['first_request_ms'] for s in samples), 1),
+        'modules_loaded': samples[-1]['modules'],
+        'first_request_status': samples[-1]['status'],
+        'slowest_packages_ms': import_breakdown(stderr, top),
+    }
+    print(f"{settings_module}: boot {result['boot_ms']} ms, first request {result['first_request_ms']} ms, "
+          f"{result['modules_loaded']} modules")
+    for name, ms in result['slowest_packages_ms'].items():
+        print(f'    {name:<28} {ms:>8} ms')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', nargs='+', default=['nbcc_backend.settings', 'nbcc_backend.settings_wsgi'])
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per settings module')
+    parser.add_argument('--top', type=int, default=12, help='Packages listed in the import breakdown')
+    parser.add_argument('--database-url', help='Defaults to a throwaway SQLite file')
+    parser.add_argument('--output', help='Path for the JSON results (default: benchmarks/results/cold_start.json)')
+    args = parser.parse_args()
+
+    _django.setup(args.database_url)
+    _django.migrate()
+    database_url = os.environ['DATABASE_URL']
+
+    results = {
+        'revision': _django.git_revision(),
+        'python': sys.version.split()[0],
+        'runs': args.runs,
+        'profiles': {module: profile(module, database_url, args.runs, args.top) for module in args.settings},
+    }
+    path = _django.save_results('cold_start', results, args.output)
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+WebSocket leaderboard load benchmark.
+
+Opens 100, 500 and 2000 concurrent ws/leaderboard/ sockets with Channels'
+WebsocketCommunicator against a seeded challenge while a background writer
+submits answers, and reports for each level:
+
+* DB queries per second issued by the consumers and the writer
+* event-loop lag (how late a 50 ms timer fires)
+* memory per connection (tracemalloc, after every socket got its first frame)
+* latency from an answer being inserted to each client receiving the update
+* the most DB connections the consumers' executor held at once
+
+    python -m benchmarks.bench_leaderboard_ws --levels 100 500 2000 --duration 15
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+import tracemalloc
+import uuid
+
+from benchmarks import _django
+
+LAG_INTERVAL = 0.05
+
+
+class GlobalQueryCounter:
+    """
+    Counts queries from every thread. Consumers run their queries in the
+    database_sync_to_async executor, so a per-connection execute_wrapper
+    would miss them; the cursor class is wrapped instead.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def install(self):
+        from django.db.backends import utils
+
+        original = utils.CursorWrapper._execute
+        counter = self
+
+        def counted(self, *args, **kwargs):
+            with counter._lock:
+                counter.count += 1
+            return original(self, *args, **kwargs)
+
+        utils.CursorWrapper._execute = counted
+
+
+def seed(players, answered):
+    from django.db import transaction
+    from apps.accounts.models import Player
+    from apps.gameplay.models import Challenge
+    from apps.gameplay.quiz_stats import QuizStat
+
+    tag = uuid.uuid4().hex[:6].upper()
+    with transaction.atomic():
+        Challenge.objects.filter(is_active=True).update(is_active=False)
+        challenge = Challenge.objects.create(name='Leaderboard socket benchmark')
+        created = Player.objects.bulk_create([
+            Player(email=f'ws{i}.{tag}@bench.example.com', name=f'Viewer {i}',
+                   unique_code=f'W{tag}{i:05d}', password='!')
+            for i in range(players)
+        ])
+        QuizStat.objects.bulk_create([
+            QuizStat(user=player, challenge=challenge, question_id=1, is_correct=i % 3 != 0, time_taken=5.0 + i)
+            for i, player in enumerate(created[:answered])
+        ])
+    return challenge, created[answered:]
+
+
+async def measure_lag(stop, samples):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + LAG_INTERVAL
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append((loop.time() - expected) * 1000)
+
+
+async def write_answers(challenge, idle_players, base_size, interval, stop, inserted_at):
+    """Each insert adds a new player, so the leaderboard grows by one row."""
+    from channels.db import database_sync_to_async
+    from apps.gameplay.quiz_stats import QuizStat
+
+    @database_sync_to_async
+    def insert(player):
+        QuizStat.objects.create(user=player, challenge=challenge, question_id=1, is_correct=True, time_taken=1.0)
+
+    for offset, player in enumerate(idle_players, start=1):
+        if stop.is_set():
+            break
+        await insert(player)
+        inserted_at[base_size + offset] = time.perf_counter()
+        await asyncio.sleep(interval)
+
+
+async def receive_updates(communicator, base_size, inserted_at, latencies):
+    """Every insert a frame reveals for the first time counts once per client."""
+    seen = base_size
+    while True:
+        message = json.loads(await communicator.receive_from(timeout=3600))
+        received = time.perf_counter()
+        if message.get('type') == 'ping':
+            # Answer heartbeats like a live client, which also acknowledges the frames read so far.
+            await communicator.send_to(text_data=json.dumps({'type': 'pong', 'seq': message['seq']}))
+            continue
+        size = len(message.get('leaderboard') or [])
+        for revealed in range(seen + 1, size + 1):
+            if revealed in inserted_at:
+                latencies.append((received - inserted_at[revealed]) * 1000)
+        seen = max(seen, size)
+
+
+async def run_level(application, viewers, duration, interval, counter):
+    from channels.db import database_sync_to_async
+    from channels.testing import WebsocketCommunicator
+    from apps.gameplay.db_executor import consumer_db
+
+    challenge, idle_players = await database_sync_to_async(seed)(viewers + 200, viewers // 2)
+    base_size = viewers // 2
+
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    communicators = [WebsocketCommunicator(application, '/ws/leaderboard/') for _ in range(viewers)]
+    await asyncio.gather(*(communicator.connect(timeout=120) for communicator in communicators))
+    await asyncio.gather(*(communicator.receive_from(timeout=120) for communicator in communicators))
+    memory_per_connection = (tracemalloc.get_traced_memory()[0] - memory_before) / viewers
+    tracemalloc.stop()
+
+    stop = asyncio.Event()
+    inserted_at, latencies, lag = {}, [], []
+    receivers = [asyncio.create_task(receive_updates(c, base_size, inserted_at, latencies)) for c in communicators]
+    lag_task = asyncio.create_task(measure_lag(stop, lag))
+    queries_before = counter.count
+    started = time.perf_counter()
+    writer = asyncio.create_task(write_answers(challenge, idle_players, base_size, interval, stop, inserted_at))
+
+    await asyncio.sleep(duration)
+    stop.set()
+    elapsed = time.perf_counter() - started
+    queries = counter.count - queries_before
+
+    writer.cancel()
+    for task in receivers:
+        task.cancel()
+    await asyncio.gather(writer, lag_task, *receivers, return_exceptions=True)
+    await asyncio.gather(*(communicator.disconnect() for communicator in communicators), return_exceptions=True)
+    connections_peak = consumer_db.peak_connections
+    consumer_db.shutdown()
+
+    result = {
+        'viewers': viewers,
+        'inserts': len(inserted_at),
+        'db_queries_per_second': round(queries / elapsed, 1),
+        'event_loop_lag_ms': _django.latency_summary(lag),
+        'memory_per_connection_kib': round(memory_per_connection / 1024, 1),
+        'insert_to_client_ms': _django.latency_summary(latencies),
+        'consumer_db_connections_peak': connections_peak,
+    }
+    print(f"{viewers:>6} viewers: {result['db_queries_per_second']} q/s, "
+          f"lag p95 {result['event_loop_lag_ms'].get('p95')} ms, "
+          f"{result['memory_per_connection_kib']} KiB/conn, "
+          f"update p95 {result['insert_to_client_ms'].get('p95')} ms, "
+          f"{connections_peak} consumer DB connections")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--levels', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--duration', type=float, default=15.0, help='Seconds of writer traffic per level')
+    parser.add_argument('--write-interval', type=float, default=0.1, help='Seconds between inserted answers')
+    parser.add_argument('--consumer-db-workers', type=int, help='Overrides GAMEPLAY_CONSUMER_DB_WORKERS')
+    parser.add_argument('--database-url', help='Defaults to a throwaway SQLite file')
+    parser.add_argument('--output', help='Path for the JSON results (default: benchmarks/results/leaderboard_ws.json)')
+    args = parser.parse_args()
+
+    _django.setup(args.database_url)
+    from django.conf import settings
+    from django.db import connection
+
+    if args.consumer_db_workers:
+        settings.GAMEPLAY_CONSUMER_DB_WORKERS = args.consumer_db_workers
+    if connection.vendor == 'sqlite':
+        settings.DATABASES['default'].setdefault('OPTIONS', {})['timeout'] = 30
+    _django.migrate()
+
+    from channels.routing import URLRouter
+    from apps.gameplay.routing import websocket_urlpatterns
+
+    counter = GlobalQueryCounter()
+    counter.install()
+    application = URLRouter(websocket_urlpatterns)
+
+    async def run_all():
+        return [await run_level(application, viewers, args.duration, args.write_interval, counter)
+                for viewers in args.levels]
+
+    results = {
+        'revision': _django.git_revision(),
+        'database': connection.vendor,
+        'duration_seconds': args.duration,
+        'write_interval_seconds': args.write_interval,
+        'consumer_db_workers': settings.GAMEPLAY_CONSUMER_DB_WORKERS,
+        'levels': asyncio.run(run_all()),
+    }
+    path = _django.save_results('leaderboard_ws', results, args.output)
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
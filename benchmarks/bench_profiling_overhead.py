@@ -0,0 +1,63 @@
+"""
+Measure the overhead of RequestProfilingMiddleware at different sample rates.
+
+Drives a cheap read endpoint through the full middleware stack with the
+Django test client and compares mean request time against profiling off.
+
+    python -m benchmarks.bench_profiling_overhead --requests 5000
+"""
+import argparse
+import time
+
+from benchmarks import _django
+
+
+def run(url, requests, repeat=3, **overrides):
+    """Best-of-``repeat`` mean request time in seconds."""
+    from django.test import Client, override_settings
+
+    with override_settings(DEBUG=False, ALLOWED_HOSTS=['testserver'], **overrides):
+        client = Client()
+        client.get(url)  # Load the middleware chain outside the timed loop
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(requests):
+                client.get(url)
+            mean = (time.perf_counter() - start) / requests
+            best = mean if best is None else min(best, mean)
+        return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--output', help='Path for the JSON results')
+    args = parser.parse_args()
+
+    _django.setup()
+    _django.migrate()
+    from django.urls import reverse
+    from apps.gameplay.models import Challenge
+
+    if not Challenge.objects.exists():
+        Challenge.objects.create(name='Benchmark')
+    url = reverse('get_challenges')
+
+    baseline = run(url, args.requests, PROFILING_ENABLED=False)
+    results = {'requests': args.requests, 'baseline_ms': round(baseline * 1000, 4)}
+    for rate in (0.01, 0.1, 1.0):
+        mean = run(url, args.requests, PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=rate)
+        results[f'sample_{rate}'] = {
+            'mean_ms': round(mean * 1000, 4),
+            'overhead_pct': round((mean - baseline) / baseline * 100, 2),
+        }
+
+    path = _django.save_results('profiling_overhead', results, args.output)
+    for key, value in results.items():
+        print(f'{key:>14}: {value}')
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Registration throughput benchmark.
+
+Sends POST /api/auth/register/ sequentially through the full middleware
+stack, the way one synchronous gunicorn worker serves them, and reports
+registrations per second and latency percentiles for:
+
+* code_only - the current behaviour: players get an unusable password
+* hashed    - the previous behaviour: a random password is run through the
+              configured hasher (PBKDF2 by default) for every player
+
+    python -m benchmarks.bench_registration --registrations 200
+"""
+import argparse
+import time
+import uuid
+from unittest import mock
+
+from benchmarks import _django
+
+
+def _hash_random_password(player):
+    player.set_password(uuid.uuid4().hex)
+
+
+def register(client, count, tag):
+    latencies = []
+    start = time.perf_counter()
+    for i in range(count):
+        payload = {'name': f'Attendee {i}', 'email': f'reg{i}.{tag}@bench.example.com', 'organization': 'NBCC'}
+        request_start = time.perf_counter()
+        response = client.post('/api/auth/register/', payload, content_type='application/json')
+        latencies.append((time.perf_counter() - request_start) * 1000)
+        assert response.status_code == 201, response.content
+    wall = time.perf_counter() - start
+    return {
+        'registrations': count,
+        'per_second': round(count / wall, 1),
+        'latency_ms': _django.latency_summary(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--registrations', type=int, default=200)
+    parser.add_argument('--database-url', help='Defaults to a throwaway SQLite file')
+    parser.add_argument('--output', help='Path for the JSON results (default: benchmarks/results/registration.json)')
+    args = parser.parse_args()
+
+    _django.setup(args.database_url)
+    from django.conf import settings
+    from django.test import Client
+
+    from apps.accounts.code_pool import refill_pool
+    from apps.accounts.models import Player
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    settings.PROFILING_ENABLED = False
+    _django.migrate()
+    # Both modes claim pooled codes, so the comparison isolates the hash.
+    refill_pool(args.registrations * 2 + 10)
+
+    client = Client()
+    run = uuid.uuid4().hex[:8]
+    register(client, 1, f'warmup{run}')
+
+    results = {'revision': _django.git_revision(), 'hasher': settings.PASSWORD_HASHERS[0]}
+    with mock.patch.object(Player, 'set_unusable_password', _hash_random_password):
+        results['hashed'] = register(client, args.registrations, f'hashed{run}')
+    results['code_only'] = register(client, args.registrations, f'code{run}')
+    results['speedup'] = round(results['code_only']['per_second'] / results['hashed']['per_second'], 1)
+
+    path = _django.save_results('registration', results, args.output)
+    for key in ('hashed', 'code_only'):
+        print(f"{key:>10}: {results[key]['per_second']} registrations/s, "
+              f"p95 {results[key]['latency_ms'].get('p95')} ms")
+    print(f"   speedup: {results['speedup']}x")
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+"""
+Event-day load test.
+
+Seeds a realistic event (players registered through RegistrationSerializer,
+an active Challenge and a question bank) and then drives the real URL routes
+concurrently, phase by phase, in the order an event actually unfolds:
+
+    1. code-login burst      POST /api/auth/code-login/
+    2. question packs        GET  /api/gameplay/quiz_questions/
+    3. submit_answer storm   POST /api/gameplay/submit_answer/
+    4. bulk game answers     POST /api/gameplay/game-answers/bulk/
+    5. player-stats reads    GET  /api/gameplay/player-stats/
+
+Each phase reports throughput, p50/p95/p99 latency, error count and queries
+per request. Results are written as JSON (tagged with the git revision) so
+runs can be compared between commits.
+
+    python -m benchmarks.event_day --players 300 --concurrency 16
+    python -m benchmarks.event_day --database-url postgres://localhost/nbcc_bench
+    python -m benchmarks.event_day --no-tokens   # answers checked against the database
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import _django
+
+
+def seed(players, questions):
+    from django.db import transaction
+    from apps.accounts.serializers import RegistrationSerializer
+    from apps.gameplay.models import Challenge, Question
+
+    with transaction.atomic():
+        Question.objects.bulk_create([
+            Question(text=f'Benchmark question {i}', correct_answer=f'Answer {i % 4}') for i in range(questions)
+        ])
+        Challenge.objects.filter(is_active=True).update(is_active=False)
+        challenge = Challenge.objects.create(name='Event day benchmark')
+
+    run_id = int(time.time())
+    codes = []
+    for i in range(players):
+        serializer = RegistrationSerializer(data={
+            'name': f'Attendee {i}',
+            'email': f'attendee{i}.{run_id}@bench.example.com',
+            'organization': 'NBCC',
+            'location': random.choice(['Lagos', 'Abuja', 'Kano', 'Port Harcourt']),
+        })
+        serializer.is_valid(raise_exception=True)
+        codes.append(serializer.save().unique_code)
+
+    question_ids = list(Question.objects.values_list('id', flat=True))
+    return challenge, codes, question_ids
+
+
+def _run_task(task):
+    """Execute one request through the test client and measure it."""
+    from django.db import connection
+    from django.test import Client
+
+    method, url, payload, headers = task
+    client = Client()
+    counter = _django.QueryCounter()
+    start = time.perf_counter()
+    with connection.execute_wrapper(counter):
+        if method == 'get':
+            response = client.get(url, payload, **headers)
+        else:
+            response = client.post(url, payload, content_type='application/json', **headers)
+    elapsed = (time.perf_counter() - start) * 1000
+    body = response.json() if response.get('Content-Type', '').startswith('application/json') else None
+    return elapsed, counter.count, response.status_code, body
+
+
+def _close_connection(_):
+    from django.db import connection
+    connection.close()
+
+
+def run_phase(name, tasks, concurrency):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(_run_task, tasks))
+        # Each worker thread opened its own connection; release them.
+        list(pool.map(_close_connection, range(concurrency)))
+    wall = time.perf_counter() - start
+
+    latencies = [outcome[0] for outcome in outcomes]
+    queries = [outcome[1] for outcome in outcomes]
+    errors = sum(1 for outcome in outcomes if outcome[2] >= 400)
+    summary = {
+        'requests': len(outcomes),
+        'errors': errors,
+        'wall_seconds': round(wall, 3),
+        'throughput_rps': round(len(outcomes) / wall, 1) if wall else None,
+        'latency_ms': _django.latency_summary(latencies),
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else 0,
+        'max_queries': max(queries) if queries else 0,
+    }
+    print(f"{name:>18}: {summary['requests']} req, {summary['throughput_rps']} rps, "
+          f"p95 {summary['latency_ms'].get('p95')} ms, {summary['queries_per_request']} q/req, "
+          f"{errors} errors")
+    return summary, outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=200)
+    parser.add_argument('--questions', type=int, default=40)
+    parser.add_argument('--answers-per-player', type=int, default=10)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--database-url', help='Defaults to a throwaway SQLite file')
+    parser.add_argument('--output', help='Path for the JSON results (default: benchmarks/results/event_day.json)')
+    parser.add_argument('--no-tokens', action='store_true',
+                        help='Submit answers without the question-pack token (checked against the database)')
+    parser.add_argument('--throttle', action='store_true',
+                        help='Keep the write throttles on (every simulated player shares one client IP)')
+    args = parser.parse_args()
+
+    _django.setup(args.database_url)
+    from django.conf import settings
+    from django.db import connection
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    settings.GAMEPLAY_THROTTLE_ENABLED = args.throttle
+    if connection.vendor == 'sqlite':
+        # Writers queue on SQLite's database lock instead of failing fast.
+        settings.DATABASES['default'].setdefault('OPTIONS', {})['timeout'] = 30
+    _django.migrate()
+
+    started = time.perf_counter()
+    challenge, codes, question_ids = seed(args.players, args.questions)
+    seed_seconds = time.perf_counter() - started
+    print(f'Seeded {len(codes)} players and {len(question_ids)} questions in {seed_seconds:.1f}s')
+
+    phases = {}
+
+    phases['code_login'], outcomes = run_phase(
+        'code_login',
+        [('post', '/api/auth/code-login/', {'unique_code': code}, {}) for code in codes],
+        args.concurrency,
+    )
+    tokens = {
+        code: outcome[3]['access']
+        for code, outcome in zip(codes, outcomes)
+        if outcome[2] == 200 and outcome[3]
+    }
+
+    phases['quiz_questions'], outcomes = run_phase(
+        'quiz_questions',
+        [('get', '/api/gameplay/quiz_questions/', {}, {}) for _ in codes],
+        args.concurrency,
+    )
+    packs = [outcome[3] for outcome in outcomes]
+
+    answers = []
+    for code, pack in zip(codes, packs):
+        if args.no_tokens or not pack:
+            served = random.sample(question_ids, min(args.answers_per_player, len(question_ids)))
+            extra = {'challenge_id': challenge.id}
+            # Without a token nothing ties time_taken to when the pack was served.
+            timing = (1, 15)
+        else:
+            served = [question['id'] for question in pack['questions']][:args.answers_per_player]
+            extra = {'token': pack['token']}
+            # Answers are checked against the token, which refuses times longer than the pack has been out.
+            timing = (0.1, 1.5)
+        for question_id in served:
+            answers.append(('post', '/api/gameplay/submit_answer/', {
+                'user_id': code,
+                'question_id': question_id,
+                'answer': f'Answer {random.randint(0, 3)}',
+                'time_taken': round(random.uniform(*timing), 2),
+                **extra,
+            }, {}))
+    random.shuffle(answers)
+    phases['submit_answer'], _ = run_phase('submit_answer', answers, args.concurrency)
+
+    def auth(code):
+        return {'HTTP_AUTHORIZATION': f'Bearer {tokens[code]}'} if code in tokens else {}
+
+    bulk = []
+    for code in codes:
+        bulk.append(('post', '/api/gameplay/game-answers/bulk/', {
+            'player_code': code,
+            'game_type': 'jigsaw',
+            'answers_data': {'puzzle_size': '4x4', 'total_pieces': 16, 'correct_pieces': 16, 'is_correct': True},
+            'is_correct': True,
+            'time_taken_seconds': round(random.uniform(30, 120), 1),
+        }, auth(code)))
+        bulk.append(('post', '/api/gameplay/game-answers/bulk/', {
+            'player_code': code,
+            'game_type': 'drag_drop',
+            'answers_data': {'set_a': {'results': []}, 'set_b': {'results': []}},
+            'set_a_score': random.randint(0, 30), 'set_a_total': 30,
+            'set_b_score': random.randint(0, 30), 'set_b_total': 30,
+            'time_taken_seconds': round(random.uniform(60, 240), 1),
+        }, auth(code)))
+    random.shuffle(bulk)
+    phases['bulk_game_answers'], _ = run_phase('bulk_game_answers', bulk, args.concurrency)
+
+    phases['player_stats'], _ = run_phase(
+        'player_stats',
+        [('get', '/api/gameplay/player-stats/', {'player_code': code}, auth(code)) for code in codes],
+        args.concurrency,
+    )
+
+    results = {
+        'revision': _django.git_revision(),
+        'database': connection.vendor,
+        'players': args.players,
+        'questions': args.questions,
+        'answers_per_player': args.answers_per_player,
+        'concurrency': args.concurrency,
+        'throttle': args.throttle,
+        'tokens': not args.no_tokens,
+        'seed_seconds': round(seed_seconds, 2),
+        'phases': phases,
+    }
+    path = _django.save_results('event_day', results, args.output)
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
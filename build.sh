@@ -6,5 +6,8 @@ pip install -r requirements.txt
 # Collect static files
 python manage.py collectstatic --noinput
 
+# Prebuild the OpenAPI schema so /swagger.json never generates it per request
+python manage.py build_api_schema
+
 # Run migrations (optional - be careful with this in production)
 # python manage.py migrate --noinput
@@ -14,6 +14,7 @@ pip install -r requirements.txt
 # Collect static files
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
+python manage.py build_api_schema
 
 # Run database migrations
 echo "Running database migrations..."
@@ -0,0 +1,149 @@
+"""
+OpenAPI schema and documentation pages.
+
+drf_yasg introspects every view and serializer to build the schema, which
+is far too slow to repeat on every hit. The schema is built once, either by
+``manage.py build_api_schema`` at deploy time (written under STATIC_ROOT, so
+WhiteNoise can serve it too) or on first access, and then served from memory
+with an ETag so clients revalidate with a 304.
+
+drf_yasg is only imported when the schema or a docs page is actually
+needed, so it adds nothing to worker start-up. View modules take
+``swagger_auto_schema`` and ``openapi`` from here rather than from drf_yasg:
+where drf_yasg isn't in INSTALLED_APPS (settings_wsgi) the decorator leaves
+views untouched and never imports it. Those processes serve the artifact
+built by manage.py under the full settings; a schema they generate
+themselves (DEBUG, or no artifact) lacks the per-view overrides.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.views.decorators.http import condition, require_GET
+
+SCHEMA_TITLE = 'NBCC Strategy Games API'
+SCHEMA_VERSION = 'v1'
+SCHEMA_DESCRIPTION = 'API documentation for NBCC Games (auth, gameplay, leaderboard, etc.)'
+
+CACHE_CONTROL = 'public, max-age=300'
+
+_lock = threading.Lock()
+_schema = {}
+
+
+def _drf_yasg_installed():
+    return 'drf_yasg' in settings.INSTALLED_APPS
+
+
+def swagger_auto_schema(**kwargs):
+    """drf_yasg's swagger_auto_schema, or a no-op decorator where drf_yasg isn't installed."""
+    if not _drf_yasg_installed():
+        return lambda view: view
+    from drf_yasg.utils import swagger_auto_schema as decorate
+
+    return decorate(**kwargs)
+
+
+class _OpenAPI:
+    """
+    drf_yasg.openapi, imported on first attribute access. Where drf_yasg
+    isn't installed every attribute and call gives back this object, which
+    the no-op swagger_auto_schema then discards.
+    """
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if not _drf_yasg_installed():
+            return self
+        from drf_yasg import openapi as module
+
+        return getattr(module, name)
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+
+openapi = _OpenAPI()
+
+
+def generate_schema():
+    """Run drf_yasg's generator over the URLconf and return the JSON bytes."""
+    from drf_yasg import openapi
+    from drf_yasg.codecs import OpenAPICodecJson
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    info = openapi.Info(title=SCHEMA_TITLE, default_version=SCHEMA_VERSION, description=SCHEMA_DESCRIPTION)
+    schema = OpenAPISchemaGenerator(info).get_schema(request=None, public=True)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def _load():
+    """The schema bytes and ETag; built (or read from the artifact) once per process."""
+    if 'json' not in _schema:
+        with _lock:
+            if 'json' not in _schema:
+                artifact = settings.API_SCHEMA_FILE
+                # In DEBUG always regenerate so edited views show up after a restart.
+                if not settings.DEBUG and artifact.exists():
+                    content = artifact.read_bytes()
+                else:
+                    content = generate_schema()
+                _schema['etag'] = '"%s"' % hashlib.sha256(content).hexdigest()[:32]
+                _schema['json'] = content
+    return _schema
+
+
+def _yaml():
+    if 'yaml' not in _schema:
+        from drf_yasg.codecs import yaml_sane_dump
+
+        spec = json.loads(_load()['json'], object_pairs_hook=OrderedDict)
+        _schema['yaml'] = yaml_sane_dump(spec, binary=True)
+    return _schema['yaml']
+
+
+def reset_schema():
+    """Drop the in-memory copy (used by tests and build_api_schema)."""
+    with _lock:
+        _schema.clear()
+
+
+@require_GET
+@condition(etag_func=lambda request, format=None: _load()['etag'])
+def schema_view(request, format='.json'):
+    """GET /swagger.json or /swagger.yaml"""
+    if format == '.yaml':
+        response = HttpResponse(_yaml(), content_type='application/yaml; charset=utf-8')
+    else:
+        response = HttpResponse(_load()['json'], content_type='application/json; charset=utf-8')
+    response['Cache-Control'] = CACHE_CONTROL
+    return response
+
+
+def _docs_page(request, renderer_class):
+    renderer = renderer_class()
+    context = {'request': request}
+    renderer.set_context(context)
+    context.update(title=SCHEMA_TITLE, version=SCHEMA_VERSION)
+    return HttpResponse(render_to_string(renderer.template, context, request))
+
+
+@require_GET
+def swagger_ui_view(request):
+    """GET /swagger/ - Swagger UI; the page fetches the cached schema from /swagger.json."""
+    from drf_yasg.renderers import SwaggerUIRenderer
+
+    return _docs_page(request, SwaggerUIRenderer)
+
+
+@require_GET
+def redoc_view(request):
+    """GET /redoc/ - ReDoc; the page fetches the cached schema from /swagger.json."""
+    from drf_yasg.renderers import ReDocRenderer
+
+    return _docs_page(request, ReDocRenderer)
@@ -0,0 +1,228 @@
+"""
+Per-endpoint request profiling exported in Prometheus text format.
+
+RequestProfilingMiddleware records, per resolved URL name, the wall time,
+number of DB queries and time spent in them, response render
+(serialisation) time and response size. Observations go into fixed-bucket
+histograms, so memory is bounded by the number of URL names. Views that
+declare a query budget (apps/gameplay/query_budget.py) are also checked
+against it and overruns are logged.
+
+Only a sample of requests is profiled (PROFILING_SAMPLE_RATE); the rest pay
+for a single random() call. Metrics are per worker process, so with several
+gunicorn workers each one reports its own figures.
+"""
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden
+
+from apps.gameplay.query_budget import budget_for
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+UNRESOLVED = '<unresolved>'
+
+
+class Histogram:
+    """Cumulative-style histogram keyed by URL name (or another ``label``)."""
+
+    def __init__(self, name, help_text, buckets, label='view'):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.label = label
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, label, value):
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                series = self._series[label] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bucket] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {label: (list(counts), total, count) for label, (counts, total, count) in self._series.items()}
+        for label in sorted(series):
+            counts, total, count = series[label]
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{self.label}="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{self.label}="{label}",le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{self.label}="{label}"}} {total}')
+            lines.append(f'{self.name}_count{{{self.label}="{label}"}} {count}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label='view'):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, label):
+        with self._lock:
+            self._values[label] = self._values.get(label, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            values = dict(self._values)
+        for label in sorted(values):
+            lines.append(f'{self.name}{{{self.label}="{label}"}} {values[label]}')
+        return lines
+
+
+class Gauge(Counter):
+    """A labelled value that is set rather than incremented."""
+
+    def set(self, label, value):
+        with self._lock:
+            self._values[label] = value
+
+    def render(self):
+        lines = super().render()
+        lines[1] = f'# TYPE {self.name} gauge'
+        return lines
+
+
+REQUEST_DURATION = Histogram('nbcc_request_duration_seconds', 'Wall time of sampled requests.', DURATION_BUCKETS)
+DB_QUERIES = Histogram('nbcc_db_queries_per_request', 'DB queries issued by sampled requests.', QUERY_COUNT_BUCKETS)
+DB_DURATION = Histogram('nbcc_db_duration_seconds', 'Time spent in DB queries per sampled request.', DURATION_BUCKETS)
+RENDER_DURATION = Histogram('nbcc_render_duration_seconds', 'Response rendering (serialisation) time.', DURATION_BUCKETS)
+RESPONSE_SIZE = Histogram('nbcc_response_size_bytes', 'Response body size of sampled requests.', SIZE_BUCKETS)
+SAMPLED_REQUESTS = Counter('nbcc_sampled_requests_total', 'Requests profiled by RequestProfilingMiddleware.')
+
+# Fed by the WebSocket consumers' DB executor (apps/gameplay/db_executor.py).
+CONSUMER_DB_CONNECTIONS = Gauge('nbcc_consumer_db_connections_open',
+                                'DB connections held by consumer executor threads.', label='alias')
+CONSUMER_DB_CONNECTS = Counter('nbcc_consumer_db_connects_total',
+                               'New DB connections opened by consumer executor threads.', label='alias')
+CONSUMER_DB_WAIT = Histogram('nbcc_consumer_db_wait_seconds',
+                             'Time consumer DB calls queued for a free executor thread.', DURATION_BUCKETS, label='call')
+CONSUMER_DB_QUERY_DURATION = Histogram('nbcc_consumer_db_query_duration_seconds',
+                                       'Latency of individual queries issued by consumers.', DURATION_BUCKETS,
+                                       label='call')
+
+# Fed by the WebSocket consumers' outboxes (apps/gameplay/outbound.py).
+WS_FRAMES_SENT = Counter('nbcc_ws_frames_sent_total', 'Frames written to WebSocket clients.', label='stream')
+WS_FRAMES_DROPPED = Counter('nbcc_ws_frames_dropped_total',
+                            'Frames superseded by a newer snapshot, or pushed out of a full event queue, '
+                            'before they were sent.', label='stream')
+WS_SOCKETS_REAPED = Counter('nbcc_ws_sockets_reaped_total',
+                            'WebSockets closed for not answering heartbeat pings.', label='stream')
+
+REGISTRY = (SAMPLED_REQUESTS, REQUEST_DURATION, DB_QUERIES, DB_DURATION, RENDER_DURATION, RESPONSE_SIZE,
+            CONSUMER_DB_CONNECTIONS, CONSUMER_DB_CONNECTS, CONSUMER_DB_WAIT, CONSUMER_DB_QUERY_DURATION,
+            WS_FRAMES_SENT, WS_FRAMES_DROPPED, WS_SOCKETS_REAPED)
+
+
+class _QueryTimer:
+    """connection.execute_wrapper hook counting queries and their total time."""
+
+    __slots__ = ('count', 'duration')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class RequestProfilingMiddleware:
+    """Samples requests and feeds the per-endpoint histograms above."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PROFILING_ENABLED', True)
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 1.0)
+
+    def __call__(self, request):
+        if not self.enabled or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timer = _QueryTimer()
+        request._profiling_render_time = 0.0
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = request.resolver_match
+        label = (match.url_name or match.view_name) if match else UNRESOLVED
+        SAMPLED_REQUESTS.inc(label)
+        REQUEST_DURATION.observe(label, elapsed)
+        DB_QUERIES.observe(label, timer.count)
+        DB_DURATION.observe(label, timer.duration)
+        RENDER_DURATION.observe(label, request._profiling_render_time)
+        if not response.streaming:
+            RESPONSE_SIZE.observe(label, len(response.content))
+
+        budget = budget_for(match.func) if match else None
+        if budget is not None and timer.count > budget:
+            logger.warning('Query budget exceeded for %s: %d queries (budget %d)', label, timer.count, budget)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time that step.
+        if hasattr(request, '_profiling_render_time'):
+            render_start = time.perf_counter()
+
+            def record_render(rendered):
+                request._profiling_render_time = time.perf_counter() - render_start
+
+            response.add_post_render_callback(record_render)
+        return response
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. When METRICS_TOKEN is set the scraper must
+    send it as a bearer token; without one the endpoint is open only in DEBUG.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        if request.META.get('HTTP_AUTHORIZATION', '') != f'Bearer {token}':
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,20 +1,18 @@
 from __future__ import annotations
 
 import os
-import sys
 from datetime import timedelta
 from pathlib import Path
 
 import dj_database_url
-from dotenv import load_dotenv
 
 BASE_DIR = Path(__file__).resolve().parent.parent
-APPS_DIR = BASE_DIR / 'apps'
 
-# Ensure custom apps package is importable
-sys.path.append(str(APPS_DIR))
+# Deployments set real environment variables; only read .env when there is one.
+if (BASE_DIR / '.env').exists():
+    from dotenv import load_dotenv
 
-load_dotenv(BASE_DIR / '.env')
+    load_dotenv(BASE_DIR / '.env')
 
 SECRET_KEY = os.getenv('DJANGO_SECRET_KEY', 'change-me-in-production')
 DEBUG = os.getenv('DJANGO_DEBUG', 'True') == 'True'
@@ -38,6 +36,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'nbcc_backend.metrics.RequestProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -70,11 +69,15 @@ TEMPLATES = [
 WSGI_APPLICATION = 'nbcc_backend.wsgi.application'
 ASGI_APPLICATION = 'nbcc_backend.asgi.application'
 
+# In-memory channel layer: group_send only reaches sockets in the same process. The HTTP API runs under
+# gunicorn (WSGI), so pushes it makes (challenge events) never reach the ASGI process's sockets, and
+# standings aren't pushed at all; sockets re-check every GAMEPLAY_WS_FALLBACK_POLL_SECONDS instead.
 CHANNEL_LAYERS = {
     'default': {
         'BACKEND': 'channels.layers.InMemoryChannelLayer'
     }
 }
+GAMEPLAY_WS_FALLBACK_POLL_SECONDS = float(os.getenv('GAMEPLAY_WS_FALLBACK_POLL_SECONDS', '10'))
 
 # Local SQLite Database (commented out - switch back if needed)
 # DATABASES = {
@@ -133,6 +136,9 @@ REST_FRAMEWORK = {
         'rest_framework.renderers.JSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ),
+    # Proxies in front of the app (Render's load balancer), so throttles key on the address the
+    # last proxy appended to X-Forwarded-For rather than on what the client sent; 0 uses REMOTE_ADDR
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '1')),
 }
 
 SIMPLE_JWT = {
@@ -144,6 +150,95 @@ SIMPLE_JWT = {
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
+# Move answers of ended challenges into archive tables (see apps/gameplay/archive.py)
+GAMEPLAY_ARCHIVE_ENDED_CHALLENGES = os.getenv('GAMEPLAY_ARCHIVE_ENDED_CHALLENGES', 'False') == 'True'
+GAMEPLAY_ARCHIVE_BATCH_SIZE = int(os.getenv('GAMEPLAY_ARCHIVE_BATCH_SIZE', '2000'))
+
+# Size of the per-second ring buffers behind /api/gameplay/telemetry/
+GAMEPLAY_TELEMETRY_WINDOW_SECONDS = int(os.getenv('GAMEPLAY_TELEMETRY_WINDOW_SECONDS', '300'))
+
+# Per-endpoint profiling exported at /metrics (see nbcc_backend/metrics.py)
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'True') == 'True'
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0.1'))
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Pre-generated player codes claimed at registration (see apps/accounts/code_pool.py); 0 disables the pool
+PLAYER_CODE_POOL_SIZE = int(os.getenv('PLAYER_CODE_POOL_SIZE', '2000'))
+
+# Response cache for polled gameplay endpoints (see apps/gameplay/response_cache.py).
+# LocMemCache is per worker process; set REDIS_URL to share cache versions across workers.
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+GAMEPLAY_RESPONSE_CACHE_ENABLED = os.getenv('GAMEPLAY_RESPONSE_CACHE_ENABLED', 'True') == 'True'
+GAMEPLAY_RESPONSE_CACHE_TTLS = {
+    'challenges': int(os.getenv('CACHE_TTL_CHALLENGES', '30')),
+    'quiz_questions': int(os.getenv('CACHE_TTL_QUIZ_QUESTIONS', '300')),
+    'player_stats': int(os.getenv('CACHE_TTL_PLAYER_STATS', '15')),
+    'feedback_stats': int(os.getenv('CACHE_TTL_FEEDBACK_STATS', '60')),
+    'quiz_top': int(os.getenv('CACHE_TTL_QUIZ_TOP', '30')),
+    'standings': int(os.getenv('CACHE_TTL_STANDINGS', '30')),
+    'game_leaderboard': int(os.getenv('CACHE_TTL_GAME_LEADERBOARD', '30')),
+    'quiz_answers': int(os.getenv('CACHE_TTL_QUIZ_ANSWERS', '300')),
+    'player_ids': int(os.getenv('CACHE_TTL_PLAYER_IDS', '300')),
+    'analytics': int(os.getenv('CACHE_TTL_ANALYTICS', '60')),
+    'active_challenge': int(os.getenv('CACHE_TTL_ACTIVE_CHALLENGE', '5')),
+}
+
+# Combined cross-game standings (apps/gameplay/standings.py): which session counts per game ('best' or 'latest')
+# and the weight of each game's percentage. Run manage.py rebuild_standings after changing either.
+GAMEPLAY_STANDINGS_MODE = os.getenv('GAMEPLAY_STANDINGS_MODE', 'best')
+GAMEPLAY_STANDINGS_WEIGHTS = {
+    'drag_drop': float(os.getenv('STANDINGS_WEIGHT_DRAG_DROP', '1')),
+    'beer_cup': float(os.getenv('STANDINGS_WEIGHT_BEER_CUP', '1')),
+    'jigsaw': float(os.getenv('STANDINGS_WEIGHT_JIGSAW', '1')),
+}
+
+# How often the shared leaderboard snapshot is re-checked for sockets and GET /api/gameplay/leaderboard/
+GAMEPLAY_LEADERBOARD_REFRESH_SECONDS = float(os.getenv('GAMEPLAY_LEADERBOARD_REFRESH_SECONDS', '2'))
+
+# WebSocket delivery (apps/gameplay/outbound.py): seconds between heartbeat pings, seconds a client that answers
+# pings may go silent before it is closed, frames sent ahead of its last pong, and queued event frames per socket
+GAMEPLAY_WS_PING_SECONDS = float(os.getenv('GAMEPLAY_WS_PING_SECONDS', '20'))
+GAMEPLAY_WS_PONG_TIMEOUT_SECONDS = float(os.getenv('GAMEPLAY_WS_PONG_TIMEOUT_SECONDS', '45'))
+GAMEPLAY_WS_MAX_IN_FLIGHT = int(os.getenv('GAMEPLAY_WS_MAX_IN_FLIGHT', '2'))
+GAMEPLAY_WS_MAX_QUEUED_EVENTS = int(os.getenv('GAMEPLAY_WS_MAX_QUEUED_EVENTS', '32'))
+
+# Threads (and so at most DB connections) per process for WebSocket consumer queries (apps/gameplay/db_executor.py)
+GAMEPLAY_CONSUMER_DB_WORKERS = int(os.getenv('GAMEPLAY_CONSUMER_DB_WORKERS', '4'))
+
+# Token-bucket throttles on submit_answer/, game-answer/ and feedback/ (apps/gameplay/throttling.py):
+# (sustained requests per second, burst) per player code and per client IP
+GAMEPLAY_THROTTLE_ENABLED = os.getenv('GAMEPLAY_THROTTLE_ENABLED', 'True') == 'True'
+GAMEPLAY_THROTTLE_RATES = {
+    'code': (float(os.getenv('THROTTLE_CODE_RATE', '2')), int(os.getenv('THROTTLE_CODE_BURST', '20'))),
+    'ip': (float(os.getenv('THROTTLE_IP_RATE', '50')), int(os.getenv('THROTTLE_IP_BURST', '200'))),
+}
+# Also charge buckets in the Django cache so limits hold across workers (worth it with REDIS_URL)
+GAMEPLAY_THROTTLE_SYNC_CACHE = os.getenv('GAMEPLAY_THROTTLE_SYNC_CACHE', 'False') == 'True'
+
+# Signed question packs (apps/gameplay/question_tokens.py): seconds a pack's token is accepted for answers
+GAMEPLAY_QUESTION_TOKEN_MAX_AGE = int(os.getenv('GAMEPLAY_QUESTION_TOKEN_MAX_AGE', '3600'))
+
+# Prebuilt OpenAPI schema (manage.py build_api_schema) and the docs pages that load it
+API_SCHEMA_FILE = STATIC_ROOT / 'openapi' / 'openapi.json'
+SWAGGER_SETTINGS = {'SPEC_URL': ('schema-json', {'format': '.json'})}
+REDOC_SETTINGS = {'SPEC_URL': ('schema-json', {'format': '.json'})}
+
+# Admin changelists use the PostgreSQL planner's row estimate instead of COUNT(*) past this many rows (0 = always exact)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.getenv('ADMIN_ESTIMATED_COUNT_THRESHOLD', '100000'))
+
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 
@@ -157,6 +252,7 @@ LOGGING = {
             'style': '{',
         },
         'simple': {
+            'class': 'apps.accounts.log_handlers.KeyValueFormatter',
             'format': '{levelname} {asctime} {name} | {message}',
             'style': '{',
         },
@@ -167,11 +263,16 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
+        # JSON lines written off the request thread; read with `manage.py login_log_report`.
+        # Each worker process writes and rotates its own logs/login.<pid>.log (see log_handlers.py).
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'apps.accounts.log_handlers.QueuedRotatingFileHandler',
             'filename': BASE_DIR / 'logs' / 'login.log',
-            'formatter': 'verbose',
+            'max_bytes': int(os.getenv('LOGIN_LOG_MAX_BYTES', str(10 * 1024 * 1024))),
+            'backup_count': int(os.getenv('LOGIN_LOG_BACKUP_COUNT', '5')),
+            'when': os.getenv('LOGIN_LOG_ROTATE_WHEN') or None,
+            'per_process': True,
         },
     },
     'loggers': {
@@ -0,0 +1,33 @@
+"""
+Lean settings for the WSGI entry points (gunicorn workers and Vercel).
+
+WSGI processes never serve WebSockets, so daphne and channels are left out
+of INSTALLED_APPS; importing daphne alone pulls in Twisted and autobahn.
+drf_yasg is left out too (its package import loads pkg_resources): the docs
+views in nbcc_backend/api_docs.py import it on first use, and its templates
+are found through TEMPLATES['DIRS'] instead. The admin can be switched off
+with DJANGO_ADMIN_ENABLED=False for deployments that don't need it.
+
+The ASGI server (nbcc_backend/asgi.py) and manage.py keep using the full
+settings module.
+"""
+import importlib.util
+import os
+from pathlib import Path
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, TEMPLATES
+
+WSGI_EXCLUDED_APPS = {'daphne', 'channels', 'drf_yasg'}
+if os.getenv('DJANGO_ADMIN_ENABLED', 'True') != 'True':
+    WSGI_EXCLUDED_APPS.add('django.contrib.admin')
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in WSGI_EXCLUDED_APPS]
+
+# find_spec locates the package without executing drf_yasg/__init__.py.
+_drf_yasg = importlib.util.find_spec('drf_yasg')
+if _drf_yasg is not None:
+    TEMPLATES = [
+        {**TEMPLATES[0], 'DIRS': [*TEMPLATES[0]['DIRS'], Path(_drf_yasg.origin).parent / 'templates']},
+        *TEMPLATES[1:],
+    ]
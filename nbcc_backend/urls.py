@@ -1,27 +1,21 @@
 
-from django.contrib import admin
+from django.apps import apps
 from django.urls import include, path, re_path
 
-# Swagger imports
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="NBCC Strategy Games API",
-        default_version='v1',
-        description="API documentation for NBCC Games (auth, gameplay, leaderboard, etc.)",
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+from .api_docs import redoc_view, schema_view, swagger_ui_view
+from .metrics import metrics_view
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/auth/', include('apps.accounts.urls')),
     path('api/gameplay/', include('apps.gameplay.urls')),
-    re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('metrics', metrics_view, name='metrics'),
+    re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view, name='schema-json'),
+    path('swagger/', swagger_ui_view, name='schema-swagger-ui'),
+    path('redoc/', redoc_view, name='schema-redoc'),
 ]
+
+# The lean WSGI settings can leave the admin out (DJANGO_ADMIN_ENABLED=False).
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
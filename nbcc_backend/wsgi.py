@@ -1,6 +1,6 @@
 import os
 from django.core.wsgi import get_wsgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nbcc_backend.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nbcc_backend.settings_wsgi')
 
 application = get_wsgi_application()
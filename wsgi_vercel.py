@@ -11,7 +11,7 @@ BASE_DIR = Path(__file__).resolve().parent
 sys.path.insert(0, str(BASE_DIR))
 
 # Set the Django settings module
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nbcc_backend.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nbcc_backend.settings_wsgi')
 
 # Import the Django WSGI application
 from django.core.wsgi import get_wsgi_application